@@ -1,22 +1,18 @@
 # file: ai_tdm_suite/app.py
 
+from modules import instrumentation  # first: starts the startup clock
 import streamlit as st
 import os
 
-# === Module Imports ===
-from modules.audience_insights_dashboard import main as audience_insights_dashboard_main
-from modules.accessible_streaming_platform import main as accessible_streaming_platform_main
-from modules.tdm_ai_marketing_platform import main as tdm_ai_marketing_platform_main
-from modules.creator_to_fan_crm import main as creator_to_fan_crm_main
-from modules.digital_merch_nft_platform import main as digital_merch_nft_platform_main
-from modules.live_experience_marketplace import main as live_experience_marketplace_main
-from modules.tdm_digital_publishing_studio import main as tdm_digital_publishing_studio_main
-from modules.smart_merch_print_hub import main as smart_merch_print_hub_main
-
-from modules.utils import (
-    MODULES, show_revenue_model_reference, check_session, is_pro, pricing_plans,
-    subscribe, logout
-)
+# === Module Imports (pages load lazily via the registry) ===
+with instrumentation.phase("app imports", once=True):
+    from modules.registry import LABEL_TOOL_MODULES, run_page
+    from modules.utils import (
+        MODULES, show_revenue_model_reference, check_session, is_pro, pricing_plans,
+        subscribe, logout
+    )
+
+instrumentation.begin_rerun()
 
 # === SIDEBAR CONFIG ===
 with st.sidebar:
@@ -25,7 +21,7 @@ with st.sidebar:
     if label_mode:
         label_tool = st.radio(
             "Label Dashboard",
-            ["Catalog Analytics", "A&R Heatmap", "Royalty & Finance", "White-label Settings"],
+            list(LABEL_TOOL_MODULES),
             key="label_nav"
         )
     st.markdown("---")
@@ -92,37 +88,13 @@ with st.sidebar:
     st.markdown("[Privacy Policy](https://yourdomain.com/privacy) | [Terms of Service](https://yourdomain.com/tos)")
 
 # === MAIN ROUTER: Regular Modules ===
-if app_mode == "Audience Insights Dashboard":
-    audience_insights_dashboard_main()
-elif app_mode == "Accessible Streaming Platform":
-    accessible_streaming_platform_main()
-elif app_mode == "TDM AI Marketing Platform":
-    tdm_ai_marketing_platform_main()
-elif app_mode == "Creator-to-Fan AI CRM":
-    creator_to_fan_crm_main()
-elif app_mode == "Digital Merch & NFT Platform":
-    digital_merch_nft_platform_main()
-elif app_mode == "Live Experience Marketplace":
-    live_experience_marketplace_main()
-elif app_mode == "TDM Digital Publishing Studio":
-    tdm_digital_publishing_studio_main()
-elif app_mode == "Smart Merch & Print-on-Demand Hub":
-    smart_merch_print_hub_main()
+with instrumentation.section("router"), instrumentation.phase(f"first render: {app_mode}", once=True):
+    run_page(app_mode)
 
 # === LABEL FEATURES ROUTER ===
 if st.session_state.get("label_mode"):
-    if label_tool == "Catalog Analytics":
-        from modules.label_catalog_analytics import main as label_catalog_analytics_main
-        label_catalog_analytics_main()
-    elif label_tool == "A&R Heatmap":
-        from modules.label_anr_heatmap import main as label_anr_heatmap_main
-        label_anr_heatmap_main()
-    elif label_tool == "Royalty & Finance":
-        from modules.label_royalty_finance import main as label_royalty_finance_main
-        label_royalty_finance_main()
-    elif label_tool == "White-label Settings":
-        from modules.label_whitelabel_settings import main as label_whitelabel_settings_main
-        label_whitelabel_settings_main()
+    with instrumentation.section("label router"), instrumentation.phase(f"first render: {label_tool}", once=True):
+        run_page(label_tool)
 
 # === PRICING PLANS & SIMULATION ===
 st.markdown("## 🏷️ Pricing Plans & Strategy")
@@ -138,34 +110,35 @@ plan_price = (
     else plan.get("price_month", 0)
 )
 # Plan cards
-st.markdown("<div style='display:flex;gap:24px;flex-wrap:wrap;'>", unsafe_allow_html=True)
-for name, info in pricing_plans.items():
-    badge_html = f"<span style='background:{info['color']};color:#fff;padding:4px 12px;border-radius:8px;font-size:0.92em;margin-right:9px;'>{info['badge']}</span>" if "badge" in info else ""
-    price = (
-        f"${info.get('price_annual', info.get('price_month', 0)*12)//12:.0f}/mo <span style='font-size:0.95em;'>(annual)</span>"
-        if toggle_annual and "price_annual" in info else
-        f"${info.get('price_month', info.get('price_per_action', 0)):.2f}/mo" if "price_month" in info else
-        f"${info.get('price_per_action', 0):.2f}/action"
-    )
-    features = "".join(f"<li>{f}</li>" for f in info['features'])
-    box_shadow = "0 0 0 2.5px #003366" if name == selected_plan else "0 1px 8px #999"
-    st.markdown(f"""
-    <div style='flex:1;min-width:220px;background:#fff;padding:18px 14px 15px 14px;border-radius:17px;
-                box-shadow:{box_shadow};border:1.5px solid #f3f3f3;margin-bottom:10px;'>
-        <div style='margin-bottom:7px;'>{badge_html}</div>
-        <span style='font-size:2.1em;font-weight:700;color:{info['color']}'>{price}</span>
-        <ul style='margin-top:9px;font-size:1.03em;padding-left:18px;color:#232326;'>
-            {features}
-        </ul>
-        <span style='color:#888;font-size:0.98em;'>Marketplace Fee: <b>{int(info.get('transaction_fee',0)*100)}%</b></span>
-    </div>
-    """, unsafe_allow_html=True)
-st.markdown("</div>", unsafe_allow_html=True)
+with instrumentation.section("pricing cards"):
+    st.markdown("<div style='display:flex;gap:24px;flex-wrap:wrap;'>", unsafe_allow_html=True)
+    for name, info in pricing_plans.items():
+        badge_html = f"<span style='background:{info['color']};color:#fff;padding:4px 12px;border-radius:8px;font-size:0.92em;margin-right:9px;'>{info['badge']}</span>" if "badge" in info else ""
+        price = (
+            f"${info.get('price_annual', info.get('price_month', 0)*12)//12:.0f}/mo <span style='font-size:0.95em;'>(annual)</span>"
+            if toggle_annual and "price_annual" in info else
+            f"${info.get('price_month', info.get('price_per_action', 0)):.2f}/mo" if "price_month" in info else
+            f"${info.get('price_per_action', 0):.2f}/action"
+        )
+        features = "".join(f"<li>{f}</li>" for f in info['features'])
+        box_shadow = "0 0 0 2.5px #003366" if name == selected_plan else "0 1px 8px #999"
+        st.markdown(f"""
+        <div style='flex:1;min-width:220px;background:#fff;padding:18px 14px 15px 14px;border-radius:17px;
+                    box-shadow:{box_shadow};border:1.5px solid #f3f3f3;margin-bottom:10px;'>
+            <div style='margin-bottom:7px;'>{badge_html}</div>
+            <span style='font-size:2.1em;font-weight:700;color:{info['color']}'>{price}</span>
+            <ul style='margin-top:9px;font-size:1.03em;padding-left:18px;color:#232326;'>
+                {features}
+            </ul>
+            <span style='color:#888;font-size:0.98em;'>Marketplace Fee: <b>{int(info.get('transaction_fee',0)*100)}%</b></span>
+        </div>
+        """, unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # Scenario modeling
 st.markdown("#### 💰 Revenue Impact Simulation")
 colu1, colu2 = st.columns([2, 1])
-with colu1:
+with colu1, instrumentation.section("revenue simulation"):
     n_customers = st.slider("How many customers on this plan?", 10, 5000, 200, step=10)
     avg_gmv = st.number_input("Avg. Gross Marketplace Volume (per user, per month)", min_value=0, value=500)
     saas_revenue = n_customers * plan_price if selected_plan != "Pay-per-Use" else 0
@@ -185,6 +158,16 @@ with colu2:
 """)
     st.info("💡 Top pricing psychology built-in: anchor, ladder, urgency, choice simplification.")
 
+with st.expander("📊 Explore all pricing scenarios", expanded=False):
+    from modules.pricing_scenarios import show_scenario_explorer
+    with instrumentation.section("scenario explorer"):
+        show_scenario_explorer(pricing_plans, selected_plan, toggle_annual, n_customers, avg_gmv)
+
+with st.expander("🎲 Monte Carlo revenue forecast", expanded=False):
+    from modules.revenue_monte_carlo import show_monte_carlo
+    with instrumentation.section("monte carlo"):
+        show_monte_carlo(pricing_plans, selected_plan, toggle_annual, n_customers, avg_gmv)
+
 if not is_pro():
     if st.button(f"🚀 Upgrade to {selected_plan} Now"):
         st.session_state['pro_user'] = True
@@ -200,3 +183,11 @@ st.markdown(
     "© 2024 Justin Hoang & AI TDM Suite. All rights reserved.</span></center>",
     unsafe_allow_html=True
 )
+
+# === STARTUP PROFILE (opt-in: TDM_PROFILE_STARTUP=1) ===
+instrumentation.mark_first_render()
+instrumentation.show_startup_panel()
+
+# === SECTION TIMINGS (opt-in: TDM_PROFILE_SECTIONS=1) ===
+instrumentation.end_rerun()
+instrumentation.show_section_panel()
@@ -0,0 +1,2 @@
+# Synthetic data generators and the benchmark runner for the analytics paths.
+# Run `python -m benchmarks.run_benchmarks --help` from the repo root.
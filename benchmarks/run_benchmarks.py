@@ -0,0 +1,206 @@
+# file: ai_tdm_suite/benchmarks/run_benchmarks.py
+
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic_data import DEFAULT_CHUNK_ROWS, GENERATORS, parse_rows, write_csv
+from modules.chart_cache import CHART_CACHE
+from modules.date_parsing import clear_memo, parse_dates
+from modules.demand_forecast import FORECAST_CACHE, forecast_demand
+from modules.exports import available_formats, export_bytes
+from modules.fan_dedup import dedupe_fans
+from modules.fan_engagement import aggregate_events
+from modules.fan_segments import segment_fans
+from modules.frame_loader import load_csv, optimize_dtypes
+from modules.storage import state_dir, state_path
+from modules.ticket_aggregates import aggregate_frame, stream_aggregates
+
+DEFAULT_SIZES = "10k,100k,1m"
+# Above this many rows only the streaming (bounded-memory) steps run.
+MAX_IN_MEMORY_ROWS = 10_000_000
+
+def _ingest(ctx):
+    ctx["df"], _ = load_csv(ctx["path"])
+
+def _parse(ctx):
+    # kept aside so the memory pass parses the raw strings again
+    ctx["dates"] = parse_dates(ctx["df"]["date"])
+
+def _aggregate(ctx):
+    ctx["df"]["date"] = ctx["dates"]
+    ctx["aggs"] = aggregate_frame(ctx["df"])
+
+def _stream(ctx):
+    stream_aggregates(ctx["path"])
+
+def _forecast(ctx):
+    forecast_demand(ctx["aggs"]["cube"], ("bench", ctx["path"]), by_show=True, by_channel=True)
+
+def _segment(ctx):
+    segment_fans(ctx["path"])
+
+def _dedup(ctx):
+    dedupe_fans(ctx["path"])
+
+def _engagement(ctx):
+    aggregate_events(ctx["path"])
+
+def _export(fmt):
+    def step(ctx):
+        export_bytes(ctx["df"], fmt, user_id="bench")
+    return step
+
+def _catalog_ingest(ctx):
+    ctx["df"], _ = optimize_dtypes(pd.read_csv(ctx["path"]))
+
+def _groupby(by, value):
+    def step(ctx):
+        ctx["df"].groupby(by, observed=True)[value].sum()
+    return step
+
+def _pivot(ctx):
+    # same pivot the A&R heatmap draws
+    ctx["df"].pivot_table(values="growth", index="city", columns="artist", fill_value=0, observed=True)
+
+# dataset -> ordered (step name, function, needs the whole frame in memory)
+STEPS = {
+    "tickets": [
+        ("ingest", _ingest, True),
+        ("date parse", _parse, True),
+        ("aggregate", _aggregate, True),
+        ("forecast", _forecast, True),
+        ("export csv", _export("CSV"), True),
+        ("export parquet", _export("Parquet"), True),
+        ("stream aggregate", _stream, False),
+    ],
+    "fans": [
+        ("ingest", _ingest, True),
+        ("segment", _segment, False),
+        ("dedup", _dedup, False),
+    ],
+    "catalog": [
+        ("ingest", _catalog_ingest, True),
+        ("groupby artist", _groupby("artist", "streams"), True),
+        ("export csv", _export("CSV"), True),
+    ],
+    "anr": [
+        ("ingest", _ingest, True),
+        ("pivot", _pivot, True),
+    ],
+    "royalty": [
+        ("ingest", _ingest, True),
+        ("groupby artist", _groupby("artist", "payout"), True),
+        ("export csv", _export("CSV"), True),
+    ],
+    "events": [("engagement aggregate", _engagement, False)],
+}
+
+def reset_caches():
+    """Cold caches so every step measures real work, not a memo hit."""
+    clear_memo()
+    FORECAST_CACHE.clear()
+    CHART_CACHE.clear()
+
+def dataset(kind, rows, data_dir, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Path to a generated CSV, written once and reused across runs."""
+    path = os.path.join(data_dir, f"{kind}-{rows}-s{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(kind, rows, path, chunk_rows, seed)
+    return path
+
+def run_step(func, ctx, memory=True):
+    """(seconds, peak traced MB or None). Timing and memory are separate runs:
+    tracemalloc slows allocation-heavy code enough to skew the clock."""
+    reset_caches()
+    start = time.perf_counter()
+    func(ctx)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        reset_caches()
+        tracemalloc.start()
+        try:
+            func(ctx)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+def run(kinds, sizes, data_dir, memory=True, max_in_memory_rows=MAX_IN_MEMORY_ROWS, seed=0, log=print):
+    """Run every step for every dataset and size; returns one result dict per step."""
+    results = []
+    for kind in kinds:
+        for rows in sizes:
+            path = dataset(kind, rows, data_dir, seed)
+            ctx = {"path": path}
+            for name, func, in_memory in STEPS[kind]:
+                if in_memory and rows > max_in_memory_rows:
+                    continue
+                if name == "export parquet" and "Parquet" not in available_formats():
+                    continue
+                seconds, peak = run_step(func, ctx, memory)
+                results.append({
+                    "dataset": kind, "step": name, "rows": rows,
+                    "seconds": round(seconds, 4),
+                    "rows_per_s": round(rows / seconds) if seconds else None,
+                    "peak_mb": None if peak is None else round(peak, 1),
+                    "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+                })
+                log(f"{kind:>8} {name:<17} {rows:>12,} rows  {seconds:8.3f}s"
+                    + ("" if peak is None else f"  peak {peak:8.1f} MB"))
+    return results
+
+def plot_scaling(results, path):
+    """Log-log seconds vs rows, one line per dataset/step."""
+    from matplotlib.figure import Figure
+    df = pd.DataFrame(results)
+    fig = Figure(figsize=(9, 6))
+    ax = fig.subplots()
+    for (kind, step), part in df.groupby(["dataset", "step"], sort=False):
+        if len(part) > 1:
+            ax.plot(part["rows"], part["seconds"], marker="o", label=f"{kind}: {step}")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("rows")
+    ax.set_ylabel("seconds")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend(fontsize=7, ncol=2)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time ingest, aggregation, forecasting, pivoting and export at several scales.")
+    parser.add_argument("--datasets", default=",".join(STEPS), help=f"comma-separated subset of {', '.join(STEPS)}")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated row counts, e.g. 10k,1m,100m")
+    parser.add_argument("--data-dir", default=None, help="where generated CSVs are kept (default: state dir)")
+    parser.add_argument("--out", default=None, help="results CSV (default: state dir, timestamped)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--max-in-memory-rows", type=parse_rows, default=MAX_IN_MEMORY_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    kinds = [k.strip() for k in args.datasets.split(",") if k.strip()]
+    unknown = set(kinds) - set(GENERATORS)
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(sorted(unknown))}")
+    sizes = sorted(parse_rows(s) for s in args.sizes.split(","))
+    data_dir = args.data_dir or state_dir("benchmarks", "data")
+    os.makedirs(data_dir, exist_ok=True)
+    results = run(kinds, sizes, data_dir, memory=not args.no_memory,
+                  max_in_memory_rows=args.max_in_memory_rows, seed=args.seed)
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    out = args.out or state_path("benchmarks", f"results-{stamp}.csv")
+    pd.DataFrame(results).to_csv(out, index=False)
+    print(f"results: {out}")
+    if len(sizes) > 1:
+        print(f"scaling curves: {plot_scaling(results, os.path.splitext(out)[0] + '.png')}")
+
+if __name__ == "__main__":
+    main()
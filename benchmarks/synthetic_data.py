@@ -0,0 +1,187 @@
+# file: ai_tdm_suite/benchmarks/synthetic_data.py
+
+import argparse
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+START_DATE = "2023-01-01"
+DAYS = 730
+
+TITLES = np.array([
+    "Hamilton", "Wicked", "Les Miserables", "The Lion King", "Chicago", "Cabaret", "Hadestown",
+    "Swan Lake", "The Nutcracker", "Giselle", "La Boheme", "Carmen", "Rent", "Company",
+    "Six", "Into the Woods", "Oklahoma!", "Macbeth", "Jazz Night", "Symphony No. 9",
+], dtype=object)
+CITIES = np.array([
+    "New York", "Chicago", "Los Angeles", "Boston", "Seattle", "Austin", "Denver", "Atlanta",
+    "Miami", "Portland", "Minneapolis", "Nashville", "Philadelphia", "San Francisco", "Toronto",
+    "London", "Berlin", "Paris", "Sydney", "Tokyo",
+], dtype=object)
+CHANNELS = np.array(["web", "box_office", "app", "partner"], dtype=object)
+CHANNEL_WEIGHTS = np.array([0.55, 0.2, 0.18, 0.07])
+AGE_GROUPS = np.array(["<18", "18-34", "35-50", "51-64", "65+"], dtype=object)
+AGE_WEIGHTS = np.array([0.08, 0.38, 0.3, 0.16, 0.08])
+# Friday/Saturday peaks, Monday trough
+WEEKDAY_FACTOR = np.array([0.6, 0.8, 0.9, 1.0, 1.35, 1.5, 1.1])
+INTERESTS = ["Musicals", "Drama", "Ballet", "Opera", "Jazz", "Backstage", "VIP", "Comedy", "Classical", "Workshops"]
+FIRST_NAMES = np.array(["Taylor", "Morgan", "Jordan", "Alex", "Casey", "Riley", "Sam", "Jamie", "Avery", "Quinn",
+                        "Drew", "Parker", "Rowan", "Emerson", "Harper", "Skyler", "Reese", "Dakota"], dtype=object)
+LAST_NAMES = np.array(["Kim", "Lee", "Patel", "Garcia", "Smith", "Nguyen", "Brown", "Lopez", "Chen", "Davis",
+                       "Wilson", "Martin", "Clark", "Lewis", "Walker", "Young", "Hall", "Allen"], dtype=object)
+REGIONS = np.array(["North America", "Europe", "LATAM", "APAC", "Africa"], dtype=object)
+GENRES = np.array(["Pop", "Rock", "Hip-Hop", "Classical", "Jazz", "Musical Theatre", "Electronic", "Folk"], dtype=object)
+RIGHTSHOLDERS = np.array([f"{n} {kind}" for n in ("Aurora", "Summit", "Bluebird", "Harbor", "Northstar", "Velvet")
+                          for kind in ("Records", "Publishing", "Music Group")], dtype=object)
+
+def _rng(seed, chunk):
+    # One stream per chunk: same seed and chunk size -> identical file.
+    return np.random.default_rng([seed, chunk])
+
+def _pool(prefix, n):
+    return np.array([f"{prefix} {i:05d}" for i in range(n)], dtype=object)
+
+def _artists(rows):
+    return _pool("Artist", int(min(50_000, max(50, rows // 200))))
+
+def _tickets(rng, n, offset, rows):
+    shows = np.array([f"{t} ({c})" for t, c in itertools.product(TITLES, CITIES[:10])], dtype=object)
+    dates = pd.date_range(START_DATE, periods=DAYS, freq="D")
+    day = rng.integers(0, DAYS, n)
+    show = rng.integers(0, len(shows), n)
+    base = 40 + (np.arange(len(shows)) * 37) % 160
+    price = 30 + (np.arange(len(shows)) * 13) % 150
+    return pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d").to_numpy(dtype=object)[day],
+        "show": shows[show],
+        "tickets_sold": rng.poisson(base[show] * WEEKDAY_FACTOR[dates.weekday[day]]),
+        "price": price[show] + rng.integers(-5, 6, n),
+        "channel": CHANNELS[rng.choice(len(CHANNELS), n, p=CHANNEL_WEIGHTS)],
+        "age_group": AGE_GROUPS[rng.choice(len(AGE_GROUPS), n, p=AGE_WEIGHTS)],
+    })
+
+def _fans(rng, n, offset, rows, dup_rate=0.02):
+    combos = np.array([";".join(c) for k in (1, 2, 3) for c in itertools.combinations(INTERESTS, k)], dtype=object)
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n)]
+    last = LAST_NAMES[rng.integers(0, len(LAST_NAMES), n)]
+    ids = pd.Series(np.arange(offset, offset + n)).astype(str).to_numpy(dtype=object)
+    df = pd.DataFrame({
+        "name": first + " " + last,
+        "email": (pd.Series(first).str.lower() + "." + pd.Series(last).str.lower() + ids + "@email.com").to_numpy(dtype=object),
+        "city": CITIES[rng.integers(0, len(CITIES), n)],
+        "interests": combos[rng.integers(0, len(combos), n)],
+    })
+    # Sprinkle re-registrations of an earlier row's person: half with a
+    # differently-cased email, half re-typed (a letter dropped from the first
+    # name, the email's dot dropped and another provider).
+    dups = np.flatnonzero(rng.random(n) < dup_rate)
+    dups = dups[dups > 0]
+    if len(dups):
+        src = rng.integers(0, dups)
+        df.iloc[dups] = df.iloc[src].to_numpy()
+        retyped = rng.random(len(dups)) < 0.5
+        cased, typed = dups[~retyped], dups[retyped]
+        df.iloc[cased, 1] = df["email"].iloc[cased].str.upper().to_numpy()
+        name = df["name"].iloc[typed]
+        df.iloc[typed, 0] = (name.str[:1] + name.str[2:]).to_numpy()
+        email = df["email"].iloc[typed].str.replace(".", "", n=1, regex=False)
+        df.iloc[typed, 1] = email.str.replace("@email.com", "@mail.com", regex=False).to_numpy()
+    return df
+
+def _catalog(rng, n, offset, rows):
+    artists = _artists(rows)
+    a = rng.integers(0, len(artists), n)
+    return pd.DataFrame({
+        "artist": artists[a],
+        "album": _pool("Album", 8)[rng.integers(0, 8, n)],
+        "track": _pool("Track", 14)[rng.integers(0, 14, n)],
+        "streams": rng.lognormal(9, 1.5, n).astype(np.int64),
+        "tickets_sold": rng.poisson(120, n),
+        "merch_revenue": rng.gamma(2.0, 150.0, n).round(2),
+        "region": REGIONS[rng.integers(0, len(REGIONS), n)],
+        "genre": GENRES[a % len(GENRES)],
+    })
+
+def _anr(rng, n, offset, rows):
+    artists = _artists(rows)
+    return pd.DataFrame({
+        "artist": artists[rng.integers(0, len(artists), n)],
+        "city": CITIES[rng.integers(0, len(CITIES), n)],
+        "streams": rng.lognormal(10, 1.2, n).astype(np.int64),
+        "tiktok_views": rng.lognormal(11, 1.8, n).astype(np.int64),
+        "ticket_sales": rng.poisson(300, n),
+        "growth": rng.normal(0.15, 0.3, n).round(3),
+    })
+
+def _royalty(rng, n, offset, rows):
+    artists = _artists(rows)
+    stream = rng.gamma(2.0, 400.0, n).round(2)
+    merch = rng.gamma(1.5, 250.0, n).round(2)
+    return pd.DataFrame({
+        "artist": artists[rng.integers(0, len(artists), n)],
+        "rightsholder": RIGHTSHOLDERS[rng.integers(0, len(RIGHTSHOLDERS), n)],
+        "stream_revenue": stream,
+        "merch_revenue": merch,
+        "payout": ((stream + merch) * rng.uniform(0.15, 0.5, n)).round(2),
+    })
+
+def _events(rng, n, offset, rows):
+    # fan activity: ticket purchases, merch orders and tips from a pool of ~rows/10 fans
+    fans = rng.integers(0, max(1_000, rows // 10), n)
+    kinds = np.array(["ticket", "merch", "tip"], dtype=object)[rng.choice(3, n, p=[0.6, 0.25, 0.15])]
+    dates = pd.date_range(START_DATE, periods=DAYS, freq="D").strftime("%Y-%m-%d").to_numpy(dtype=object)
+    return pd.DataFrame({
+        "date": dates[rng.integers(0, DAYS, n)],
+        "email": pd.Series(fans).map("fan{}@email.com".format).to_numpy(dtype=object),
+        "kind": kinds,
+        "amount": np.where(kinds == "tip", rng.gamma(1.5, 4.0, n), rng.gamma(2.0, 35.0, n)).round(2),
+    })
+
+# dataset name -> chunk builder(rng, n, offset, total_rows); columns mirror each uploader
+GENERATORS = {
+    "tickets": _tickets,
+    "fans": _fans,
+    "catalog": _catalog,
+    "anr": _anr,
+    "royalty": _royalty,
+    "events": _events,
+}
+
+def generate(kind, rows, chunk_rows=DEFAULT_CHUNK_ROWS, seed=0):
+    """Yield DataFrame chunks (at most `chunk_rows` each) totalling `rows` rows of `kind`."""
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown dataset '{kind}' (choose from {', '.join(GENERATORS)})")
+    build = GENERATORS[kind]
+    for i, offset in enumerate(range(0, rows, chunk_rows)):
+        yield build(_rng(seed, i), min(chunk_rows, rows - offset), offset, rows)
+
+def write_csv(kind, rows, path, chunk_rows=DEFAULT_CHUNK_ROWS, seed=0):
+    """Write `rows` synthetic rows to `path` chunk by chunk; memory stays at one chunk."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="") as f:
+        for i, chunk in enumerate(generate(kind, rows, chunk_rows, seed)):
+            chunk.to_csv(f, header=(i == 0), index=False)
+    os.replace(tmp, path)
+    return path
+
+def parse_rows(text):
+    """'10k' / '2.5m' / '100M' / '50000' -> int."""
+    text = str(text).strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic upload CSV.")
+    parser.add_argument("kind", choices=sorted(GENERATORS))
+    parser.add_argument("rows", type=parse_rows, help="row count, e.g. 10k, 1m, 100m")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-rows", type=parse_rows, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(write_csv(args.kind, args.rows, args.path, args.chunk_rows, args.seed))
+
+if __name__ == "__main__":
+    main()
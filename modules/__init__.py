@@ -1,8 +1,31 @@
-from .audience_insights_dashboard import main as audience_insights_dashboard
-from .accessible_streaming_platform import main as accessible_streaming_platform
-from .tdm_ai_marketing_platform import main as tdm_ai_marketing_platform
-from .creator_to_fan_crm import main as creator_to_fan_crm
-from .digital_merch_nft_platform import main as digital_merch_nft_platform
-from .live_experience_marketplace import main as live_experience_marketplace
-from .tdm_digital_publishing_studio import main as tdm_digital_publishing_studio
-from .smart_merch_print_hub import main as smart_merch_print_hub
\ No newline at end of file
+# Page entry points are resolved lazily (see modules.registry) so importing
+# the package does not pull in every page's dependencies. They live in PAGES
+# rather than as package attributes: importing modules.<page> binds that name
+# to the submodule, so an attribute would change type with import order.
+from collections.abc import Mapping
+
+_ENTRY_POINTS = {
+    "audience_insights_dashboard": "Audience Insights Dashboard",
+    "accessible_streaming_platform": "Accessible Streaming Platform",
+    "tdm_ai_marketing_platform": "TDM AI Marketing Platform",
+    "creator_to_fan_crm": "Creator-to-Fan AI CRM",
+    "digital_merch_nft_platform": "Digital Merch & NFT Platform",
+    "live_experience_marketplace": "Live Experience Marketplace",
+    "tdm_digital_publishing_studio": "TDM Digital Publishing Studio",
+    "smart_merch_print_hub": "Smart Merch & Print-on-Demand Hub",
+}
+
+class _Pages(Mapping):
+    """Read-only mapping: page module name -> its main(), imported on first lookup."""
+
+    def __getitem__(self, name):
+        from .registry import load_page
+        return load_page(_ENTRY_POINTS[name])
+
+    def __iter__(self):
+        return iter(_ENTRY_POINTS)
+
+    def __len__(self):
+        return len(_ENTRY_POINTS)
+
+PAGES = _Pages()
@@ -2,41 +2,14 @@
 
 import streamlit as st
 import random
-from datetime import datetime
-
-# ---- Revenue Model Badges ----
-ALL_REVENUE_MODELS = [
-    {"grade":"A",  "category":"Recurring Revenue",  "name":"Subscription",         "desc":"Ongoing access fee",          "rationale":"High predictability."},
-    {"grade":"A-", "category":"Freemium",           "name":"Freemium",             "desc":"Free tier + paid upgrades",    "rationale":"High conversion potential."},
-    {"grade":"B",  "category":"Advertising-Based",  "name":"Ads/Sponsorship",      "desc":"Earn from ads/views",          "rationale":"Scalable with traffic."},
-    {"grade":"A",  "category":"Digital Products",   "name":"Online Courses/eBooks","desc":"Sell digital content",         "rationale":"High margin, passive."},
-    {"grade":"A-", "category":"Affiliate Marketing","name":"Affiliate Marketing",  "desc":"Promote for commission",       "rationale":"Zero inventory, passive."},
-]
-MODULE_REVENUE_MODELS = {
-    "Accessible Streaming Platform": [
-        "Freemium", "Subscription", "Ads/Sponsorship", "Online Courses/eBooks", "Affiliate Marketing"
-    ]
-}
-def show_revenue_badges(module):
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-            f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-            f"{m['name']} ({m['grade']})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 # ---- Helpers ----
 def explainability_box(explanation):
     with st.expander("Why did I see this?", expanded=False):
         st.info(explanation)
 
-def audit_log(action, user="anon"):
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
-
 def is_pro():
     return st.session_state.get("pro_user", False)
 
@@ -2,52 +2,33 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from datetime import datetime
 import random
-import hashlib
+from modules.chart_cache import render_png
+from modules.date_parsing import parse_dates
+from modules.exports import export_download
+from modules.frame_loader import load_csv, memory_summary
+from modules.ingest_cache import IngestCache, file_digest
+from modules.instrumentation import section, timed
+from modules.lru import LRUCache
+from modules.ticket_aggregates import (
+    aggregate_frame, stream_aggregates, slice_cube, rollup, has_dim, dim_values, filter_key
+)
+from modules.demand_forecast import forecast_demand
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
-# --- Revenue model badge logic ---
-ALL_REVENUE_MODELS = [
-    {"grade": "A",  "category": "Recurring Revenue", "name": "Subscription",         "desc": "Ongoing access fee (e.g., Netflix, Salesforce)", "rationale": "High predictability, 70-90% margins, infinite scalability."},
-    {"grade": "A",  "category": "Data Sales",        "name": "DaaS/Data Monetization","desc": "Sell insights/aggregates",                       "rationale": "High value, 100% margins, scalable."},
-    {"grade": "A-", "category": "Freemium",          "name": "Freemium",              "desc": "Free tier + paid upgrades",                      "rationale": "Low acquisition cost, high conversion potential."},
-    {"grade": "B+", "category": "Transaction-Based", "name": "Commission/Fees",       "desc": "Fee per sale",                                   "rationale": "Scalable, 10-30% fees."},
-    {"grade": "B",  "category": "Advertising-Based", "name": "Ads/Sponsorship",       "desc": "Earn from ads/views",                            "rationale": "Scalable with traffic, 20-50% margin."},
-]
-MODULE_REVENUE_MODELS = {
-    "Audience Insights Dashboard": [
-        "Subscription", "DaaS/Data Monetization", "Freemium", "Commission/Fees", "Ads/Sponsorship"
-    ]
-}
-
-def show_revenue_badges(module):
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-            f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-            f"{m['name']} ({m['grade']})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
+# Parsed ticket uploads, keyed by the SHA-256 of the uploaded bytes.
+INGEST_CACHE = IngestCache("ticket_sales")
+# Rollup cubes (date x show x channel x age_group), keyed the same way.
+AGGREGATE_CACHE = LRUCache(maxsize=64)
+# Uploads above this size default to chunked (streaming) aggregation.
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
 
 # --- Helpers ---
 def consent_checkbox(label):
     """Show a consent checkbox with custom label."""
     return st.checkbox(f"☑️ I consent to {label}")
 
-def watermark_csv(df, user_id="anon"):
-    """Add a watermark to a DataFrame export."""
-    df["_watermark"] = hashlib.sha256(f"{user_id}_{datetime.now()}".encode()).hexdigest()[:16]
-    return df
-
-def audit_log(action, user="anon"):
-    """Print simple audit log (swap for persistent logging in prod)."""
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
-
 def explainability_box(explanation):
     """Show an expandable box explaining analytics."""
     with st.expander("Why did I see this?", expanded=False):
@@ -70,7 +51,7 @@ def check_session():
 
 def load_data(uploaded_file):
     try:
-        df = pd.read_csv(uploaded_file)
+        df, _ = load_csv(uploaded_file)
         return df
     except Exception as e:
         st.error(f"Failed to load file: {e}")
@@ -81,16 +62,61 @@ def safe_parse_date(df):
     if 'date' not in df.columns:
         st.error("Your CSV is missing a required 'date' column.")
         return None
-    try:
-        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
-    except Exception:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = parse_dates(df['date'])
     df = df.dropna(subset=['date'])
     if df.empty:
         st.error("No valid date entries found in your data.")
         return None
     return df
 
+@timed("load tickets")
+def load_ticket_data(uploaded_file):
+    """Load and date-parse an upload once per content hash; reruns reuse the cached frame."""
+    digest = file_digest(uploaded_file.getvalue())
+    df = INGEST_CACHE.get(digest)
+    if df is None:
+        df = load_data(uploaded_file)
+        if df is not None:
+            df = safe_parse_date(df)
+        if df is not None and not df.empty:
+            INGEST_CACHE.put(digest, df)
+    return df, digest
+
+@timed("aggregate")
+def frame_aggregates(df, digest):
+    """Breakdowns for a loaded frame, computed once per content hash."""
+    aggs = AGGREGATE_CACHE.get(digest)
+    if aggs is None:
+        aggs = aggregate_frame(df)
+        AGGREGATE_CACHE.put(digest, aggs)
+    return aggs
+
+@timed("stream aggregate")
+def stream_ticket_data(uploaded_file):
+    """Aggregate a large upload chunk by chunk without materializing the full frame."""
+    digest = file_digest(uploaded_file)
+    aggs = AGGREGATE_CACHE.get(digest)
+    if aggs is None:
+        try:
+            uploaded_file.seek(0)
+            aggs = stream_aggregates(uploaded_file)
+        except ValueError as e:
+            st.error(str(e))
+            return None, digest
+        except Exception as e:
+            st.error(f"Failed to load file: {e}")
+            return None, digest
+        AGGREGATE_CACHE.put(digest, aggs)
+    return aggs, digest
+
+def plot_sales_by_date(ax, cube):
+    """Line chart of daily tickets sold."""
+    sales_by_date = rollup(cube, "date").reset_index()
+    ax.plot(sales_by_date['date'], sales_by_date['tickets_sold'], marker='o', linewidth=2, color='#23244d')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Tickets Sold')
+    ax.figure.autofmt_xdate()
+
 # --- Main App ---
 def main():
     check_session()
@@ -102,69 +128,88 @@ def main():
             if not consent_checkbox("use of data for analytics and model improvement."):
                 st.warning("Consent required to proceed.")
                 st.stop()
-            df = load_data(uploaded_file)
-            if df is not None:
-                df = safe_parse_date(df)
-                if df is not None and not df.empty:
-                    audit_log("Uploaded sales data", st.session_state.get("user_id", "anon"))
-                    st.success("✅ Data uploaded!")
-                    st.dataframe(df.head(), use_container_width=True)
-                    # --- Audience Age & Sales Analysis ---
-                    c1, c2 = st.columns([1, 1])
-                    with c1:
-                        if 'age_group' in df.columns:
-                            st.markdown("#### 👥 Audience Age Distribution")
-                            age_counts = df['age_group'].value_counts()
-                            st.bar_chart(age_counts)
-                            explainability_box("Shows the age group breakdown from your ticket data.")
-                    with c2:
-                        sales_by_date = df.groupby('date', as_index=False)['tickets_sold'].sum()
-                        st.markdown("#### 📅 Tickets Sold Over Time")
-                        fig, ax = plt.subplots()
-                        ax.plot(sales_by_date['date'], sales_by_date['tickets_sold'], marker='o', linewidth=2, color='#23244d')
-                        ax.set_xlabel('Date')
-                        ax.set_ylabel('Tickets Sold')
-                        fig.tight_layout()
-                        st.pyplot(fig)
-                    # --- AI Demand Prediction ---
-                    st.markdown("#### 🤖 AI-Powered Demand Prediction")
-                    sales_by_date['ordinal_date'] = sales_by_date['date'].apply(lambda d: d.toordinal())
-                    X = sales_by_date[['ordinal_date']]
-                    y = sales_by_date['tickets_sold']
-                    model = LinearRegression()
-                    model.fit(X, y)
-                    future_dates = [sales_by_date['date'].max() + pd.Timedelta(days=i) for i in range(1, 8)]
-                    future_ordinals_df = pd.DataFrame({'ordinal_date': [d.toordinal() for d in future_dates]})
-                    predicted_sales = model.predict(future_ordinals_df)
-                    future_df = pd.DataFrame({
-                        "date": future_dates,
-                        "predicted_tickets_sold": predicted_sales.astype(int)
-                    })
-                    st.write("##### 🗓️ Next 7 Days: Ticket Sales Forecast")
-                    st.dataframe(future_df, use_container_width=True)
-                    explainability_box("AI uses past ticket sales to predict demand. For entertainment only.")
-                    if not future_df.empty:
-                        best_day = future_df.loc[future_df['predicted_tickets_sold'].idxmax()]['date']
-                        st.success(f"📢 Best day for marketing push: <b>{best_day.strftime('%A, %b %d')}</b>", icon="📢")
-                    # --- Channel, Top Show, Export ---
-                    exp1, exp2 = st.columns([1.4, 1])
-                    with exp1:
-                        if 'channel' in df.columns:
-                            st.markdown("##### 📈 Sales Channel Breakdown")
-                            channel_counts = df.groupby('channel')['tickets_sold'].sum()
-                            st.bar_chart(channel_counts)
-                        if 'show' in df.columns:
-                            st.markdown("##### 🎟️ Top Performing Shows")
-                            st.write(df.groupby('show')['tickets_sold'].sum().sort_values(ascending=False).head(5))
-                    with exp2:
-                        st.markdown("##### ⬇️ Export Insights")
-                        if is_pro():
-                            exp_df = watermark_csv(df, st.session_state.get("user_id", "anon"))
-                            st.download_button("Download Analytics (CSV)", exp_df.to_csv(index=False), file_name="insights_watermarked.csv")
-                        else:
-                            st.info("Upgrade to Pro to export analytics.")
-                        st.markdown("##### 💰 Revenue Dashboard")
-                        st.metric("Total Earnings", f"${random.randint(1000,3000)}")
-                        st.metric("Pending Payouts", f"${random.randint(50,200)}")
+            streaming = st.toggle(
+                "Streaming mode (large files)",
+                value=uploaded_file.size > STREAMING_THRESHOLD_BYTES,
+                help="Aggregate the file in bounded chunks instead of loading it whole. Row preview and export are limited in this mode.",
+            )
+            df = None
+            if streaming:
+                aggs, digest = stream_ticket_data(uploaded_file)
+            else:
+                df, digest = load_ticket_data(uploaded_file)
+                aggs = frame_aggregates(df, digest) if df is not None else None
+            if aggs is not None:
+                audit_log("Uploaded sales data", st.session_state.get("user_id", "anon"))
+                st.success("✅ Data uploaded!")
+                if df is not None and df.attrs.get("memory_report"):
+                    st.caption(memory_summary(df.attrs["memory_report"]))
+                st.dataframe(aggs["head"], use_container_width=True)
+                if aggs["invalid_dates"]:
+                    st.caption(f"Skipped {aggs['invalid_dates']:,} rows with invalid dates.")
+                # --- Drill-down filters (served from the rollup cube) ---
+                filters = {}
+                f1, f2 = st.columns(2)
+                if has_dim(aggs, "show"):
+                    filters["show"] = f1.multiselect("Filter by show", dim_values(aggs, "show"), key="drill_show")
+                if has_dim(aggs, "channel"):
+                    filters["channel"] = f2.multiselect("Filter by channel", dim_values(aggs, "channel"), key="drill_channel")
+                with section("drill-down"):
+                    cube = slice_cube(aggs["cube"], filters)
+                if cube.empty:
+                    st.warning("No ticket sales match the selected filters.")
+                    return
+                # --- Audience Age & Sales Analysis ---
+                c1, c2 = st.columns([1, 1])
+                with c1:
+                    if has_dim(aggs, "age_group"):
+                        st.markdown("#### 👥 Audience Age Distribution")
+                        st.bar_chart(rollup(cube, "age_group", measure="rows"))
+                        explainability_box("Shows the age group breakdown from your ticket data.")
+                with c2:
+                    st.markdown("#### 📅 Tickets Sold Over Time")
+                    st.image(render_png(("tickets_over_time", digest, filter_key(filters)), lambda fig, ax: plot_sales_by_date(ax, cube)),
+                             use_container_width=True)
+                # --- AI Demand Prediction ---
+                st.markdown("#### 🤖 AI-Powered Demand Prediction")
+                by_channel = has_dim(aggs, "channel") and st.checkbox(
+                    "Also forecast each sales channel", key="forecast_by_channel"
+                )
+                forecast = forecast_demand(cube, (digest, filter_key(filters)), by_channel=by_channel)
+                future_df = pd.DataFrame({
+                    "date": forecast.index,
+                    "predicted_tickets_sold": forecast[("total", "All shows")].to_numpy().astype(int)
+                })
+                st.write("##### 🗓️ Next 7 Days: Ticket Sales Forecast")
+                st.dataframe(future_df, use_container_width=True)
+                explainability_box("AI uses past ticket sales to predict demand. For entertainment only.")
+                if not future_df.empty:
+                    best_day = future_df.loc[future_df['predicted_tickets_sold'].idxmax()]['date']
+                    st.success(f"📢 Best day for marketing push: <b>{best_day.strftime('%A, %b %d')}</b>", icon="📢")
+                for level, title in (("show", "🎭 Forecast by Show"), ("channel", "📈 Forecast by Channel")):
+                    if level in forecast.columns.get_level_values("level"):
+                        with st.expander(title, expanded=False):
+                            st.dataframe(forecast[level].round().astype(int).rename_axis("date"), use_container_width=True)
+                # --- Channel, Top Show, Export ---
+                exp1, exp2 = st.columns([1.4, 1])
+                with exp1:
+                    if has_dim(aggs, "channel"):
+                        st.markdown("##### 📈 Sales Channel Breakdown")
+                        st.bar_chart(rollup(cube, "channel"))
+                    if has_dim(aggs, "show"):
+                        st.markdown("##### 🎟️ Top Performing Shows")
+                        st.write(rollup(cube, "show").sort_values(ascending=False).head(5))
+                with exp2:
+                    st.markdown("##### ⬇️ Export Insights")
+                    if df is None:
+                        st.info("Export is unavailable in streaming mode.")
+                    elif is_pro():
+                        export_download("Download Analytics", df, "insights_watermarked",
+                                        st.session_state.get("user_id", "anon"), key="insights_export")
+                    else:
+                        st.info("Upgrade to Pro to export analytics.")
+                    st.markdown("##### 💰 Revenue Dashboard")
+                    st.metric("Total Earnings", f"${random.randint(1000,3000)}")
+                    st.metric("Pending Payouts", f"${random.randint(50,200)}")
     else:
         st.info("Please upload a ticket sales CSV to begin. Sample CSV shown in the sidebar.")
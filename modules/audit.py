@@ -0,0 +1,235 @@
+# file: ai_tdm_suite/modules/audit.py
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from modules.storage import state_dir
+
+DEFAULT_QUEUE_SIZE = 10_000
+BATCH_SIZE = 512
+FLUSH_INTERVAL_S = 0.2
+SEGMENT_BYTES = 64 * 1024 * 1024
+SEGMENT_SECONDS = 3600
+# How long audit_log() may wait for queue space before counting a drop.
+BLOCK_TIMEOUT_S = 0.05
+# Set TDM_AUDIT_ECHO=1 to also print events (from the writer thread) during development.
+AUDIT_ECHO = os.environ.get("TDM_AUDIT_ECHO", "").lower() in ("1", "true", "yes")
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl"
+_STOP = object()
+
+class AuditWriter:
+    """
+    Background audit writer: callers enqueue events, one daemon thread
+    serializes them to append-only JSONL segment files, one write + fsync
+    per batch. Segments roll over by size or age and are named per process,
+    so several app processes can share a directory without interleaving.
+
+    A full queue applies brief backpressure (up to block_timeout) and then
+    drops the event; both are counted in stats(), as are events logged
+    after close().
+    """
+
+    def __init__(self, directory, max_queue=DEFAULT_QUEUE_SIZE, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL_S, segment_bytes=SEGMENT_BYTES,
+                 segment_seconds=SEGMENT_SECONDS, block_timeout=BLOCK_TIMEOUT_S, echo=AUDIT_ECHO):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.block_timeout = block_timeout
+        self.echo = echo
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._close_lock = threading.Lock()
+        self._counts = dict.fromkeys(("enqueued", "written", "dropped", "backpressure",
+                                      "batches", "segments", "errors"), 0)
+        self._last_error = None
+        self._file = None
+        self._segment_path = None
+        self._segment_opened = 0.0
+        self._segment_seq = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    # --- producer side (request path) ---
+
+    def log(self, action, user="anon", **fields):
+        """Enqueue one event; returns False if it had to be dropped (full queue or closed writer)."""
+        event = (time.time(), user, action, fields)
+        # close() enqueues _STOP under the same lock, so no event can land behind it
+        with self._close_lock:
+            if self._closed:
+                queued = False
+            else:
+                queued = self._put(event)
+        with self._lock:
+            self._counts["enqueued" if queued else "dropped"] += 1
+        return queued
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            pass
+        with self._lock:
+            self._counts["backpressure"] += 1
+        try:
+            self._queue.put(event, timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self, timeout=5.0):
+        """Flush everything queued so far and stop the writer thread; later log() calls are dropped."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+        self._thread.join(timeout)
+
+    def stats(self):
+        """Counters plus current queue depth and segment."""
+        with self._lock:
+            out = dict(self._counts)
+        out.update(queue_depth=self._queue.qsize(), segment=self._segment_path, last_error=self._last_error)
+        return out
+
+    # --- writer thread ---
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_rotate()
+                continue
+            batch, stop = [], first is _STOP
+            if not stop:
+                batch.append(first)
+            while len(batch) < self.batch_size and not stop:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stop = True
+                else:
+                    batch.append(event)
+            if batch:
+                self._write(batch)
+            if stop:
+                self._close_segment()
+                return
+
+    def _write(self, batch):
+        lines = []
+        for ts, user, action, fields in batch:
+            record = {"ts": round(ts, 6), "user_id": user, "action": action}
+            if fields:
+                record.update(fields)
+            lines.append(json.dumps(record, default=str, ensure_ascii=False))
+            if self.echo:
+                print(f"[AUDIT] {datetime.fromtimestamp(ts)} | {user}: {action}")
+        data = ("\n".join(lines) + "\n").encode()
+        try:
+            self._maybe_rotate(len(data))
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            with self._lock:
+                self._counts["errors"] += 1
+                self._counts["dropped"] += len(batch)
+                self._last_error = f"{type(e).__name__}: {e}"
+            self._close_segment()
+            return
+        with self._lock:
+            self._counts["written"] += len(batch)
+            self._counts["batches"] += 1
+
+    def _maybe_rotate(self, incoming=0):
+        f = self._file
+        if f is not None:
+            too_big = f.tell() + incoming > self.segment_bytes and f.tell() > 0
+            too_old = time.time() - self._segment_opened >= self.segment_seconds
+            if not (too_big or too_old):
+                return
+            self._close_segment()
+        if incoming:
+            self._open_segment()
+
+    def _open_segment(self):
+        self._segment_seq += 1
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        name = f"{SEGMENT_PREFIX}{stamp}-{os.getpid()}-{self._segment_seq:04d}{SEGMENT_SUFFIX}"
+        os.makedirs(self.directory, exist_ok=True)
+        self._segment_path = os.path.join(self.directory, name)
+        self._file = open(self._segment_path, "ab")
+        self._segment_opened = time.time()
+        with self._lock:
+            self._counts["segments"] += 1
+
+    def _close_segment(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+def list_segments(directory):
+    """Segment files in a directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    names = [n for n in os.listdir(directory) if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)]
+    return [os.path.join(directory, n) for n in sorted(names)]
+
+# === Process-wide writer ===
+_WRITER = None
+_WRITER_PID = None
+_WRITER_LOCK = threading.Lock()
+
+def audit_dir():
+    """Directory holding this deployment's audit segments."""
+    return state_dir("audit")
+
+def get_writer():
+    """The shared writer, started on first use (and again after a fork)."""
+    global _WRITER, _WRITER_PID
+    if _WRITER is None or _WRITER_PID != os.getpid():
+        with _WRITER_LOCK:
+            if _WRITER is None or _WRITER_PID != os.getpid():
+                _WRITER = AuditWriter(audit_dir())
+                _WRITER_PID = os.getpid()
+                atexit.register(_WRITER.close)
+    return _WRITER
+
+def audit_log(action, user="anon", **fields):
+    """Record an audit event without blocking on disk; extra fields are stored as-is."""
+    return get_writer().log(action, user, **fields)
+
+def audit_stats():
+    """Writer counters (empty if nothing has been logged in this process)."""
+    return _WRITER.stats() if _WRITER is not None and _WRITER_PID == os.getpid() else {}
+
+def flush_audit(timeout=5.0):
+    """Close the shared writer so everything queued is on disk; the next event starts a new one."""
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close(timeout)
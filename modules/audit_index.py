@@ -0,0 +1,169 @@
+# file: ai_tdm_suite/modules/audit_index.py
+
+import json
+import os
+
+from modules.audit import audit_dir, list_segments
+from modules.storage import connect_sqlite, state_path
+
+INGEST_BATCH = 50_000
+READ_BLOCK = 16 * 1024 * 1024
+DEFAULT_PAGE_SIZE = 50
+_CORE_FIELDS = ("ts", "user_id", "action")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS actions (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    action_id INTEGER NOT NULL REFERENCES actions(id),
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS events_user_ts ON events(user_id, ts);
+CREATE INDEX IF NOT EXISTS events_action_ts ON events(action_id, ts);
+CREATE TABLE IF NOT EXISTS segments (path TEXT PRIMARY KEY, offset INTEGER NOT NULL);
+"""
+
+def index_path():
+    """Default location of the audit index database."""
+    return state_path("audit_index.sqlite3")
+
+def connect(path=None):
+    """This thread's connection to the audit index."""
+    return connect_sqlite(path or index_path(), SCHEMA)
+
+def _name_ids(conn, table, names):
+    """Ids for names in users/actions, inserting unseen ones."""
+    conn.executemany(f"INSERT OR IGNORE INTO {table}(name) VALUES (?)", ((n,) for n in names))
+    ids = {}
+    names = list(names)
+    for i in range(0, len(names), 500):
+        part = names[i:i + 500]
+        marks = ",".join("?" * len(part))
+        ids.update(conn.execute(f"SELECT name, id FROM {table} WHERE name IN ({marks})", part))
+    return ids
+
+def _insert(conn, records):
+    users = _name_ids(conn, "users", {str(r.get("user_id", "anon")) for r in records})
+    actions = _name_ids(conn, "actions", {str(r.get("action", "")) for r in records})
+    rows = []
+    for r in records:
+        extra = {k: v for k, v in r.items() if k not in _CORE_FIELDS}
+        rows.append((float(r.get("ts", 0)), users[str(r.get("user_id", "anon"))], actions[str(r.get("action", ""))],
+                     json.dumps(extra, ensure_ascii=False) if extra else None))
+    conn.executemany("INSERT INTO events(ts, user_id, action_id, extra) VALUES (?, ?, ?, ?)", rows)
+
+def _index_segment(conn, path, offset):
+    """Index complete lines of one segment past `offset`; returns events added."""
+    added = 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        tail = b""
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            records = []
+            for line in block[:cut].splitlines():
+                if line.strip():
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT offset FROM segments WHERE path = ?", (path,)).fetchone()
+                if (row[0] if row else 0) != offset:
+                    # another session indexed this range first
+                    conn.execute("ROLLBACK")
+                    return added
+                for i in range(0, len(records), INGEST_BATCH):
+                    _insert(conn, records[i:i + INGEST_BATCH])
+                offset += cut
+                conn.execute("INSERT OR REPLACE INTO segments(path, offset) VALUES (?, ?)", (path, offset))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            added += len(records)
+    return added
+
+def sync_index(directory=None, db=None):
+    """
+    Bring the index up to date with the audit segments. Only bytes written
+    since the last sync are read (offsets are tracked per segment), and an
+    unfinished last line is left for the next run. Returns events added.
+    """
+    conn = connect(db)
+    done = dict(conn.execute("SELECT path, offset FROM segments"))
+    added = 0
+    for path in list_segments(directory or audit_dir()):
+        key = os.path.abspath(path)
+        offset = done.get(key, 0)
+        if os.path.getsize(path) > offset:
+            added += _index_segment(conn, key, offset)
+    return added
+
+def _lookup(conn, table, name):
+    row = conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def query_events(user=None, action=None, start=None, end=None, limit=DEFAULT_PAGE_SIZE,
+                 cursor=None, db=None):
+    """
+    Newest-first page of events filtered by user, action and [start, end)
+    epoch seconds. Pagination is keyset-based: pass the returned cursor to
+    get the next page, so deep pages cost the same as the first one.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    conn = connect(db)
+    where, params = [], []
+    # With a user filter, "+" keeps the planner on the (far more selective) user index.
+    action_column = "+e.action_id" if user else "e.action_id"
+    for table, column, name in (("users", "e.user_id", user), ("actions", action_column, action)):
+        if name:
+            ident = _lookup(conn, table, name)
+            if ident is None:
+                return [], None
+            where.append(f"{column} = ?")
+            params.append(ident)
+    if start is not None:
+        where.append("e.ts >= ?")
+        params.append(float(start))
+    if end is not None:
+        where.append("e.ts < ?")
+        params.append(float(end))
+    if cursor is not None:
+        where.append("(e.ts, e.id) < (?, ?)")
+        params.extend(cursor)
+    sql = ("SELECT e.id, e.ts, u.name, a.name, e.extra FROM events e "
+           "JOIN users u ON u.id = e.user_id JOIN actions a ON a.id = e.action_id"
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + " ORDER BY e.ts DESC, e.id DESC LIMIT ?")
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    out = [{"id": i, "ts": ts, "user_id": u, "action": a, **(json.loads(x) if x else {})} for i, ts, u, a, x in rows]
+    next_cursor = (rows[-1][1], rows[-1][0]) if more else None
+    return out, next_cursor
+
+def known_actions(db=None):
+    """Distinct action names seen so far."""
+    return [r[0] for r in connect(db).execute("SELECT name FROM actions ORDER BY name")]
+
+def index_stats(db=None):
+    """Approximate event count (max rowid, no full scan), users, actions and segments indexed."""
+    conn = connect(db)
+    one = lambda sql: conn.execute(sql).fetchone()[0] or 0
+    return {
+        "events": one("SELECT max(id) FROM events"),
+        "users": one("SELECT count(*) FROM users"),
+        "actions": one("SELECT count(*) FROM actions"),
+        "segments": one("SELECT count(*) FROM segments"),
+    }
@@ -0,0 +1,305 @@
+# file: ai_tdm_suite/modules/b2b_matching.py
+
+import os
+import pickle
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from modules.b2b_store import connect as connect_store, get_profiles
+from modules.storage import state_path
+
+N_FEATURES = 2 ** 18
+TOP_K = 10
+SYNC_CHUNK = 50_000
+# Size-tiered merging: a block is merged into the one before it while that one
+# is at most this many times larger, so blocks shrink geometrically, there are
+# O(log rows) of them, and each row is copied O(log rows) times overall.
+MERGE_RATIO = 2
+# Bump when the snapshot layout changes; older snapshots are rebuilt.
+SNAPSHOT_FORMAT = 2
+
+# Stateless hashing: a profile is vectorized on its own, with no global
+# vocabulary to refit. Raw term counts are stored; IDF is applied at query time
+# from incrementally maintained document frequencies, so weights stay current.
+_VECTORIZER = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm=None,
+                                stop_words="english", ngram_range=(1, 2), dtype=np.float32)
+
+class _Block:
+    """
+    A run of rows: CSR for row lookups, a CSC copy for per-term lookups, and
+    each row's squared-norm terms. With idf_j = a - l_j (a from the document
+    count, l_j = log(1 + df_j)), a row's squared IDF-weighted norm is
+    a*a*s0 - 2*a*s1 + s2, where s0 = sum x^2, s1 = sum x^2 l and
+    s2 = sum x^2 l^2. Only s1/s2 depend on document frequencies, and only
+    through the terms whose frequency changed.
+    """
+
+    def __init__(self, rows, log_df):
+        self.csr = rows.tocsr()
+        self.csc = self.csr.tocsc()
+        squared = self.csr.multiply(self.csr).tocsr()
+        self.s0 = np.asarray(squared.sum(axis=1), dtype=np.float64).ravel()
+        self.s1 = squared @ log_df
+        self.s2 = squared @ (log_df * log_df)
+
+    @property
+    def size(self):
+        return self.csr.shape[0]
+
+    def reweight(self, terms, d1, d2):
+        """Fold changed l values (d1 = l_new - l_old, d2 = l_new^2 - l_old^2) into s1/s2."""
+        cols = self.csc[:, terms]
+        squared = cols.multiply(cols).tocsr()
+        self.s1 += squared @ d1
+        self.s2 += squared @ d2
+
+    def sq_norms(self, a, rows):
+        return np.maximum(a * a * self.s0[rows] - 2 * a * self.s1[rows] + self.s2[rows], 0)
+
+class _RowStore:
+    """Append-only sparse rows kept as size-tiered blocks (see MERGE_RATIO)."""
+
+    def __init__(self):
+        self.blocks = []
+
+    def append(self, rows, log_df):
+        self.blocks.append(_Block(rows, log_df))
+        # merge only blocks of similar size; the norm terms of a merged block
+        # are recomputed exactly, which also drops incremental rounding error
+        while len(self.blocks) > 1 and self.blocks[-2].size <= MERGE_RATIO * self.blocks[-1].size:
+            newer = self.blocks.pop()
+            older = self.blocks.pop()
+            self.blocks.append(_Block(sp.vstack([older.csr, newer.csr], format="csr"), log_df))
+
+    def reweight(self, terms, d1, d2):
+        for block in self.blocks:
+            block.reweight(terms, d1, d2)
+
+    def rows(self, index):
+        """CSR of the given global rows (in block order)."""
+        index = np.asarray(index, dtype=np.int64)
+        parts, offset = [], 0
+        for block in self.blocks:
+            local = index[(index >= offset) & (index < offset + block.size)] - offset
+            if len(local):
+                parts.append(block.csr[np.sort(local)])
+            offset += block.size
+        if not parts:
+            raise IndexError(index)
+        return sp.vstack(parts, format="csr")
+
+    def row(self, i):
+        return self.rows([i])
+
+class MatchIndex:
+    """
+    Needs/offers matchmaking over sparse TF-IDF vectors.
+
+    Each profile contributes a "needs" row and an "offers" row. A profile p is
+    scored against every q as the mean of cos(needs_p, offers_q) and
+    cos(offers_p, needs_q): what p is looking for that q offers, and vice versa.
+    Saving a profile appends rows and updates document frequencies; an updated
+    profile's previous rows are tombstoned, never rebuilt.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.needs = _RowStore()
+        self.offers = _RowStore()
+        self.row_profile = np.zeros(0, dtype=np.int64)    # row -> profile id
+        self.alive = np.zeros(0, dtype=bool)
+        self.profile_row = {}                              # profile id -> live row
+        self.doc_freq = np.zeros(N_FEATURES, dtype=np.int64)
+        self.n_docs = 0
+        self.built = False
+        self.last_change = 0                               # last profile_changes.seq indexed
+
+    # --- updates ---
+
+    def add_profiles(self, profiles):
+        """Index (or re-index) profiles given as dicts with id, needs and offers."""
+        if not profiles:
+            return
+        with self.lock:
+            needs = _VECTORIZER.transform([p.get("needs") or "" for p in profiles]).tocsr()
+            offers = _VECTORIZER.transform([p.get("offers") or "" for p in profiles]).tocsr()
+            ids = np.array([p["id"] for p in profiles], dtype=np.int64)
+            # last occurrence wins if a batch repeats a profile
+            _, last = np.unique(ids[::-1], return_index=True)
+            keep = np.sort(len(ids) - 1 - last)
+            if len(keep) < len(ids):
+                needs, offers, ids = needs[keep], offers[keep], ids[keep]
+            delta = self._term_counts(needs, offers)
+            retired = [r for r in (self.profile_row.pop(int(pid), None) for pid in ids) if r is not None]
+            if retired:
+                self.alive[retired] = False
+                delta -= self._term_counts(self.needs.rows(retired), self.offers.rows(retired))
+            self._update_doc_freq(delta, 2 * (len(ids) - len(retired)))
+            log_df = np.log1p(self.doc_freq.astype(np.float64))
+            start = len(self.row_profile)
+            self.needs.append(needs, log_df)
+            self.offers.append(offers, log_df)
+            self.row_profile = np.concatenate([self.row_profile, ids])
+            self.alive = np.concatenate([self.alive, np.ones(len(ids), dtype=bool)])
+            self.profile_row.update(zip(ids.tolist(), range(start, start + len(ids))))
+
+    @staticmethod
+    def _term_counts(needs, offers):
+        # CSR rows hold each hashed term once, so a bincount of column indices
+        # is the number of documents containing each term.
+        return (np.bincount(needs.indices, minlength=N_FEATURES)
+                + np.bincount(offers.indices, minlength=N_FEATURES)).astype(np.int64)
+
+    def _update_doc_freq(self, delta, docs):
+        """Apply document-frequency changes and refresh the cached norm terms of the affected terms."""
+        terms = np.flatnonzero(delta)
+        old = np.log1p(self.doc_freq[terms].astype(np.float64))
+        self.doc_freq[terms] += delta[terms]
+        self.n_docs += docs
+        new = np.log1p(self.doc_freq[terms].astype(np.float64))
+        if len(terms):
+            for store in (self.needs, self.offers):
+                store.reweight(terms, new - old, new * new - old * old)
+
+    # --- queries ---
+
+    def _offset(self):
+        """a in idf_j = a - log(1 + df_j)."""
+        return np.log1p(self.n_docs) + 1
+
+    def idf(self):
+        """Smoothed IDF from the current document frequencies (as sklearn's TfidfTransformer)."""
+        return (np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1).astype(np.float32)
+
+    def _cosines(self, store, query):
+        """
+        IDF-weighted cosine of one sparse row against every row of `store`.
+        Only the query's term columns are read (CSC) and row norms come from
+        the cached norm terms, so the cost follows the rows sharing a term.
+        """
+        a = self._offset()
+        terms = query.indices
+        idf = a - np.log1p(self.doc_freq[terms].astype(np.float64))
+        weights = query.data * idf * idf
+        q_norm = np.sqrt(np.dot(query.data * query.data, idf * idf))
+        parts = []
+        for block in store.blocks:
+            scores = np.zeros(block.size, dtype=np.float64)
+            if q_norm > 0 and len(terms):
+                dots = block.csc[:, terms] @ weights
+                hit = np.flatnonzero(dots)
+                norms = np.sqrt(block.sq_norms(a, hit))
+                ok = norms > 0
+                scores[hit[ok]] = dots[hit[ok]] / (norms[ok] * q_norm)
+            parts.append(scores)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float64)
+
+    def top_matches(self, profile_id, k=TOP_K):
+        """[(profile id, score, need_score, offer_score)] best first, excluding the profile itself."""
+        with self.lock:
+            row = self.profile_row.get(int(profile_id))
+            if row is None:
+                return []
+            need_score = self._cosines(self.offers, self.needs.row(row))
+            offer_score = self._cosines(self.needs, self.offers.row(row))
+            score = (need_score + offer_score) / 2
+            score[~self.alive] = 0
+            score[row] = 0
+            k = min(k, int((score > 0).sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(-score, k - 1)[:k]
+            top = top[np.argsort(-score[top])]
+            return [(int(self.row_profile[r]), float(score[r]), float(need_score[r]), float(offer_score[r]))
+                    for r in top]
+
+    # --- persistence / sync ---
+
+    def sync(self, db=None):
+        """Index profiles saved since the last sync (via the store's change feed); returns rows read."""
+        with self.lock:
+            conn = connect_store(db)
+            read = 0
+            if not self.built:
+                # first build: every profile, then follow the feed from its current end
+                self.last_change = conn.execute("SELECT coalesce(max(seq), 0) FROM profile_changes").fetchone()[0]
+                after = 0
+                while True:
+                    rows = conn.execute("SELECT id, needs, offers FROM profiles WHERE id > ? ORDER BY id LIMIT ?",
+                                        (after, SYNC_CHUNK)).fetchall()
+                    if not rows:
+                        break
+                    self.add_profiles([{"id": i, "needs": n, "offers": o} for i, n, o in rows])
+                    read += len(rows)
+                    after = rows[-1][0]
+                self.built = True
+            while True:
+                rows = conn.execute(
+                    "SELECT c.seq, p.id, p.needs, p.offers FROM profile_changes c JOIN profiles p ON p.id = c.profile_id "
+                    "WHERE c.seq > ? ORDER BY c.seq LIMIT ?", (self.last_change, SYNC_CHUNK)).fetchall()
+                if not rows:
+                    break
+                self.add_profiles([{"id": i, "needs": n, "offers": o} for _, i, n, o in rows])
+                read += len(rows)
+                self.last_change = rows[-1][0]
+            return read
+
+def snapshot_path():
+    return state_path("b2b_match_index.pkl")
+
+def save_snapshot(index, path=None):
+    """Write the index to disk so a restart only syncs what changed since."""
+    path = path or snapshot_path()
+    with index.lock:
+        state = {k: v for k, v in index.__dict__.items() if k != "lock"}
+        state["format"] = SNAPSHOT_FORMAT
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    return path
+
+def load_snapshot(path=None):
+    path = path or snapshot_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.pop("format", None) != SNAPSHOT_FORMAT:
+        return None
+    index = MatchIndex()
+    index.__dict__.update(state)
+    return index
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+def match_index():
+    """Process-wide index: loaded from the snapshot (or built) once, then kept in sync."""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                index = load_snapshot() or MatchIndex()
+                if index.sync() > SYNC_CHUNK:
+                    save_snapshot(index)
+                _INDEX = index
+    return _INDEX
+
+def profile_saved(profile_id):
+    """Hook for the profile form: index the saved profile right away."""
+    index = match_index()
+    index.sync()
+    return index.profile_row.get(int(profile_id)) is not None
+
+def find_matches(profile_id, k=TOP_K):
+    """Top-k complementary matches for a profile, as profile dicts with scores."""
+    index = match_index()
+    index.sync()
+    hits = index.top_matches(profile_id, k)
+    profiles = {p["id"]: p for p in get_profiles([h[0] for h in hits])}
+    return [dict(profiles[pid], score=s, they_offer_what_you_need=n, you_offer_what_they_need=o)
+            for pid, s, n, o in hits if pid in profiles]
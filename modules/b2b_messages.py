@@ -0,0 +1,114 @@
+# file: ai_tdm_suite/modules/b2b_messages.py
+
+import time
+
+from modules.b2b_store import db_path, get_profile, profile_name_for_key
+from modules.storage import connect_sqlite
+
+PAGE_SIZE = 20
+MAX_POLL = 500
+
+# Every inbox query is a range scan on (recipient, id): cost depends on one
+# recipient's page, never on how many messages the whole network holds.
+# Reads and mark_read() take the recipient's profile id plus its profile key
+# (issued by b2b_store.save_profile) and refuse (PermissionError) without it.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    recipient TEXT NOT NULL COLLATE NOCASE,
+    sender TEXT NOT NULL,
+    body TEXT NOT NULL,
+    sent_at REAL NOT NULL,
+    read_at REAL
+);
+CREATE INDEX IF NOT EXISTS messages_recipient ON messages(recipient, id);
+CREATE INDEX IF NOT EXISTS messages_unread ON messages(recipient, id) WHERE read_at IS NULL;
+CREATE TABLE IF NOT EXISTS unread_counts (
+    recipient TEXT PRIMARY KEY COLLATE NOCASE,
+    unread INTEGER NOT NULL DEFAULT 0
+);
+"""
+_COLUMNS = ("id", "recipient", "sender", "body", "sent_at", "read_at")
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM messages"
+
+def connect(path=None):
+    """This thread's connection to the B2B network database (messages tables)."""
+    return connect_sqlite(path or db_path(), SCHEMA)
+
+def _as_dicts(rows):
+    return [dict(zip(_COLUMNS, r)) for r in rows]
+
+def send_message(sender, recipient, body, db=None):
+    """
+    Store a message to an existing profile (by name) and bump its unread
+    counter atomically; returns the message id.
+    """
+    recipient = recipient.strip()
+    if not recipient or not body.strip():
+        raise ValueError("A message needs a recipient and a body.")
+    profile = get_profile(recipient, db)
+    if profile is None:
+        raise ValueError(f"No profile named {recipient!r}.")
+    recipient = profile["name"]
+    conn = connect(db)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.execute("INSERT INTO messages(recipient, sender, body, sent_at) VALUES (?, ?, ?, ?)",
+                           (recipient, sender, body, time.time()))
+        conn.execute("INSERT INTO unread_counts(recipient, unread) VALUES (?, 1) "
+                     "ON CONFLICT(recipient) DO UPDATE SET unread = unread + 1", (recipient,))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return cur.lastrowid
+
+def inbox(profile_id, key, limit=PAGE_SIZE, before=None, db=None):
+    """
+    Newest-first page of the messages for profile `profile_id`, opened with its `key`.
+    Pass the returned cursor as `before` for the next (older) page. Returns
+    (messages, next_cursor); next_cursor is None on the last page.
+    """
+    params = [profile_name_for_key(profile_id, key, db)]
+    sql = f"{_SELECT} WHERE recipient = ?"
+    if before is not None:
+        sql += " AND id < ?"
+        params.append(before)
+    rows = connect(db).execute(sql + " ORDER BY id DESC LIMIT ?", params + [limit + 1]).fetchall()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return _as_dicts(rows), (rows[-1][0] if more else None)
+
+def poll(profile_id, key, since, limit=MAX_POLL, db=None):
+    """Messages for the profile newer than message id `since`, oldest first."""
+    recipient = profile_name_for_key(profile_id, key, db)
+    rows = connect(db).execute(f"{_SELECT} WHERE recipient = ? AND id > ? ORDER BY id LIMIT ?",
+                               (recipient, since or 0, limit)).fetchall()
+    return _as_dicts(rows)
+
+def unread_count(profile_id, key, db=None):
+    """Unread messages for the profile (a single-row lookup)."""
+    recipient = profile_name_for_key(profile_id, key, db)
+    row = connect(db).execute("SELECT unread FROM unread_counts WHERE recipient = ?", (recipient,)).fetchone()
+    return row[0] if row else 0
+
+def mark_read(profile_id, key, up_to=None, db=None):
+    """Mark unread messages (up to id `up_to`) for the profile read; returns how many changed."""
+    recipient = profile_name_for_key(profile_id, key, db)
+    conn = connect(db)
+    params = [time.time(), recipient]
+    sql = "UPDATE messages SET read_at = ? WHERE recipient = ? AND read_at IS NULL"
+    if up_to is not None:
+        sql += " AND id <= ?"
+        params.append(up_to)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        changed = conn.execute(sql, params).rowcount
+        if changed:
+            conn.execute("UPDATE unread_counts SET unread = max(unread - ?, 0) WHERE recipient = ?",
+                         (changed, recipient))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return changed
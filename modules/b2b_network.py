@@ -2,63 +2,140 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from modules.audit import audit_log
+from modules.b2b_matching import find_matches, profile_saved
+from modules.b2b_messages import inbox, mark_read, poll, send_message, unread_count
+from modules.b2b_store import (claim_profile, profile_count, profile_name_for_key, save_profile,
+                               search_profiles)
+from modules.utils import check_session
 
-# --- In-memory "database" for MVP ---
-if "user_profiles" not in st.session_state:
-    st.session_state.user_profiles = []
+def main():
+    check_session()
+    owner = st.session_state["user_id"]
+    # --- User Profile Creation ---
+    st.header("🌐 B2B Founder/Exec Network")
+    st.markdown("Connect with entrepreneurs, investors, and creative leaders.")
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+    with st.expander("Create/Update Your Profile"):
+        name = st.text_input("Your Name")
+        company = st.text_input("Your Company or Project")
+        role = st.text_input("Your Role")
+        sector = st.text_input("Industry/Sector")
+        needs = st.text_area("Looking for...", placeholder="e.g. investors, advisors, co-founders, tech, clients")
+        offers = st.text_area("I can offer...", placeholder="e.g. funding, mentorship, marketing, dev, talent")
+        linkedin = st.text_input("LinkedIn URL (optional)")
+        profile_key = st.text_input("Profile key (leave blank for a new profile)", type="password")
+        update_profile = st.button("Save Profile")
+        if update_profile and name and company:
+            try:
+                profile_id, issued_key = save_profile({
+                    "name": name, "company": company, "role": role, "sector": sector,
+                    "needs": needs, "offers": offers, "linkedin": linkedin,
+                }, key=profile_key or None)
+            except PermissionError:
+                st.error("That name belongs to an existing profile. Enter its profile key to update it, "
+                         "or choose a different name.")
+            else:
+                st.session_state["b2b_auth"] = {"profile_id": profile_id, "key": issued_key}
+                profile_saved(profile_id)
+                audit_log("Saved B2B profile", owner)
+                st.success("Profile updated!")
+                if not profile_key:
+                    st.warning("Your profile key is shown only once. Keep it: you need it to edit "
+                               "this profile or read its inbox from another session or device.")
+                    st.code(issued_key)
 
-# --- User Profile Creation ---
-st.header("🌐 B2B Founder/Exec Network")
-st.markdown("Connect with entrepreneurs, investors, and creative leaders.")
+    # --- Suggested Matches (needs <-> offers) ---
+    auth = st.session_state.get("b2b_auth")
+    if auth:
+        st.subheader("🤝 Suggested Matches")
+        matches = pd.DataFrame(find_matches(auth["profile_id"]))
+        if matches.empty:
+            st.caption("No complementary profiles yet. Add what you're looking for and what you offer.")
+        else:
+            matches["match"] = (matches["score"] * 100).round().astype(int).astype(str) + "%"
+            st.dataframe(matches[["name", "company", "sector", "match", "offers", "needs"]], use_container_width=True)
+            st.caption("Ranked by how well their offers meet your needs and your offers meet theirs.")
 
-with st.expander("Create/Update Your Profile"):
-    name = st.text_input("Your Name")
-    company = st.text_input("Your Company or Project")
-    role = st.text_input("Your Role")
-    sector = st.text_input("Industry/Sector")
-    needs = st.text_area("Looking for...", placeholder="e.g. investors, advisors, co-founders, tech, clients")
-    offers = st.text_area("I can offer...", placeholder="e.g. funding, mentorship, marketing, dev, talent")
-    linkedin = st.text_input("LinkedIn URL (optional)")
-    update_profile = st.button("Save Profile")
-    if update_profile and name and company:
-        st.session_state.user_profiles.append({
-            "name": name, "company": company, "role": role, "sector": sector,
-            "needs": needs, "offers": offers, "linkedin": linkedin,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.success("Profile updated!")
+    # --- Browse/Search Network ---
+    st.subheader("🔎 Find Founders & Companies")
+    search = st.text_input("Search by name, company, sector, or keyword")
+    total = profile_count()
+    profiles = pd.DataFrame(search_profiles(search))
+    if not profiles.empty:
+        st.dataframe(profiles[["name", "company", "role", "sector", "needs", "offers", "linkedin"]], use_container_width=True)
+        if search.strip():
+            st.caption(f"Top {len(profiles)} matches, best first ({total:,} profiles in the network)")
+        else:
+            st.caption(f"{len(profiles)} most recent of {total:,} profiles")
+    elif total:
+        st.info("No profiles match your search.")
+    else:
+        st.info("No profiles found yet. Be the first to join!")
 
-# --- Browse/Search Network ---
-st.subheader("🔎 Find Founders & Companies")
-search = st.text_input("Search by name, company, sector, or keyword")
-profiles = pd.DataFrame(st.session_state.user_profiles)
-if not profiles.empty:
-    filtered = profiles[
-        profiles.apply(lambda row: search.lower() in str(row).lower(), axis=1) if search else slice(None)
-    ]
-    st.dataframe(filtered[["name", "company", "role", "sector", "needs", "offers", "linkedin"]], use_container_width=True)
-else:
-    st.info("No profiles found yet. Be the first to join!")
+    # --- Direct Messaging ---
+    st.subheader("💬 Direct Message")
+    if not profiles.empty:
+        target_name = st.selectbox("Who do you want to message?", profiles["name"].unique())
+        msg = st.text_area("Your message", height=60)
+        if st.button("Send Message"):
+            if msg.strip():
+                # sign with the member's profile name when this session holds its key, so replies can reach it
+                sender = profile_name_for_key(auth["profile_id"], auth["key"]) if auth else owner
+                send_message(sender, target_name, msg)
+                audit_log("Sent B2B message", owner)
+                st.success("Message sent!")
+            else:
+                st.warning("Write a message first.")
 
-# --- Simple Messaging (MVP only; not persistent) ---
-st.subheader("💬 Direct Message (MVP)")
-if not profiles.empty:
-    target_name = st.selectbox("Who do you want to message?", profiles["name"].unique())
-    msg = st.text_area("Your message", height=60)
-    if st.button("Send Message"):
-        st.session_state.messages.append({
-            "from": st.session_state.get("user_id", "anon"),
-            "to": target_name,
-            "body": msg,
-            "timestamp": datetime.now().isoformat()
-        })
-        st.success("Message sent (demo only; not persistent)")
+    # --- Inbox (for the profile this session saved or opened with its key) ---
+    st.subheader("📥 Your Inbox")
+    if auth is None:
+        st.info("Save your profile, or open it with its profile key, to see your inbox.")
+        c1, c2 = st.columns(2)
+        inbox_name = c1.text_input("Profile name", key="b2b_inbox_name")
+        inbox_key = c2.text_input("Profile key", type="password", key="b2b_inbox_key")
+        if st.button("Open Inbox", key="b2b_open_inbox") and inbox_name:
+            try:
+                claimed = claim_profile(inbox_name, inbox_key)
+            except PermissionError:
+                st.error("Unknown profile or wrong profile key.")
+            else:
+                st.session_state["b2b_auth"] = {"profile_id": claimed["id"], "key": inbox_key}
+                audit_log("Opened B2B inbox", owner)
+                st.rerun()
+        return
+    profile_id, key = auth["profile_id"], auth["key"]
+    # Per-session view: first page on open, then only messages newer than the
+    # last one seen (poll) and older pages on request.
+    box = st.session_state.get("b2b_inbox")
+    if box is None or box["profile_id"] != profile_id:
+        items, older = inbox(profile_id, key)
+        box = st.session_state["b2b_inbox"] = {"profile_id": profile_id, "items": items, "older": older,
+                                               "since": items[0]["id"] if items else 0}
+    else:
+        fresh = poll(profile_id, key, box["since"])
+        if fresh:
+            box["items"] = fresh[::-1] + box["items"]
+            box["since"] = fresh[-1]["id"]
+            st.toast(f"{len(fresh)} new message(s)")
+    unread = unread_count(profile_id, key)
+    c1, c2 = st.columns([1, 3])
+    c1.metric("Unread", unread)
+    if unread and c2.button("Mark all as read", key="b2b_mark_read"):
+        mark_read(profile_id, key, up_to=box["since"])
+        for m in box["items"]:
+            m["read_at"] = m["read_at"] or datetime.now().timestamp()
+        st.rerun()
+    for m in box["items"]:
+        sent = datetime.fromtimestamp(m["sent_at"]).strftime("%Y-%m-%d %H:%M")
+        st.info(f"{'' if m['read_at'] else '🆕 '}From: {m['sender']} | {sent}\n\n{m['body']}")
+    if not box["items"]:
+        st.caption("No messages yet.")
+    if box["older"] is not None and st.button("Load older messages", key="b2b_older"):
+        items, box["older"] = inbox(profile_id, key, before=box["older"])
+        box["items"].extend(items)
+        st.rerun()
 
-# --- Inbox ---
-st.subheader("📥 Your Inbox (Demo)")
-my_msgs = [m for m in st.session_state.messages if m["to"] == name]
-for m in my_msgs:
-    st.info(f"From: {m['from']} | {m['timestamp']}\n\n{m['body']}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# file: ai_tdm_suite/modules/b2b_store.py
+
+import hashlib
+import hmac
+import re
+import secrets
+import sqlite3
+from datetime import datetime
+
+from modules.storage import connect_sqlite, state_path
+
+PROFILE_FIELDS = ("name", "company", "role", "sector", "needs", "offers", "linkedin")
+SEARCH_FIELDS = ("name", "company", "role", "sector", "needs", "offers")
+# bm25 column weights, in SEARCH_FIELDS order: a hit in the name counts most.
+SEARCH_WEIGHTS = (5.0, 4.0, 2.0, 2.0, 1.0, 1.0)
+DEFAULT_LIMIT = 50
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    company TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    sector TEXT NOT NULL DEFAULT '',
+    needs TEXT NOT NULL DEFAULT '',
+    offers TEXT NOT NULL DEFAULT '',
+    linkedin TEXT NOT NULL DEFAULT '',
+    key_hash TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_updated ON profiles(updated_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+    name, company, role, sector, needs, offers,
+    content='profiles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS profiles_ai AFTER INSERT ON profiles BEGIN
+    INSERT INTO profiles_fts(rowid, name, company, role, sector, needs, offers)
+    VALUES (new.id, new.name, new.company, new.role, new.sector, new.needs, new.offers);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_ad AFTER DELETE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, company, role, sector, needs, offers)
+    VALUES ('delete', old.id, old.name, old.company, old.role, old.sector, old.needs, old.offers);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_au AFTER UPDATE ON profiles BEGIN
+    INSERT INTO profiles_fts(profiles_fts, rowid, name, company, role, sector, needs, offers)
+    VALUES ('delete', old.id, old.name, old.company, old.role, old.sector, old.needs, old.offers);
+    INSERT INTO profiles_fts(rowid, name, company, role, sector, needs, offers)
+    VALUES (new.id, new.name, new.company, new.role, new.sector, new.needs, new.offers);
+END;
+-- Ordered change feed so derived indexes (matchmaking) can catch up incrementally.
+CREATE TABLE IF NOT EXISTS profile_changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, profile_id INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS profiles_log_ai AFTER INSERT ON profiles BEGIN
+    INSERT INTO profile_changes(profile_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS profiles_log_au AFTER UPDATE ON profiles BEGIN
+    INSERT INTO profile_changes(profile_id) VALUES (new.id);
+END;
+"""
+
+_UPSERT = (
+    f"INSERT INTO profiles({', '.join(PROFILE_FIELDS)}, key_hash, updated_at) "
+    f"VALUES ({', '.join('?' * (len(PROFILE_FIELDS) + 2))}) "
+    "ON CONFLICT(name) DO UPDATE SET "
+    + ", ".join(f"{f} = excluded.{f}" for f in PROFILE_FIELDS[1:] + ("updated_at",))
+    # only the holder of the profile's key may overwrite it; '=' never matches
+    # a NULL key_hash, so keyless rows cannot be overwritten by anyone
+    + " WHERE profiles.key_hash = excluded.key_hash"
+)
+_COLUMNS = ("id",) + PROFILE_FIELDS + ("updated_at",)
+_SELECT = f"SELECT {', '.join('p.' + c for c in _COLUMNS)} FROM profiles p"
+
+def db_path():
+    """Default location of the B2B network database (profiles and messages)."""
+    return state_path("b2b_network.sqlite3")
+
+_MIGRATED = set()
+
+def connect(path=None):
+    """This thread's connection to the B2B network database."""
+    path = path or db_path()
+    conn = connect_sqlite(path, SCHEMA)
+    if path not in _MIGRATED:
+        # databases created before profile keys have no key_hash column; their
+        # rows stay keyless (read-only) until re-created under a new name
+        if "key_hash" not in {r[1] for r in conn.execute("PRAGMA table_info(profiles)")}:
+            try:
+                conn.execute("ALTER TABLE profiles ADD COLUMN key_hash TEXT")
+            except sqlite3.OperationalError:
+                pass  # another connection added it first
+        _MIGRATED.add(path)
+    return conn
+
+def new_profile_key():
+    """A fresh secret for a profile: shown to its creator once, stored only as a hash."""
+    return secrets.token_urlsafe(16)
+
+def _key_hash(key):
+    if not key:
+        raise PermissionError("A profile key is required.")
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def _row(profile, key_hash, now):
+    name = (profile.get("name") or "").strip()
+    if not name:
+        raise ValueError("A profile needs a name.")
+    return (name,) + tuple((profile.get(f) or "").strip() for f in PROFILE_FIELDS[1:]) + (key_hash, now)
+
+def save_profile(profile, key=None, db=None):
+    """
+    Create or update (by name, case-insensitive) one profile; returns
+    (profile_id, key). Without a key a new profile is created under a freshly
+    issued key, which the caller must hand to the member: it is needed to
+    edit the profile or read its inbox later, from any session. Raises
+    PermissionError if the name exists and `key` is missing or wrong.
+    """
+    key = key or new_profile_key()
+    conn = connect(db)
+    row = _row(profile, _key_hash(key), datetime.now().isoformat(timespec="seconds"))
+    if not conn.execute(_UPSERT, row).rowcount:
+        raise PermissionError(f"The name {row[0]!r} is already used by another member's profile.")
+    profile_id = conn.execute("SELECT id FROM profiles WHERE name = ?", (row[0],)).fetchone()[0]
+    return profile_id, key
+
+def save_profiles(profiles, key, db=None):
+    """
+    Bulk upsert under one key, in one transaction (imports, seeding); returns
+    the number written. Names held by a profile with a different key are
+    left untouched.
+    """
+    conn = connect(db)
+    now = datetime.now().isoformat(timespec="seconds")
+    key_hash = _key_hash(key)
+    rows = [_row(p, key_hash, now) for p in profiles]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        written = conn.executemany(_UPSERT, rows).rowcount
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return written
+
+def _as_dicts(rows):
+    return [dict(zip(_COLUMNS, r)) for r in rows]
+
+def match_query(text):
+    """FTS5 query for free text: every word must match, each as a prefix ("mark" -> marketing)."""
+    tokens = _TOKEN.findall(text.lower())
+    return " ".join(f'"{t}"*' for t in tokens) or None
+
+def search_profiles(text, limit=DEFAULT_LIMIT, offset=0, db=None):
+    """Profiles matching every word of `text` (prefix match), best bm25 rank first."""
+    query = match_query(text)
+    if query is None:
+        return recent_profiles(limit, offset, db)
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    rows = connect(db).execute(
+        f"{_SELECT} JOIN (SELECT rowid, bm25(profiles_fts, {weights}) AS rank FROM profiles_fts "
+        "WHERE profiles_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?) m ON m.rowid = p.id ORDER BY m.rank",
+        (query, limit, offset),
+    ).fetchall()
+    return _as_dicts(rows)
+
+def recent_profiles(limit=DEFAULT_LIMIT, offset=0, db=None):
+    """Most recently created or updated profiles."""
+    rows = connect(db).execute(f"{_SELECT} ORDER BY p.updated_at DESC, p.id DESC LIMIT ? OFFSET ?",
+                               (limit, offset)).fetchall()
+    return _as_dicts(rows)
+
+def get_profile(name, db=None):
+    """One profile by name (case-insensitive), or None."""
+    rows = connect(db).execute(f"{_SELECT} WHERE p.name = ?", (name,)).fetchall()
+    return _as_dicts(rows)[0] if rows else None
+
+def _check_key(row, key):
+    # row is (..., key_hash); unknown profiles and keyless rows fail the same way
+    if row is None or not key or row[-1] is None or not hmac.compare_digest(row[-1], _key_hash(key)):
+        raise PermissionError("Unknown profile or wrong profile key.")
+
+def claim_profile(name, key, db=None):
+    """
+    The profile named `name` if `key` is its profile key (e.g. to open it
+    from a new session); raises PermissionError otherwise.
+    """
+    row = connect(db).execute(f"SELECT {', '.join('p.' + c for c in _COLUMNS)}, p.key_hash "
+                              "FROM profiles p WHERE p.name = ?", ((name or "").strip(),)).fetchone()
+    _check_key(row, key)
+    return dict(zip(_COLUMNS, row))
+
+def profile_name_for_key(profile_id, key, db=None):
+    """
+    Name of profile `profile_id` if `key` is its profile key. Raises
+    PermissionError otherwise (unknown id, wrong or missing key), so private
+    data keyed by the profile is only read by whoever holds its key.
+    """
+    row = connect(db).execute("SELECT name, key_hash FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+    _check_key(row, key)
+    return row[0]
+
+def get_profiles(ids, db=None):
+    """Profiles by id, in the order given (missing ids are skipped)."""
+    ids = list(ids)
+    if not ids:
+        return []
+    marks = ", ".join("?" * len(ids))
+    found = {r["id"]: r for r in _as_dicts(connect(db).execute(f"{_SELECT} WHERE p.id IN ({marks})", ids))}
+    return [found[i] for i in ids if i in found]
+
+def profile_count(db=None):
+    return connect(db).execute("SELECT count(*) FROM profiles").fetchone()[0]
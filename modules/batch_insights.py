@@ -0,0 +1,170 @@
+# file: ai_tdm_suite/modules/batch_insights.py
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from modules.chart_cache import render_png
+from modules.demand_forecast import HORIZON_DAYS, forecast_demand
+from modules.exports import available_formats, export_bytes
+from modules.ticket_aggregates import DEFAULT_CHUNKSIZE, has_dim, rollup, stream_aggregates
+
+# Report formats: table formats map to exports.export_bytes names; "png" is the sales chart.
+REPORT_FORMATS = {"csv": "CSV", "parquet": "Parquet", "png": None}
+SUMMARY_COLUMNS = ["venue", "status", "rows", "invalid_dates", "tickets_sold", "first_date", "last_date",
+                   "best_forecast_day", "seconds", "error"]
+
+def venue_name(path, root):
+    """Report name for a CSV: its path under `root` without extension, '/' -> '__'."""
+    rel = os.path.relpath(path, root)
+    for ext in (".gz", ".csv"):
+        if rel.endswith(ext):
+            rel = rel[:-len(ext)]
+    return rel.replace(os.sep, "__")
+
+def source_key(path):
+    """Cache key for a file's contents without re-reading it: path, size and mtime."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+def venue_tables(aggs, key, horizon=HORIZON_DAYS):
+    """Dashboard breakdowns for one venue: daily sales, age/channel/show splits and the forecast."""
+    cube = aggs["cube"]
+    tables = {"daily_sales": rollup(cube, "date").rename("tickets_sold").reset_index()}
+    if has_dim(aggs, "age_group"):
+        tables["age_groups"] = rollup(cube, "age_group", measure="rows").rename("rows").reset_index()
+    for dim in ("channel", "show"):
+        if has_dim(aggs, dim):
+            tables[f"{dim}_sales"] = (rollup(cube, dim).rename("tickets_sold")
+                                      .sort_values(ascending=False).reset_index())
+    forecast = forecast_demand(cube, key, by_show=True, horizon=horizon)
+    tables["forecast"] = (forecast.rename_axis("date").stack(["level", "series"], future_stack=True)
+                          .rename("predicted_tickets_sold").round().astype("int64").reset_index())
+    return tables
+
+def draw_sales(ax, daily, forecast):
+    """Daily tickets with the total forecast appended as a dashed line."""
+    ax.plot(daily["date"], daily["tickets_sold"], marker="o", linewidth=2, color="#23244d", label="actual")
+    total = forecast[forecast["level"] == "total"]
+    ax.plot(total["date"], total["predicted_tickets_sold"], linestyle="--", marker="o", color="#ff7c43", label="forecast")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Tickets Sold")
+    ax.legend()
+    ax.tick_params(axis="x", labelrotation=30)
+
+def process_venue(path, out_dir, venue, formats=("csv", "png"), chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Aggregate one ticket CSV (streamed in bounded chunks) and write its
+    reports to out_dir/<venue>/. Returns a summary row; failures are
+    reported in the row instead of raised so one bad file never stops a run.
+    """
+    start = time.perf_counter()
+    row = dict.fromkeys(SUMMARY_COLUMNS)
+    row.update(venue=venue, status="ok")
+    try:
+        key = source_key(path)
+        aggs = stream_aggregates(path, chunksize=chunksize)
+        tables = venue_tables(aggs, key)
+        target = os.path.join(out_dir, venue)
+        os.makedirs(target, exist_ok=True)
+        for fmt in formats:
+            if fmt == "png":
+                png = render_png(("batch_sales", key),
+                                 lambda fig, ax: draw_sales(ax, tables["daily_sales"], tables["forecast"]),
+                                 figsize=(8, 4))
+                with open(os.path.join(target, "sales.png"), "wb") as f:
+                    f.write(png)
+                continue
+            for name, table in tables.items():
+                with open(os.path.join(target, f"{name}.{fmt}"), "wb") as f:
+                    f.write(export_bytes(table, REPORT_FORMATS[fmt], watermark=False))
+        daily, total = tables["daily_sales"], tables["forecast"]
+        total = total[total["level"] == "total"]
+        row.update(
+            rows=aggs["rows"], invalid_dates=aggs["invalid_dates"],
+            tickets_sold=int(daily["tickets_sold"].sum()),
+            first_date=daily["date"].min().date().isoformat(), last_date=daily["date"].max().date().isoformat(),
+            best_forecast_day=total.loc[total["predicted_tickets_sold"].idxmax(), "date"].date().isoformat(),
+        )
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+def run_batch(input_dir, out_dir, pattern="*.csv", workers=None, formats=("csv", "png"),
+              chunksize=DEFAULT_CHUNKSIZE, log=print):
+    """
+    Process every CSV matching `pattern` under `input_dir` across a process
+    pool (largest files first, so stragglers start early) and write
+    summary.csv / summary.json to `out_dir`. Returns the summary dict.
+    """
+    unknown = set(formats) - set(REPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown report formats: {', '.join(sorted(unknown))}")
+    if "parquet" in formats and "Parquet" not in available_formats():
+        raise ValueError("Parquet reports need pyarrow installed.")
+    paths = sorted(glob.glob(os.path.join(input_dir, pattern), recursive=True), key=os.path.getsize, reverse=True)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+    jobs = [(p, out_dir, venue_name(p, input_dir), tuple(formats), chunksize) for p in paths]
+    rows = []
+    if workers == 1:
+        for job in jobs:
+            rows.append(process_venue(*job))
+            log(f"{rows[-1]['status']:>5}  {rows[-1]['venue']}  ({rows[-1]['seconds']}s)")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(process_venue, *job) for job in jobs]):
+                rows.append(future.result())
+                log(f"{rows[-1]['status']:>5}  {rows[-1]['venue']}  ({rows[-1]['seconds']}s)")
+    seconds = time.perf_counter() - start
+    table = pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values("venue", ignore_index=True)
+    counts = ["rows", "invalid_dates", "tickets_sold"]
+    table[counts] = table[counts].astype("Int64")
+    table.to_csv(os.path.join(out_dir, "summary.csv"), index=False)
+    total_rows = int(table["rows"].fillna(0).sum())
+    summary = {
+        "started_at": started_at,
+        "input_dir": os.path.abspath(input_dir),
+        "workers": workers,
+        "formats": list(formats),
+        "venues": len(table),
+        "failed": int((table["status"] != "ok").sum()),
+        "rows": total_rows,
+        "seconds": round(seconds, 3),
+        "rows_per_s": round(total_rows / seconds) if seconds else None,
+        "results": json.loads(table.to_json(orient="records")),
+    }
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Audience Insights over a directory of ticket CSVs.")
+    parser.add_argument("input_dir")
+    parser.add_argument("out_dir")
+    parser.add_argument("--pattern", default="*.csv", help="glob under input_dir ('**/*.csv' recurses)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--formats", default="csv,png", help=f"comma-separated subset of {', '.join(REPORT_FORMATS)}")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    try:
+        summary = run_batch(args.input_dir, args.out_dir, args.pattern, args.workers, formats, args.chunksize)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{summary['venues']} venues ({summary['failed']} failed), {summary['rows']:,} rows "
+          f"in {summary['seconds']}s on {summary['workers']} workers -> {args.out_dir}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
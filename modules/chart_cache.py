@@ -0,0 +1,53 @@
+# file: ai_tdm_suite/modules/chart_cache.py
+
+import hashlib
+import io
+
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+
+# PNG bytes per (chart name, data hash, spec); a few hundred small images.
+CHART_CACHE = LRUCache(maxsize=256)
+
+def data_key(*parts):
+    """Short stable hash for the data a chart depends on (strings, bytes or pandas objects)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            h.update(part)
+        elif hasattr(part, "to_numpy") and hasattr(part, "index"):
+            import pandas as pd
+            h.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            h.update(repr(list(getattr(part, "columns", []))).encode())
+        else:
+            h.update(repr(part).encode())
+    return h.hexdigest()[:20]
+
+@timed("chart render")
+def render_png(key, draw, figsize=(6.4, 4.8), dpi=100):
+    """
+    Return PNG bytes for `draw(fig, ax)`, rendering at most once per key.
+
+    Figures are built on a bare matplotlib Figure (never registered with
+    pyplot), so nothing keeps them alive once rasterized; they are cleared
+    explicitly before returning.
+    """
+    png = CHART_CACHE.get(key)
+    if png is not None:
+        return png
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        ax = fig.subplots()
+        draw(fig, ax)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        png = buf.getvalue()
+    finally:
+        fig.clear()
+    CHART_CACHE.put(key, png)
+    return png
+
+def chart_cache_stats():
+    """Hit/miss counters for the render cache."""
+    return CHART_CACHE.stats()
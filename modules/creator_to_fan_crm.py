@@ -3,48 +3,141 @@
 import streamlit as st
 import pandas as pd
 import random
-from datetime import datetime
+import time
+from modules.exports import export_download
+from modules.fan_audience import cached_audience_index
+from modules.fan_dedup import cached_dedup
+from modules.fan_engagement import (NO_ACTIVITY, SEGMENTS, ingest_events, load_state, new_workspace_key,
+                                    upload_engagement, workspace_exists)
+from modules.fan_segments import DEFAULT_SEGMENTS, cached_segments
+from modules.frame_loader import load_csv, memory_summary
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
-# ==== Revenue Model Badges (configurable per module) ====
-ALL_REVENUE_MODELS = [
-    {"grade": "A",   "category": "Membership",            "name": "Membership Site",      "desc": "Community, perks",            "rationale": "Predictable, scalable, high LTV."},
-    {"grade": "A",   "category": "Marketplaces/Aggregator","name": "Marketplace/Aggregator","desc": "Connect buyers/sellers",    "rationale": "Network effects, high profitability."},
-    {"grade": "B+",  "category": "Transaction-Based",     "name": "Commission/Fees",       "desc": "Fee per sale",                "rationale": "Scalable, 10-30% fees."},
-    {"grade": "A-",  "category": "Affiliate Marketing",   "name": "Affiliate Marketing",   "desc": "Promote for commission",      "rationale": "Zero inventory, passive."},
-    {"grade": "B",   "category": "Customer Loyalty",      "name": "Loyalty/Rewards",       "desc": "Incentivize repeats",         "rationale": "Retention, scalable digital."},
-]
-MODULE_REVENUE_MODELS = {
-    "Creator-to-Fan AI CRM": [
-        "Membership Site", "Marketplace/Aggregator", "Commission/Fees", "Affiliate Marketing", "Loyalty/Rewards"
-    ]
-}
-
-def show_revenue_badges(module):
-    """Display all revenue models enabled for this module as stylish badges."""
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-            f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-            f"{m['name']} ({m['grade']})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
+# Fan lists above this size are previewed instead of loaded whole; segmentation streams either way.
+PREVIEW_THRESHOLD_BYTES = 200 * 1024 * 1024
+PREVIEW_ROWS = 5
+AUDIENCE_SAMPLE_ROWS = 20
 
 # ==== Helpers ====
 def consent_checkbox(label):
     """Show a checkbox and return True if checked."""
     return st.checkbox(f"☑️ I consent to {label}")
 
-def audit_log(action, user="anon"):
-    """Simple audit log for MVP (stdout), swap for persistent logging in prod."""
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
-
 def is_pro():
     """Detect if user is on Pro plan."""
     return st.session_state.get("pro_user", False)
 
+def show_dedup_report(uploaded_fans, fans_df=None):
+    """Duplicate fans found across merged sources, with a deduplicated export for in-memory lists."""
+    st.subheader("🧹 Duplicate Fans")
+    with st.spinner("Resolving fan identities..."):
+        result = cached_dedup(uploaded_fans)
+    report = result["report"]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Rows", f"{report['rows']:,}")
+    c2.metric("Unique fans", f"{report['identities']:,}")
+    c3.metric("Duplicates merged", f"{report['duplicates']:,}")
+    st.caption(f"{report['email_matches']:,} same-email and {report['fuzzy_matches']:,} fuzzy name/email matches "
+               f"({report['pairs_compared']:,} pairs compared in {report['blocks_compared']:,} blocks, "
+               f"{report['seconds']:.1f}s).")
+    if not result["merged"].empty:
+        with st.expander(f"Merged identities ({report['merged_identities']:,})"):
+            st.dataframe(result["merged"][["fans", "name", "city", "names", "emails"]], use_container_width=True)
+    if fans_df is not None and report["duplicates"]:
+        export_download("Download Deduplicated Fan List", fans_df[result["keep"]], "fans_deduplicated",
+                        user_id=st.session_state.get("user_id", "anon"), key="crm_dedup_export")
+
+def show_audience_builder(uploaded_fans, fans_df=None):
+    """Boolean interest/city targeting over the upload's audience index."""
+    st.subheader("🎯 Audience Builder")
+    with st.spinner("Indexing interests and cities..."):
+        index = cached_audience_index(uploaded_fans)
+    if not index.rows:
+        return
+    interests = list(index.interest_counts().index)
+    cities = list(index.city_counts().index)
+    c1, c2, c3 = st.columns(3)
+    all_of = c1.multiselect("Interested in all of", interests)
+    any_of = c2.multiselect("…and any of", interests)
+    none_of = c3.multiselect("…but none of", interests)
+    c1, c2 = st.columns(2)
+    in_cities = c1.multiselect("In cities", cities)
+    not_cities = c2.multiselect("Not in cities", cities)
+    start = time.perf_counter()
+    audience = index.query(all_of, any_of, none_of, in_cities, not_cities)
+    size = index.count(audience)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.metric("Audience size", f"{size:,}", f"{size / index.rows:.1%} of fans", delta_color="off")
+    st.caption(f"Queried {index.rows:,} fans in {elapsed_ms:.1f} ms.")
+    if fans_df is not None and size:
+        st.dataframe(fans_df.iloc[index.row_ids(audience, AUDIENCE_SAMPLE_ROWS)], use_container_width=True)
+
+def open_workspace():
+    """The engagement workspace key for this session, asking for one (or creating it) first; None until then."""
+    workspace = st.session_state.get("crm_workspace")
+    if workspace:
+        if st.session_state.pop("crm_workspace_issued", False):
+            st.warning("Your workspace key is shown only once. Keep it: you need it to see these scores "
+                       "again in another session or on another device.")
+            st.code(workspace)
+        return workspace
+    st.caption("Engagement scores are kept in your workspace. Open it with its key, or create one.")
+    c1, c2 = st.columns([3, 1])
+    entered = c1.text_input("Workspace key", type="password", key="crm_workspace_key")
+    if c2.button("Open", key="crm_workspace_open") and entered:
+        if workspace_exists(entered):
+            st.session_state["crm_workspace"] = entered
+            st.rerun()
+        st.error("No workspace with that key.")
+    if st.button("Create a new workspace", key="crm_workspace_new"):
+        st.session_state["crm_workspace"] = new_workspace_key()
+        st.session_state["crm_workspace_issued"] = True
+        st.rerun()
+    return None
+
+def show_engagement(uploaded_fans=None):
+    """Persisted RFM engagement scores: add activity files, then segment counts (overall and for the upload)."""
+    st.subheader("📈 Engagement Scores")
+    workspace = open_workspace()
+    if workspace is None:
+        return
+    owner = st.session_state.get("user_id", "anon")
+    with st.expander("Add fan activity"):
+        kind = st.selectbox("Activity type", ["Ticket sales", "Merch orders", "Tips"], key="crm_activity_kind")
+        files = st.file_uploader("Upload activity (CSV: email,date,amount or price,tickets_sold/quantity)",
+                                 type=["csv"], accept_multiple_files=True, key="crm_activity_files")
+        if files and st.button("Update scores", key="crm_activity_ingest"):
+            for f in files:
+                try:
+                    with st.spinner(f"Scoring {f.name}..."):
+                        report = ingest_events(f, workspace, kind=kind, name=f.name)
+                except ValueError as e:
+                    st.error(f"{f.name}: {e}")
+                    continue
+                if report["skipped"]:
+                    st.info(f"{f.name} was already added.")
+                else:
+                    st.success(f"{f.name}: {report['events']:,} events from {report['fans']:,} fans "
+                               f"({report['seconds']:.1f}s).")
+                    audit_log("Added fan activity", owner, kind=kind)
+    state = load_state(workspace)
+    summary = state["summary"]
+    if not summary.get("fans"):
+        st.info("No fan activity yet. Add ticket sales, merch orders or tips to score your fans.")
+        return
+    matched = upload_engagement(uploaded_fans, workspace, state) if uploaded_fans else None
+    counts = matched["counts"] if matched else summary
+    cols = st.columns(len(SEGMENTS) + (1 if uploaded_fans else 0))
+    for col, name in zip(cols, SEGMENTS + ((NO_ACTIVITY,) if uploaded_fans else ())):
+        col.metric(name, f"{counts.get(name, 0):,}")
+    scope = "in your fan list" if uploaded_fans else "across all activity"
+    st.caption(f"Fans {scope}, scored on recency, frequency and spend from {summary['events']:,} events "
+               f"({summary['batches']} files, latest {summary['as_of']}).")
+    if matched and not matched["top"].empty:
+        with st.expander("Top fans by engagement"):
+            st.dataframe(matched["top"], use_container_width=True)
+
 # ==== Main App ====
 def main():
     st.header("🧑‍🎤 Creator-to-Fan AI CRM (MVP Demo)")
@@ -54,7 +147,7 @@ def main():
 - Import/upload your fan list  
 - AI-powered audience segmentation  
 - Smart messaging  
-- Engagement scores for each fan (simulated)  
+- Engagement (RFM) scores for each fan  
 - Marketplace for 3rd-party sellers/fans
     """)
 
@@ -64,14 +157,30 @@ def main():
         if not consent_checkbox("use of uploaded fan data for segmentation and messaging."):
             st.warning("Consent required to proceed.")
             st.stop()
-        fans_df = pd.read_csv(uploaded_fans)
-        st.dataframe(fans_df.head(), use_container_width=True)
-        st.subheader("Fan Segments (Simulated)")
-        st.write("Superfans:", random.randint(20, 100))
-        st.write("Active Fans:", random.randint(100, 500))
-        st.write("At-Risk/Lapsed:", random.randint(10, 100))
-        st.caption("⚡ In production, use real AI clustering for segmentation.")
+        fans_df = None
+        if uploaded_fans.size > PREVIEW_THRESHOLD_BYTES:
+            st.dataframe(pd.read_csv(uploaded_fans, nrows=PREVIEW_ROWS), use_container_width=True)
+            st.caption(f"Large list ({uploaded_fans.size / 1024 ** 2:,.0f} MB): showing the first rows only.")
+        else:
+            fans_df, load_report = load_csv(uploaded_fans)
+            st.dataframe(fans_df.head(), use_container_width=True)
+            st.caption(memory_summary(load_report))
+        show_dedup_report(uploaded_fans, fans_df)
+        st.subheader("Fan Segments")
+        n_segments = st.slider("Number of segments", 2, 20, DEFAULT_SEGMENTS)
+        with st.spinner("Segmenting fans..."):
+            result = cached_segments(uploaded_fans, n_segments)
+        segments = result["segments"]
+        if segments.empty:
+            st.info("No fans found in this file.")
+        else:
+            table = segments[["label", "fans", "share", "top_city", "top_interests"]].assign(
+                share=(segments["share"] * 100).round(1).astype(str) + "%")
+            st.dataframe(table, use_container_width=True)
+            st.caption(f"{result['rows']:,} fans clustered by city and interests (streaming mini-batch k-means).")
+        show_audience_builder(uploaded_fans, fans_df)
         audit_log("Uploaded fan data", st.session_state.get("user_id", "anon"))
+    show_engagement(uploaded_fans)
 
     # --- Smart Messaging ---
     st.text_area("Write a message to your fans (AI can auto-personalize in production):", height=80)
@@ -0,0 +1,83 @@
+# file: ai_tdm_suite/modules/date_parsing.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Formats tried (in order) when detecting how an export writes its dates.
+CANDIDATE_FORMATS = (
+    "%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%m/%d/%y",
+)
+DETECT_SAMPLE = 200
+MAX_MEMO_ENTRIES = 500_000
+
+# string -> Timestamp, one map per detected format so ambiguous strings
+# ("01/02/2024") never leak between files that use different conventions.
+_MEMO = {}
+_MEMO_LOCK = threading.Lock()
+
+def detect_format(strings):
+    """Return the candidate format that parses most of a sample of unique strings, or None."""
+    sample = pd.Index(strings[:DETECT_SAMPLE])
+    best, best_hits = None, 0
+    for fmt in CANDIDATE_FORMATS:
+        hits = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+    return best
+
+def _parse_strings(strings, fmt):
+    """
+    Parse unique strings with `fmt`. Strings that do not match it become NaT,
+    as with the single-format parse this replaced, so invalid-row counts for a
+    file do not depend on which strings happen to be inferable.
+    """
+    if fmt is None:
+        return np.full(len(strings), np.datetime64("NaT"), dtype="datetime64[ns]")
+    try:
+        parsed = pd.to_datetime(strings, format=fmt, errors="coerce")
+    except ValueError:
+        # e.g. offsets that differ between rows ("Z" vs "+02:00")
+        parsed = pd.to_datetime(strings, format=fmt, errors="coerce", utc=True)
+    parsed = pd.DatetimeIndex(parsed)
+    if parsed.tz is not None:
+        parsed = parsed.tz_convert(None)
+    return parsed.as_unit("ns").to_numpy()
+
+def parse_dates(values):
+    """
+    Parse a column of date strings to datetime64, working on unique values only.
+
+    Rows are factorized, the distinct strings are parsed once (format detected
+    from a sample, memoized per format across calls and chunks), and results
+    are mapped back by code. Values not in the detected format, unparseable
+    and missing values become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    strings = pd.Index(uniques).astype(str)
+    fmt = detect_format(strings)
+    with _MEMO_LOCK:
+        memo = _MEMO.setdefault(fmt, {})
+        known = np.fromiter((s in memo for s in strings), dtype=bool, count=len(strings))
+        parsed = np.array([memo.get(s, np.datetime64("NaT", "ns")) for s in strings], dtype="datetime64[ns]")
+    if not known.all():
+        fresh = _parse_strings(strings[~known], fmt)
+        parsed[~known] = fresh
+        with _MEMO_LOCK:
+            if len(memo) + len(fresh) > MAX_MEMO_ENTRIES:
+                memo.clear()
+            memo.update(zip(strings[~known], fresh))
+    out = parsed.take(codes)
+    out[codes < 0] = np.datetime64("NaT")
+    return pd.Series(out, index=values.index, name=values.name)
+
+def clear_memo():
+    """Drop memoized parses (e.g. between benchmark runs)."""
+    with _MEMO_LOCK:
+        _MEMO.clear()
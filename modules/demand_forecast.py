@@ -0,0 +1,70 @@
+# file: ai_tdm_suite/modules/demand_forecast.py
+
+import numpy as np
+import pandas as pd
+
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+from modules.ticket_aggregates import rollup
+
+HORIZON_DAYS = 7
+# Day-of-week terms need at least two observations of each weekday to be meaningful.
+MIN_SEASONAL_DAYS = 14
+
+# Fitted parameters per (dataset digest, options); predictions are cheap to redo.
+FORECAST_CACHE = LRUCache(maxsize=64)
+
+def design_matrix(days, weekdays, seasonal):
+    """Intercept + linear trend (+ 6 weekday dummies, Monday baseline)."""
+    cols = [np.ones(len(days)), np.asarray(days, dtype="float64")]
+    if seasonal:
+        weekdays = np.asarray(weekdays)
+        cols.extend((weekdays == d).astype("float64") for d in range(1, 7))
+    return np.column_stack(cols)
+
+def series_matrix(cube, by_show=True, by_channel=False):
+    """
+    Daily ticket totals from the rollup cube as one wide (dates x series)
+    frame: the overall total plus one column per show and, optionally, per
+    channel. Missing show/day combinations count as zero sales.
+    """
+    total = rollup(cube, "date")
+    parts = [total.to_frame(("total", "All shows"))]
+    for enabled, level in ((by_show, "show"), (by_channel, "channel")):
+        if enabled and level in cube.columns:
+            wide = rollup(cube, ["date", level]).unstack(level, fill_value=0).reindex(total.index, fill_value=0)
+            wide.columns = pd.MultiIndex.from_product([[level], wide.columns.astype(str)])
+            parts.append(wide)
+    wide = pd.concat(parts, axis=1)
+    wide.columns = pd.MultiIndex.from_tuples(wide.columns, names=["level", "series"])
+    return wide.astype("float64")
+
+def fit(wide):
+    """Fit every column of `wide` in a single batched least-squares solve."""
+    dates = pd.DatetimeIndex(wide.index)
+    start = dates[0]
+    days = (dates - start).days.to_numpy()
+    seasonal = len(dates) >= MIN_SEASONAL_DAYS
+    X = design_matrix(days, dates.dayofweek, seasonal)
+    coef, *_ = np.linalg.lstsq(X, wide.to_numpy(), rcond=None)
+    return {"start": start, "last_date": dates[-1], "seasonal": seasonal, "columns": wide.columns, "coef": coef}
+
+def predict(params, horizon=HORIZON_DAYS):
+    """Forecast all fitted series for the next `horizon` days (clipped at zero)."""
+    future = pd.date_range(params["last_date"] + pd.Timedelta(days=1), periods=horizon, freq="D")
+    days = (future - params["start"]).days.to_numpy()
+    X = design_matrix(days, future.dayofweek, params["seasonal"])
+    return pd.DataFrame(np.clip(X @ params["coef"], 0, None), index=future, columns=params["columns"])
+
+@timed("forecast")
+def forecast_demand(cube, key, by_show=True, by_channel=False, horizon=HORIZON_DAYS):
+    """
+    Batched forecast for one (possibly filtered) cube. `key` identifies the
+    dataset and filter selection; fitted parameters are cached under it.
+    """
+    key = (key, by_show, by_channel)
+    params = FORECAST_CACHE.get(key)
+    if params is None:
+        params = fit(series_matrix(cube, by_show=by_show, by_channel=by_channel))
+        FORECAST_CACHE.put(key, params)
+    return predict(params, horizon)
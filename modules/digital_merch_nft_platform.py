@@ -2,43 +2,10 @@
 
 import streamlit as st
 import random
-from datetime import datetime
-
-# === Revenue Model Badges: For this module ===
-ALL_REVENUE_MODELS = [
-    {"grade": "A",   "category": "Marketplaces/Aggregator", "name": "Marketplace/Aggregator", "desc": "Connect buyers/sellers",        "rationale": "Network effects, high profitability."},
-    {"grade": "A",   "category": "Digital Products",        "name": "Online Courses/eBooks",   "desc": "Sell digital content",         "rationale": "90%+ margins, passive, top profitability."},
-    {"grade": "B-",  "category": "Ingredient Branding",     "name": "Co-Branding",             "desc": "Promote component",            "rationale": "Boost perception, partner-dependent."},
-    {"grade": "B+",  "category": "Transaction-Based",       "name": "Commission/Fees",         "desc": "Fee per sale",                 "rationale": "Scalable, 10-30% fees."},
-    {"grade": "A-",  "category": "Freemium",                "name": "Freemium",                "desc": "Free tier + paid upgrades",    "rationale": "Low acquisition cost, high conversion potential."},
-    {"grade": "B",   "category": "Advertising-Based",       "name": "Ads/Sponsorship",         "desc": "Earn from ads/views",          "rationale": "Scalable with traffic, 20-50% margin."},
-    {"grade": "B-",  "category": "Cash Machine",            "name": "Pre-Payment",             "desc": "Advance bookings",             "rationale": "Funds growth, refund risk."},
-]
-MODULE_REVENUE_MODELS = {
-    "Digital Merch & NFT Platform": [
-        "Marketplace/Aggregator", "Online Courses/eBooks", "Co-Branding",
-        "Commission/Fees", "Freemium", "Ads/Sponsorship", "Pre-Payment"
-    ]
-}
-
-def show_revenue_badges(module):
-    """Show badges for all enabled revenue models in this module."""
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-            f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-            f"{m['name']} ({m['grade']})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 # --- Helpers ---
-def audit_log(action, user="anon"):
-    """Simple audit log for MVP, swap for persistent log in prod."""
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
-
 def is_pro():
     return st.session_state.get("pro_user", False)
 
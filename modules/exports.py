@@ -0,0 +1,79 @@
+# file: ai_tdm_suite/modules/exports.py
+
+import gzip
+import hashlib
+import importlib.util
+import io
+from datetime import datetime
+
+CHUNK_ROWS = 50_000
+EXPORT_FORMATS = ("CSV", "CSV (gzip)", "Parquet")
+_EXTENSIONS = {"CSV": ".csv", "CSV (gzip)": ".csv.gz", "Parquet": ".parquet"}
+_MIMETYPES = {"CSV": "text/csv", "CSV (gzip)": "application/gzip", "Parquet": "application/vnd.apache.parquet"}
+
+def watermark_token(user_id="anon"):
+    """Short unique watermark for one export."""
+    return hashlib.sha256(f"{user_id}_{datetime.now()}".encode()).hexdigest()[:16]
+
+def available_formats():
+    """Export formats usable in this environment (Parquet needs pyarrow)."""
+    if importlib.util.find_spec("pyarrow") is None:
+        return [f for f in EXPORT_FORMATS if f != "Parquet"]
+    return list(EXPORT_FORMATS)
+
+def export_file_name(base, fmt):
+    return base + _EXTENSIONS[fmt]
+
+def _chunks(df, token, chunk_rows):
+    """Row slices of `df` with the watermark column added per slice (never a full copy)."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield part.assign(_watermark=token) if token else part
+
+def write_csv(df, out, token=None, chunk_rows=CHUNK_ROWS):
+    """Stream `df` as CSV bytes into a binary file object, one chunk at a time."""
+    for i, part in enumerate(_chunks(df, token, chunk_rows)):
+        out.write(part.to_csv(index=False, header=(i == 0)).encode())
+
+def write_parquet(df, out, token=None, chunk_rows=CHUNK_ROWS):
+    """Stream `df` into a Parquet file object as one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for part in _chunks(df, token, chunk_rows):
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema, compression="snappy")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def export_bytes(df, fmt="CSV", user_id="anon", watermark=True):
+    """Encode a (watermarked) export; only the encoded output is held in memory."""
+    token = watermark_token(user_id) if watermark else None
+    buf = io.BytesIO()
+    if fmt == "Parquet":
+        write_parquet(df, buf, token)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as gz:
+            write_csv(df, gz, token)
+    else:
+        write_csv(df, buf, token)
+    return buf.getvalue()
+
+def export_download(label, df, base_name, user_id="anon", key=None):
+    """
+    Format picker + download button. The export is encoded lazily when the
+    button is clicked, not on every rerun.
+    """
+    import streamlit as st
+    fmt = st.radio("Export format", available_formats(), horizontal=True, key=f"{key or base_name}_fmt")
+    st.download_button(
+        label,
+        data=lambda: export_bytes(df, fmt, user_id),
+        file_name=export_file_name(base_name, fmt),
+        mime=_MIMETYPES[fmt],
+        key=key,
+    )
@@ -0,0 +1,197 @@
+# file: ai_tdm_suite/modules/fan_audience.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from modules.fan_segments import CHUNK_ROWS, iter_fan_chunks
+from modules.ingest_cache import file_digest
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+from modules.storage import load_pickle, save_pickle, state_dir
+
+# Per-term bitmaps kept per index (each is rows / 8 bytes).
+BITMAP_CACHE_SIZE = 256
+# Audience indexes keyed by upload digest; also kept on disk.
+AUDIENCE_CACHE = LRUCache(maxsize=8)
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+
+class _Dictionary:
+    """Case-insensitive term -> code, remembering the first spelling seen for display."""
+
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+
+    def code(self, term):
+        key = term.lower()
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.names)
+            self.names.append(term)
+        return code
+
+class AudienceIndex:
+    """
+    Fan list encoded once for targeting: a CSR multi-hot interest matrix
+    (fans x interests) and one dictionary-coded city per fan. Queries combine
+    packed per-term bitmaps (rows / 8 bytes each) with bitwise AND/OR/NOT, so
+    they cost a few passes over a few hundred KB per million fans.
+    """
+
+    def __init__(self, interest_matrix, interest_names, city_codes, city_names):
+        self.interest_matrix = interest_matrix
+        self.interest_names = interest_names
+        self.city_codes = city_codes
+        self.city_names = city_names
+        self.interest_codes = {n.lower(): i for i, n in enumerate(interest_names)}
+        self.city_lookup = {n.lower(): i for i, n in enumerate(city_names)}
+        self.rows = interest_matrix.shape[0]
+        self._reset()
+
+    def _reset(self):
+        self._columns = None
+        self._bitmaps = LRUCache(maxsize=BITMAP_CACHE_SIZE)
+        self._all = np.packbits(np.ones(self.rows, dtype=bool))
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in ("_columns", "_bitmaps", "_all")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    # --- per-term bitmaps ---
+
+    def _empty(self):
+        return np.zeros_like(self._all)
+
+    def interest_bitmap(self, name):
+        """Packed bitmap of fans with an interest (case-insensitive; unknown -> empty)."""
+        code = self.interest_codes.get(str(name).strip().lower())
+        if code is None:
+            return self._empty()
+        key = ("interest", code)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            if self._columns is None:
+                self._columns = self.interest_matrix.tocsc()
+            cols = self._columns
+            mask = np.zeros(self.rows, dtype=bool)
+            mask[cols.indices[cols.indptr[code]:cols.indptr[code + 1]]] = True
+            bitmap = np.packbits(mask)
+            self._bitmaps.put(key, bitmap)
+        return bitmap
+
+    def city_bitmap(self, name):
+        """Packed bitmap of fans in a city (case-insensitive; unknown -> empty)."""
+        code = self.city_lookup.get(str(name).strip().lower())
+        if code is None:
+            return self._empty()
+        key = ("city", code)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = np.packbits(self.city_codes == code)
+            self._bitmaps.put(key, bitmap)
+        return bitmap
+
+    # --- queries ---
+
+    def query(self, all_interests=(), any_interests=(), exclude_interests=(), cities=(), exclude_cities=()):
+        """
+        Packed bitmap of fans having every interest in `all_interests`, at
+        least one of `any_interests`, none of `exclude_interests`, living in
+        one of `cities` and in none of `exclude_cities`. Empty arguments
+        don't filter.
+        """
+        bitmap = self._all.copy()
+        for name in all_interests:
+            bitmap &= self.interest_bitmap(name)
+        for names, lookup in ((any_interests, self.interest_bitmap), (cities, self.city_bitmap)):
+            if names:
+                either = self._empty()
+                for name in names:
+                    either |= lookup(name)
+                bitmap &= either
+        for name in exclude_interests:
+            bitmap &= ~self.interest_bitmap(name)
+        for name in exclude_cities:
+            bitmap &= ~self.city_bitmap(name)
+        return bitmap
+
+    def count(self, bitmap):
+        return int(_POPCOUNT[bitmap].sum())
+
+    def row_ids(self, bitmap, limit=None):
+        """Matching row numbers (file order), optionally only the first `limit`."""
+        rows = np.flatnonzero(np.unpackbits(bitmap, count=self.rows))
+        return rows if limit is None else rows[:limit]
+
+    # --- summaries ---
+
+    def interest_counts(self):
+        """Fans per interest, most common first."""
+        counts = np.bincount(self.interest_matrix.indices, minlength=len(self.interest_names))
+        return pd.Series(counts, index=self.interest_names, name="fans").sort_values(ascending=False)
+
+    def city_counts(self):
+        """Fans per city, most common first."""
+        counts = np.bincount(self.city_codes[self.city_codes >= 0], minlength=len(self.city_names))
+        return pd.Series(counts, index=self.city_names, name="fans").sort_values(ascending=False)
+
+    def interests_of(self, row):
+        m = self.interest_matrix
+        return [self.interest_names[j] for j in m.indices[m.indptr[row]:m.indptr[row + 1]]]
+
+def _interest_codes(text, interests):
+    """Sorted distinct interest codes of one 'A;B;C' string."""
+    return sorted({interests.code(t.strip()) for t in text.split(";") if t.strip()})
+
+@timed("audience index")
+def build_audience_index(source, chunk_rows=CHUNK_ROWS):
+    """
+    Encode a fan CSV (path or file-like) in one streaming pass. Each chunk's
+    distinct interest strings are split once and expanded to rows with
+    vectorized gathers; cities become int32 codes (-1 when blank).
+    """
+    interests, cities = _Dictionary(), _Dictionary()
+    row_lens, row_indices, city_parts = [], [], []
+    for city, text in iter_fan_chunks(source, chunk_rows):
+        city_idx, city_uniques = pd.factorize(city)
+        city_map = np.array([cities.code(c) if c else -1 for c in city_uniques], dtype=np.int32)
+        city_parts.append(city_map[city_idx])
+        text_idx, text_uniques = pd.factorize(text)
+        combos = [_interest_codes(t, interests) for t in text_uniques]
+        combo_lens = np.array([len(c) for c in combos], dtype=np.int64)
+        combo_flat = np.fromiter((j for c in combos for j in c), dtype=np.int32, count=int(combo_lens.sum()))
+        combo_starts = np.concatenate([[0], np.cumsum(combo_lens)[:-1]]) if len(combos) else np.zeros(0, np.int64)
+        # expand: row r takes combo_flat[start(r) : start(r) + len(r)]
+        lens = combo_lens[text_idx]
+        offsets = np.concatenate([[0], np.cumsum(lens)[:-1]])
+        gather = np.arange(int(lens.sum())) - np.repeat(offsets - combo_starts[text_idx], lens)
+        row_lens.append(lens)
+        row_indices.append(combo_flat[gather])
+    lens = np.concatenate(row_lens) if row_lens else np.zeros(0, dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum(lens)]).astype(np.int64)
+    indices = np.concatenate(row_indices) if row_indices else np.zeros(0, dtype=np.int32)
+    matrix = sp.csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr),
+                           shape=(len(lens), len(interests.names)))
+    city_codes = np.concatenate(city_parts) if city_parts else np.zeros(0, dtype=np.int32)
+    return AudienceIndex(matrix, interests.names, city_codes, cities.names)
+
+def cached_audience_index(uploaded_file):
+    """build_audience_index() once per upload content; reruns and re-uploads reuse it."""
+    digest = file_digest(uploaded_file)
+    index = AUDIENCE_CACHE.get(digest)
+    if index is not None:
+        return index
+    path = os.path.join(state_dir("fan_audience"), f"{digest}.pkl")
+    index = load_pickle(path)
+    if index is None:
+        index = build_audience_index(uploaded_file)
+        save_pickle(path, index)
+    AUDIENCE_CACHE.put(digest, index)
+    return index
@@ -0,0 +1,233 @@
+# file: ai_tdm_suite/modules/fan_dedup.py
+
+import os
+import time
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from modules.fan_segments import CHUNK_ROWS
+from modules.ingest_cache import file_digest
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+from modules.storage import load_pickle, save_pickle, state_dir
+
+IDENTITY_COLUMNS = ("name", "email", "city")
+# Fuzzy match: both the names and the email local parts must be this similar.
+NAME_THRESHOLD = 0.85
+EMAIL_THRESHOLD = 0.9
+# Blocks up to this size are compared all-pairs; larger ones only against the
+# next WINDOW records in email order (sorted neighbourhood), so work stays linear.
+MAX_PAIRWISE_BLOCK = 50
+WINDOW = 5
+GMAIL_DOMAINS = ("gmail.com", "googlemail.com")
+MERGED_PREVIEW = 1000
+
+# Dedup results keyed by upload digest; also kept on disk.
+DEDUP_CACHE = LRUCache(maxsize=8)
+
+def _clean(s):
+    return s.fillna("").astype(str).str.strip()
+
+def normalize_name(name):
+    """'  José  O'Brien ' -> 'jose o brien': accents stripped, lowercased, letters only."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return " ".join("".join(c if c.isalpha() else " " for c in text).split())
+
+def normalize_emails(emails):
+    """
+    (normalized email, alphanumeric local part, local-part digits) Series.
+    Lowercased, '+tag' dropped, Gmail dots ignored; invalid emails become ''.
+    """
+    e = _clean(emails).str.lower()
+    # regex replaces run vectorized on Arrow strings; rpartition would be a Python loop
+    has_at = e.str.contains("@", regex=False)
+    local = e.str.replace(r"@[^@]*$", "", regex=True).str.replace(r"\+.*$", "", regex=True).where(has_at, "")
+    domain = e.str.replace(r"^.*@", "", regex=True).where(has_at, "")
+    gmail = domain.isin(GMAIL_DOMAINS)
+    if gmail.any():
+        local = local.where(~gmail, local.str.replace(".", "", regex=False))
+        domain = domain.where(~gmail, "gmail.com")
+    valid = (local != "") & (domain != "")
+    norm = (local + "@" + domain).where(valid, "")
+    local_key = local.str.replace(r"[^0-9a-z]", "", regex=True).where(valid, "")
+    digits = local.str.replace(r"\D", "", regex=True).where(valid, "")
+    return norm, local_key, digits
+
+def _name_parts(names):
+    """(normalized name, blocking key 'first initial|last word') Series, computed per distinct name."""
+    codes, uniques = pd.factorize(_clean(names))
+    norm = np.array([normalize_name(n) for n in uniques], dtype=object)
+    key = np.array([f"{n[0]}|{n.rsplit(' ', 1)[-1]}" if n else "" for n in norm], dtype=object)
+    return pd.Series(norm[codes]), pd.Series(key[codes])
+
+def _hash(frame):
+    """uint64 row hash; rows whose first column is empty hash to 0 (excluded from matching)."""
+    h = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return np.where(frame.iloc[:, 0].to_numpy() == "", np.uint64(0), h)
+
+def _read(source, chunk_rows):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    reader = pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False,
+                         usecols=lambda c: c in IDENTITY_COLUMNS)
+    for chunk in reader:
+        for col in IDENTITY_COLUMNS:
+            if col not in chunk:
+                chunk[col] = ""
+        yield chunk.reset_index(drop=True)
+
+def _group_edges(keys):
+    """Edges joining every row with a non-zero key to the first row sharing it."""
+    rows = np.flatnonzero(keys)
+    if not len(rows):
+        return rows, rows
+    _, first, inverse = np.unique(keys[rows], return_index=True, return_inverse=True)
+    heads = rows[first][inverse]
+    linked = heads != rows
+    return rows[linked], heads[linked]
+
+def _similar(a, b, threshold):
+    return a == b or SequenceMatcher(None, a, b).ratio() >= threshold
+
+def _block_pairs(size):
+    """Candidate (i, j) positions within a block of `size` records sorted by email."""
+    if size <= MAX_PAIRWISE_BLOCK:
+        return [(i, j) for i in range(size) for j in range(i + 1, size)]
+    return [(i, j) for i in range(size) for j in range(i + 1, min(i + 1 + WINDOW, size))]
+
+def _merged_table(members, sizes):
+    """One row per multi-row identity (largest first): first row's fields plus every distinct name/email."""
+    ids = members["identity"].to_numpy(dtype=np.int64)
+    if not len(ids):
+        return pd.DataFrame(columns=["identity", "fans", "name", "email", "city", "names", "emails"])
+    bounds = np.flatnonzero(np.diff(ids)) + 1
+    starts = np.concatenate([[0], bounds])
+    top = starts[np.argsort(-sizes[ids[starts]], kind="stable")][:MERGED_PREVIEW]
+    names, emails = members["name"].to_numpy(dtype=object), members["email"].to_numpy(dtype=object)
+    cities = members["city"].to_numpy(dtype=object)
+    out = []
+    for start in top.tolist():
+        end = start + int(sizes[ids[start]])
+        out.append({"identity": int(ids[start]), "fans": end - start, "name": names[start], "email": emails[start],
+                    "city": cities[start], "names": ", ".join(dict.fromkeys(names[start:end])),
+                    "emails": ", ".join(dict.fromkeys(emails[start:end]))})
+    return pd.DataFrame(out)
+
+@timed("fan dedup")
+def dedupe_fans(source, chunk_rows=CHUNK_ROWS):
+    """
+    Resolve a fan CSV (path or file-like with name,email,city) to identities.
+
+    Pass 1 hashes each row's normalized email and its block key (city, first
+    initial + last name, digits in the email). Rows sharing a normalized email
+    are the same fan. Pass 2 reads back only rows in blocks of two or more and
+    fuzzy-compares names and email local parts inside each block. Edges from
+    both rules are merged with connected components.
+
+    Returns {"identity": first row of each row's identity, "keep": first-row
+    mask, "merged": frame of multi-row identities, "report": counts}.
+    """
+    started = time.perf_counter()
+    email_hash, block_hash = [], []
+    for chunk in _read(source, chunk_rows):
+        email, _, digits = normalize_emails(chunk["email"])
+        _, key = _name_parts(chunk["name"])
+        email_hash.append(_hash(email.to_frame()))
+        block_hash.append(_hash(pd.DataFrame({"key": key, "city": _clean(chunk["city"]).str.lower(), "digits": digits})))
+    email_hash = np.concatenate(email_hash) if email_hash else np.zeros(0, dtype=np.uint64)
+    block_hash = np.concatenate(block_hash) if block_hash else np.zeros(0, dtype=np.uint64)
+    n = len(email_hash)
+    email_a, email_b = _group_edges(email_hash)
+
+    # candidate rows: blocks holding two or more rows
+    _, block_idx, block_sizes = np.unique(block_hash, return_inverse=True, return_counts=True)
+    candidates = (block_hash != 0) & (block_sizes[block_idx] > 1)
+    email_group = np.arange(n)
+    email_group[email_a] = email_b
+    gathered = np.zeros(n, dtype=bool)
+    gathered[candidates] = True
+    gathered[email_a] = gathered[email_b] = True
+
+    # pass 2: strings for candidate and email-merged rows only
+    parts, offset = [], 0
+    for chunk in _read(source, chunk_rows):
+        rows = np.flatnonzero(gathered[offset:offset + len(chunk)])
+        if len(rows):
+            part = chunk.iloc[rows].reset_index(drop=True)
+            part["row"] = rows + offset
+            parts.append(part)
+        offset += len(chunk)
+    cols = ["row", *IDENTITY_COLUMNS]
+    found = pd.concat(parts, ignore_index=True)[cols] if parts else pd.DataFrame(columns=cols)
+    found["name_norm"], _ = _name_parts(found["name"])
+    _, found["local"], _ = normalize_emails(found["email"])
+
+    in_pool = candidates[found["row"].to_numpy(dtype=np.int64)]
+    rows = found["row"].to_numpy(dtype=np.int64)[in_pool]
+    names = found["name_norm"].to_numpy(dtype=object)[in_pool]
+    locals_ = found["local"].to_numpy(dtype=object)[in_pool]
+    blocks = block_hash[rows]
+    order = np.lexsort((locals_, blocks))
+    rows, names, locals_, blocks = rows[order], names[order], locals_[order], blocks[order]
+    bounds = np.flatnonzero(np.diff(blocks)) + 1
+    starts, ends = np.concatenate([[0], bounds]), np.concatenate([bounds, [len(rows)]])
+    fuzzy_a, fuzzy_b, compared = [], [], 0
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        for i, j in _block_pairs(end - start):
+            i, j = start + i, start + j
+            if email_group[rows[i]] == email_group[rows[j]]:
+                continue
+            compared += 1
+            if _similar(locals_[i], locals_[j], EMAIL_THRESHOLD) and _similar(names[i], names[j], NAME_THRESHOLD):
+                fuzzy_a.append(rows[i])
+                fuzzy_b.append(rows[j])
+
+    a = np.concatenate([email_a, np.array(fuzzy_a, dtype=np.int64)])
+    b = np.concatenate([email_b, np.array(fuzzy_b, dtype=np.int64)])
+    graph = sp.coo_matrix((np.ones(len(a), dtype=np.int8), (a, b)), shape=(n, n))
+    _, component = connected_components(graph, directed=False)
+    # identity id = first row of the component
+    first_row = np.full(component.max() + 1 if n else 0, n, dtype=np.int64)
+    np.minimum.at(first_row, component, np.arange(n))
+    identity = first_row[component]
+    keep = identity == np.arange(n)
+
+    sizes = np.bincount(identity, minlength=n)
+    found_rows = found["row"].to_numpy(dtype=np.int64)
+    members = found[sizes[identity[found_rows]] > 1].copy()
+    members["identity"] = identity[members["row"].to_numpy(dtype=np.int64)]
+    merged = _merged_table(members.sort_values(["identity", "row"]), sizes)
+
+    identities = int(keep.sum())
+    report = {
+        "rows": n,
+        "identities": identities,
+        "duplicates": n - identities,
+        "merged_identities": int((sizes > 1).sum()),
+        "email_matches": len(email_a),
+        "fuzzy_matches": len(fuzzy_a),
+        "blocks_compared": len(starts) if len(rows) else 0,
+        "largest_block": int((ends - starts).max()) if len(rows) else 0,
+        "pairs_compared": compared,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    return {"identity": identity.astype(np.int32), "keep": keep, "merged": merged, "report": report}
+
+def cached_dedup(uploaded_file):
+    """dedupe_fans() once per upload content; reruns and re-uploads reuse it."""
+    digest = file_digest(uploaded_file)
+    result = DEDUP_CACHE.get(digest)
+    if result is not None:
+        return result
+    path = os.path.join(state_dir("fan_dedup"), f"{digest}.pkl")
+    result = load_pickle(path)
+    if result is None:
+        result = dedupe_fans(uploaded_file)
+        save_pickle(path, result)
+    DEDUP_CACHE.put(digest, result)
+    return result
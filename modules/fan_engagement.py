@@ -0,0 +1,289 @@
+# file: ai_tdm_suite/modules/fan_engagement.py
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.date_parsing import parse_dates
+from modules.fan_dedup import normalize_emails
+from modules.fan_segments import CHUNK_ROWS
+from modules.ingest_cache import file_digest
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+from modules.storage import load_pickle, save_pickle, state_path
+
+SEGMENTS = ("Superfans", "Active Fans", "At-Risk/Lapsed")
+NO_ACTIVITY = "No activity yet"
+SCORE_BINS = 5
+# Superfans: recent (R >= 4) and strong overall (R + F + M >= 12); At-Risk: R <= 2.
+SUPERFAN_MIN_RECENCY = 4
+SUPERFAN_MIN_TOTAL = 12
+AT_RISK_MAX_RECENCY = 2
+TOP_FANS = 50
+# Event value: the first of these columns present, else price x quantity.
+AMOUNT_COLUMNS = ("amount", "total", "tip")
+QUANTITY_COLUMNS = ("tickets_sold", "quantity", "qty")
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+_STATE_LOCK = threading.Lock()
+_LOADED = LRUCache(maxsize=16)  # path -> (mtime_ns, state)
+# Upload breakdowns keyed by (state file, fan list digest, state version).
+UPLOAD_CACHE = LRUCache(maxsize=16)
+
+# Each creator's activity lives in a workspace opened with a secret key, so it
+# survives the session and is never pooled across creators. Files are named by
+# a digest of the key; the key itself is not stored.
+def new_workspace_key():
+    """A fresh workspace key, to be shown to the creator once."""
+    return secrets.token_urlsafe(16)
+
+def state_file(workspace):
+    """Engagement state file of the workspace opened with key `workspace`."""
+    if not workspace:
+        raise ValueError("A workspace key is required.")
+    digest = hashlib.sha256(str(workspace).encode()).hexdigest()[:32]
+    return state_path(f"fan_engagement_{digest}.pkl")
+
+def workspace_exists(workspace):
+    """True once activity has been added to the workspace."""
+    return os.path.exists(state_file(workspace))
+
+def email_keys(emails):
+    """uint64 key per normalized email (same normalization as dedup); 0 for a missing email."""
+    # activity files repeat each fan's email, so normalize and hash the distinct ones
+    codes, uniques = pd.factorize(emails)
+    norm, _, _ = normalize_emails(pd.Series(uniques, dtype=object))
+    keys = pd.util.hash_array(norm.to_numpy(dtype=object))
+    keys[(norm == "").to_numpy()] = 0
+    return np.append(keys, np.uint64(0))[codes]
+
+def _event_values(chunk):
+    for col in AMOUNT_COLUMNS:
+        if col in chunk:
+            return pd.to_numeric(chunk[col], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    price = pd.to_numeric(chunk["price"], errors="coerce").fillna(0.0) if "price" in chunk else pd.Series(0.0, chunk.index)
+    qty = next((pd.to_numeric(chunk[c], errors="coerce").fillna(0) for c in QUANTITY_COLUMNS if c in chunk), 1)
+    return (price * qty).to_numpy(np.float64)
+
+@timed("engagement aggregate")
+def aggregate_events(source, chunk_rows=CHUNK_ROWS):
+    """
+    Fold an event CSV (ticket sales with an email column, merch orders, tips:
+    email, date and amount or price x quantity) into one row per fan: last
+    event day, event count and total spend. Memory is bounded by distinct
+    fans, not events. Returns (frame indexed by sorted key, events used).
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+    parts, events = [], 0
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+        missing = {"email", "date"} - set(chunk.columns)
+        if missing:
+            raise ValueError(f"Activity file is missing column(s): {', '.join(sorted(missing))}")
+        dates = parse_dates(chunk["date"])
+        keys = email_keys(chunk["email"])
+        ok = dates.notna().to_numpy() & (keys != 0)
+        frame = pd.DataFrame({
+            "key": keys[ok],
+            "day": (dates.to_numpy()[ok].astype("datetime64[D]") - _EPOCH).astype(np.int64),
+            "amount": _event_values(chunk)[ok],
+        })
+        events += len(frame)
+        parts.append(frame.groupby("key").agg(last_day=("day", "max"), frequency=("day", "size"),
+                                              monetary=("amount", "sum")))
+    agg = pd.concat(parts) if parts else pd.DataFrame(columns=["last_day", "frequency", "monetary"])
+    if len(parts) > 1:
+        agg = agg.groupby(level=0).agg(last_day=("last_day", "max"), frequency=("frequency", "sum"),
+                                       monetary=("monetary", "sum"))
+    return agg.sort_index(), events
+
+def empty_state():
+    return {
+        "keys": np.zeros(0, dtype=np.uint64), "last_day": np.zeros(0, dtype=np.int64),
+        "frequency": np.zeros(0, dtype=np.int64), "monetary": np.zeros(0, dtype=np.float64),
+        "recency_score": np.zeros(0, dtype=np.int8), "frequency_score": np.zeros(0, dtype=np.int8),
+        "monetary_score": np.zeros(0, dtype=np.int8), "segment": np.zeros(0, dtype=np.int8),
+        "as_of": None, "cuts": None, "batches": {}, "events": 0, "version": 0, "summary": {},
+    }
+
+_SCORES = (("last_day", "recency_score"), ("frequency", "frequency_score"), ("monetary", "monetary_score"))
+
+def merge_events(state, agg):
+    """
+    Fold per-fan aggregates into the state in place. Existing fans are
+    updated with vectorized max/add at their sorted position; new fans are
+    inserted at theirs (with zero scores until rescored), so the cost
+    depends on fans, not on event history. Returns the sorted positions of
+    every updated or inserted fan.
+    """
+    new_keys = agg.index.to_numpy(dtype=np.uint64)
+    keys = state["keys"]
+    pos = np.searchsorted(keys, new_keys)
+    seen = pos < len(keys)
+    seen[seen] = keys[pos[seen]] == new_keys[seen]
+    last, freq, money = (agg[c].to_numpy() for c in ("last_day", "frequency", "monetary"))
+    at = pos[seen]
+    state["last_day"][at] = np.maximum(state["last_day"][at], last[seen])
+    state["frequency"][at] += freq[seen].astype(np.int64)
+    state["monetary"][at] += money[seen]
+    fresh = ~seen
+    fresh_at = pos[fresh]
+    zeros = np.zeros(len(fresh_at), dtype=np.int8)
+    for name, values in (("keys", new_keys[fresh]), ("last_day", last[fresh]), ("frequency", freq[fresh]),
+                         ("monetary", money[fresh]), ("recency_score", zeros), ("frequency_score", zeros),
+                         ("monetary_score", zeros), ("segment", zeros)):
+        state[name] = np.insert(state[name], fresh_at, values.astype(state[name].dtype))
+    # an existing fan moves right by the number of fans inserted at or before it
+    moved = at + np.searchsorted(fresh_at, at, side="right")
+    return np.sort(np.concatenate([moved, fresh_at + np.arange(len(fresh_at))]))
+
+def _cuts(values):
+    """Quintile cut points of a measure."""
+    if not len(values):
+        return np.zeros(0, dtype=np.float64)
+    return np.quantile(values, np.linspace(0, 1, SCORE_BINS + 1)[1:-1])
+
+def _scores(cuts, values):
+    """1..SCORE_BINS by quantile (higher value, higher score)."""
+    return (1 + np.searchsorted(cuts, values, side="right")).astype(np.int8)
+
+def score_state(state, touched=None):
+    """
+    Recompute R/F/M quintile scores and segments; returns how many fans were rescored.
+
+    Quintiles are relative to every fan, so each measure's cut points are
+    recomputed (one O(fans) selection). When a measure's cuts did not move,
+    only the `touched` fans (positions from merge_events) are rescored for
+    it. When they moved, fans without new activity can cross a cut, so that
+    measure is rescored for every fan in one vectorized pass; that pass
+    costs the same order as merging the batch and never re-reads events.
+    """
+    previous = state.get("cuts") or {}
+    cuts, full = {}, touched is None
+    for measure, score in _SCORES:
+        values = state[measure]
+        cuts[measure] = _cuts(values)
+        if not full and measure in previous and np.array_equal(previous[measure], cuts[measure]):
+            state[score][touched] = _scores(cuts[measure], values[touched])
+        else:
+            state[score] = _scores(cuts[measure], values)
+            full = True
+    rows = slice(None) if full else touched
+    r, f, m = (state[score][rows] for _, score in _SCORES)   # more recent -> higher R
+    total = r.astype(np.int16) + f + m
+    segment = np.full(len(r), 1, dtype=np.int8)
+    segment[(r >= SUPERFAN_MIN_RECENCY) & (total >= SUPERFAN_MIN_TOTAL)] = 0
+    segment[r <= AT_RISK_MAX_RECENCY] = 2
+    if full:
+        state["segment"] = segment
+    else:
+        state["segment"][touched] = segment
+    last_day = state["last_day"]
+    as_of = int(last_day.max()) if len(last_day) else None
+    state.update(cuts=cuts, as_of=as_of)
+    counts = np.bincount(state["segment"], minlength=len(SEGMENTS))
+    state["summary"] = {
+        "fans": len(last_day), "events": state["events"], "batches": len(state["batches"]),
+        "as_of": str(_EPOCH + as_of) if as_of is not None else None,
+        **{name: int(n) for name, n in zip(SEGMENTS, counts)},
+    }
+    return len(last_day) if full else len(touched)
+
+def load_state(workspace, path=None):
+    """A workspace's persisted scores, reloaded only when the file changed (reruns reuse the loaded arrays)."""
+    path = path or state_file(workspace)
+    if not os.path.exists(path):
+        return empty_state()
+    mtime = os.stat(path).st_mtime_ns
+    cached = _LOADED.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_pickle(path) or empty_state())
+        _LOADED.put(path, cached)
+    return cached[1]
+
+@timed("engagement ingest")
+def ingest_events(source, workspace, kind="events", name=None, path=None):
+    """
+    Add an activity file to a workspace's persisted engagement state and rescore.
+    Each file (by content digest) is counted once per workspace; returns a report dict.
+    """
+    path = path or state_file(workspace)
+    if hasattr(source, "read"):
+        digest = file_digest(source)
+    else:
+        with open(source, "rb") as f:
+            digest = file_digest(f)
+    started = time.perf_counter()
+    with _STATE_LOCK:
+        state = load_state(workspace, path)
+        if digest in state["batches"]:
+            return {"skipped": True, **state["batches"][digest]}
+        agg, events = aggregate_events(source)
+        state = {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in state.items()}
+        state["batches"] = dict(state["batches"])
+        touched = merge_events(state, agg)
+        state["events"] += events
+        batch = {"kind": kind, "name": name, "events": events, "fans": len(agg), "ingested_at": time.time()}
+        state["batches"][digest] = batch
+        state["version"] += 1
+        batch["rescored"] = score_state(state, touched)
+        save_pickle(path, state)
+        _LOADED.put(path, (os.stat(path).st_mtime_ns, state))
+    return {"skipped": False, "seconds": round(time.perf_counter() - started, 2), **batch}
+
+def lookup_scores(state, keys):
+    """Position of each uint64 email key in the state arrays, or -1 for fans without activity."""
+    pos = np.searchsorted(state["keys"], keys)
+    hit = pos < len(state["keys"])
+    hit[hit] = state["keys"][pos[hit]] == keys[hit]
+    return np.where(hit, pos, -1)
+
+@timed("engagement lookup")
+def upload_engagement(uploaded_file, workspace, state=None, chunk_rows=CHUNK_ROWS):
+    """
+    Segment counts for the distinct fans (by normalized email) in an uploaded
+    list plus its top fans by R+F+M against the workspace's scores, in one
+    chunked pass; cached per (workspace, upload digest, state version).
+    """
+    path = state_file(workspace)
+    state = state or load_state(workspace, path)
+    key = (path, file_digest(uploaded_file), state["version"])
+    result = UPLOAD_CACHE.get(key)
+    if result is not None:
+        return result
+    uploaded_file.seek(0)
+    seen, top = [], []
+    for chunk in pd.read_csv(uploaded_file, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+        if "email" not in chunk:
+            return {"counts": {}, "top": pd.DataFrame()}
+        keys = email_keys(chunk["email"])
+        seen.append(keys[keys != 0])
+        pos = lookup_scores(state, keys)
+        hit = pos >= 0
+        if hit.any():
+            p = pos[hit]
+            scored = chunk[hit].assign(
+                segment=np.array(SEGMENTS, dtype=object)[state["segment"][p]],
+                rfm=(state["recency_score"][p].astype(np.int16) + state["frequency_score"][p]
+                     + state["monetary_score"][p]),
+                R=state["recency_score"][p], F=state["frequency_score"][p], M=state["monetary_score"][p],
+                last_active=(_EPOCH + state["last_day"][p]).astype("datetime64[D]"),
+                events=state["frequency"][p], spend=state["monetary"][p].round(2), _key=keys[hit],
+            ).drop_duplicates("_key")
+            top.append(scored.nlargest(TOP_FANS, ["rfm", "spend"]))
+    fans = np.unique(np.concatenate(seen)) if seen else np.zeros(0, dtype=np.uint64)
+    pos = lookup_scores(state, fans)
+    counts = np.bincount(state["segment"][pos[pos >= 0]], minlength=len(SEGMENTS)).tolist()
+    counts.append(int((pos < 0).sum()))
+    if top:
+        top = pd.concat(top).drop_duplicates("_key").nlargest(TOP_FANS, ["rfm", "spend"]).drop(columns="_key")
+    else:
+        top = pd.DataFrame()
+    result = {"counts": dict(zip(SEGMENTS + (NO_ACTIVITY,), counts)), "top": top}
+    UPLOAD_CACHE.put(key, result)
+    return result
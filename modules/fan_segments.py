@@ -0,0 +1,176 @@
+# file: ai_tdm_suite/modules/fan_segments.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import normalize
+
+from modules.ingest_cache import file_digest
+from modules.instrumentation import timed
+from modules.lru import LRUCache
+from modules.storage import load_pickle, save_pickle, state_dir
+
+N_FEATURES = 2 ** 16
+DEFAULT_SEGMENTS = 8
+CHUNK_ROWS = 500_000
+TOP_INTERESTS = 3
+FEATURE_COLUMNS = ("city", "interests")
+
+# Segmentations keyed by (upload digest, segments); also kept on disk.
+SEGMENT_CACHE = LRUCache(maxsize=16)
+
+_HASHER = FeatureHasher(n_features=N_FEATURES, input_type="dict", alternate_sign=False, dtype=np.float32)
+
+def _clean(s):
+    return s.fillna("").astype(str).str.strip()
+
+def split_interests(text):
+    """'Musicals; Backstage' -> ('backstage', 'musicals'): lowercased, deduplicated, order-free."""
+    return tuple(sorted({t.strip().lower() for t in text.split(";") if t.strip()}))
+
+def featurize(cities, interests):
+    """
+    Sparse rows for (city, interests string) pairs: one hashed city feature
+    plus the fan's interests sharing an equal total weight, L2-normalized so
+    city and taste count the same in the distance.
+    """
+    rows = []
+    for city, text in zip(cities, interests):
+        tokens = split_interests(text)
+        row = {f"city={city.lower()}": 1.0} if city else {}
+        for t in tokens:
+            row[f"interest={t}"] = 1.0 / np.sqrt(len(tokens))
+        rows.append(row)
+    return normalize(_HASHER.transform(rows))
+
+class _Profiles:
+    """
+    Distinct (city, interests) combinations seen so far. Fan lists repeat a
+    small number of combinations millions of times, so each chunk is reduced
+    to its distinct combinations (with counts) before featurizing and fitting.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.cities = []
+        self.interests = []
+        self.blocks = []
+
+    def encode(self, city, interests):
+        """Per-row combination ids and (chunk's distinct ids, their row counts)."""
+        city_codes, city_uniques = pd.factorize(city)
+        int_codes, int_uniques = pd.factorize(interests)
+        width = max(len(int_uniques), 1)
+        pair = city_codes.astype(np.int64) * width + int_codes
+        codes, pairs = pd.factorize(pair)
+        new_c, new_i = [], []
+        ids = np.empty(len(pairs), dtype=np.int64)
+        for j, p in enumerate(pairs):
+            key = (city_uniques[p // width], int_uniques[p % width])
+            ident = self.ids.get(key)
+            if ident is None:
+                ident = self.ids[key] = len(self.ids)
+                new_c.append(key[0])
+                new_i.append(key[1])
+            ids[j] = ident
+        if new_c:
+            self.cities.extend(new_c)
+            self.interests.extend(new_i)
+            self.blocks.append(featurize(new_c, new_i))
+        return ids[codes], ids, np.bincount(codes, minlength=len(pairs))
+
+    def matrix(self):
+        if len(self.blocks) > 1:
+            self.blocks = [sp.vstack(self.blocks, format="csr")]
+        return self.blocks[0] if self.blocks else sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+
+def iter_fan_chunks(source, chunk_rows=CHUNK_ROWS):
+    """(city, interests) string Series per chunk of a fan CSV; missing columns read as empty."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    reader = pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False,
+                         usecols=lambda c: c in FEATURE_COLUMNS)
+    for chunk in reader:
+        for col in FEATURE_COLUMNS:
+            if col not in chunk:
+                chunk[col] = ""
+        yield _clean(chunk["city"]), _clean(chunk["interests"])
+
+def _describe(profiles, combo_counts, combo_labels):
+    """Size, top city and top interests of each segment, largest first."""
+    combos = pd.DataFrame({"segment": combo_labels, "city": profiles.cities,
+                           "interests": [split_interests(t) for t in profiles.interests], "fans": combo_counts})
+    total = max(int(combo_counts.sum()), 1)
+    out = []
+    for seg, g in combos.groupby("segment"):
+        fans = int(g["fans"].sum())
+        cities = g.groupby("city")["fans"].sum().sort_values(ascending=False)
+        tastes = g[["interests", "fans"]].explode("interests").dropna().groupby("interests")["fans"].sum()
+        tastes = tastes.sort_values(ascending=False).head(TOP_INTERESTS)
+        top_city = cities.index[0] or "(no city)"
+        out.append({
+            "segment": int(seg),
+            "label": f"{top_city} · {', '.join(t.title() for t in tastes.index) or 'no interests'}",
+            "fans": fans,
+            "share": fans / total,
+            "top_city": top_city,
+            "top_city_share": cities.iloc[0] / fans if fans else 0.0,
+            "top_interests": ", ".join(f"{t} ({n / fans:.0%})" for t, n in tastes.items()),
+        })
+    return pd.DataFrame(out).sort_values("fans", ascending=False, ignore_index=True)
+
+@timed("fan segmentation")
+def segment_fans(source, n_segments=DEFAULT_SEGMENTS, chunk_rows=CHUNK_ROWS, seed=0):
+    """
+    Cluster a fan list (CSV path or file-like with city,interests columns) in
+    one streaming pass: each chunk is featurized and fed to MiniBatchKMeans
+    via partial_fit, so memory stays at one chunk plus a per-row label.
+    Returns {"labels": segment per row (file order), "segments": summary frame, "rows": n}.
+    """
+    profiles = _Profiles()
+    row_ids = []
+    model = None
+    pending_ids, pending_counts = [], []
+    for city, interests in iter_fan_chunks(source, chunk_rows):
+        ids, chunk_ids, counts = profiles.encode(city, interests)
+        row_ids.append(ids.astype(np.int32))
+        # partial_fit needs at least n_segments samples in its first batch
+        pending_ids.append(chunk_ids)
+        pending_counts.append(counts)
+        if model is None and sum(len(p) for p in pending_ids) < n_segments:
+            continue
+        batch_ids, batch_counts = np.concatenate(pending_ids), np.concatenate(pending_counts)
+        pending_ids, pending_counts = [], []
+        if model is None:
+            model = MiniBatchKMeans(n_clusters=n_segments, random_state=seed, n_init=3)
+        model.partial_fit(profiles.matrix()[batch_ids], sample_weight=batch_counts.astype(np.float64))
+    row_ids = np.concatenate(row_ids) if row_ids else np.zeros(0, dtype=np.int32)
+    if model is None:
+        # fewer distinct fans than segments: each combination is its own segment
+        combo_labels = np.arange(len(profiles.ids))
+    else:
+        combo_labels = model.predict(profiles.matrix())
+    combo_counts = np.bincount(row_ids, minlength=len(profiles.ids))
+    segments = _describe(profiles, combo_counts, combo_labels) if len(row_ids) else pd.DataFrame()
+    return {"labels": combo_labels[row_ids].astype(np.int16), "segments": segments, "rows": len(row_ids)}
+
+def _cache_path(digest, n_segments):
+    return os.path.join(state_dir("fan_segments"), f"{digest}-k{n_segments}.pkl")
+
+def cached_segments(uploaded_file, n_segments=DEFAULT_SEGMENTS):
+    """segment_fans() once per upload content and segment count; reruns and re-uploads reuse it."""
+    key = (file_digest(uploaded_file), n_segments)
+    result = SEGMENT_CACHE.get(key)
+    if result is not None:
+        return result
+    path = _cache_path(*key)
+    result = load_pickle(path)
+    if result is None:
+        result = segment_fans(uploaded_file, n_segments)
+        save_pickle(path, result)
+    SEGMENT_CACHE.put(key, result)
+    return result
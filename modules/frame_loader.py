@@ -0,0 +1,77 @@
+# file: ai_tdm_suite/modules/frame_loader.py
+
+import numpy as np
+import pandas as pd
+
+from modules.ingest_cache import frame_nbytes
+from modules.instrumentation import timed
+
+# A string column becomes categorical when its distinct values are at most
+# this share of its rows (and below the absolute cap).
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_UNIQUE = 100_000
+# Integer columns keep their 64-bit dtype: measures such as tickets_sold or
+# price are multiplied and summed row-wise, and an int32 product overflows
+# silently in numpy on large exports.
+
+def _is_text(s):
+    return pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)
+
+def _optimize_column(s):
+    if isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(s.dtype):
+        return s
+    if _is_text(s):
+        n_unique = s.nunique(dropna=True)
+        if n_unique <= CATEGORY_MAX_UNIQUE and n_unique <= max(1, CATEGORY_MAX_RATIO * len(s)):
+            return s.astype("category")
+        return s
+    if pd.api.types.is_float_dtype(s.dtype) and s.dtype != np.float32:
+        narrow = s.astype(np.float32)
+        # Only when every value survives the round trip (prices like 10.99 do not).
+        if np.array_equal(narrow.to_numpy(np.float64), s.to_numpy(np.float64), equal_nan=True):
+            return narrow
+    return s
+
+def optimize_dtypes(df, exclude=()):
+    """
+    Convert low-cardinality strings to categoricals and narrow floats that
+    survive float32 exactly (integers are left at 64 bits).
+    Returns (optimized frame, report) where the report lists the converted
+    columns and the memory before/after.
+    """
+    before = frame_nbytes(df)
+    converted = {}
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col not in exclude:
+            new = _optimize_column(s)
+            if new.dtype != s.dtype:
+                converted[col] = str(new.dtype)
+                s = new
+        out[col] = s
+    optimized = pd.DataFrame(out, index=df.index)
+    after = frame_nbytes(optimized)
+    report = {"rows": len(df), "bytes_before": before, "bytes_after": after,
+              "bytes_saved": before - after, "converted": converted}
+    optimized.attrs["memory_report"] = report
+    return optimized, report
+
+@timed("csv parse")
+def load_csv(source, exclude=(), **read_csv_kwargs):
+    """Read a CSV upload and optimize its dtypes; returns (frame, report)."""
+    return optimize_dtypes(pd.read_csv(source, **read_csv_kwargs), exclude=exclude)
+
+def _fmt_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+
+def memory_summary(report):
+    """One-line description of a load's memory footprint for a caption."""
+    if not report:
+        return ""
+    pct = 100 * report["bytes_saved"] / report["bytes_before"] if report["bytes_before"] else 0
+    return (f"{report['rows']:,} rows in {_fmt_bytes(report['bytes_after'])} "
+            f"(saved {_fmt_bytes(report['bytes_saved'])}, {pct:.0f}% via compact dtypes)")
@@ -0,0 +1,128 @@
+# file: ai_tdm_suite/modules/ingest_cache.py
+
+import hashlib
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from modules.storage import state_dir
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # bytes of parsed frames kept in RAM
+_HASH_CHUNK = 8 * 1024 * 1024
+
+def file_digest(data):
+    """SHA-256 hex digest of upload bytes (bytes or a seekable file-like object)."""
+    h = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        h.update(data)
+        return h.hexdigest()
+    pos = data.tell()
+    data.seek(0)
+    for block in iter(lambda: data.read(_HASH_CHUNK), b""):
+        h.update(block)
+    data.seek(pos)
+    return h.hexdigest()
+
+def frame_nbytes(df):
+    """Approximate in-memory size of a DataFrame, including object payloads."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def _has_parquet():
+    return importlib.util.find_spec("pyarrow") is not None
+
+class IngestCache:
+    """
+    Content-addressed cache of parsed, typed DataFrames.
+
+    Frames live in an in-memory LRU bounded by a byte budget, backed by
+    Parquet files on local disk (pickle when pyarrow is unavailable), so a
+    re-upload of the same bytes skips CSV parsing in any later session.
+    Returned frames are shared between reruns: treat them as read-only.
+    """
+
+    def __init__(self, namespace, memory_budget=DEFAULT_MEMORY_BUDGET, directory=None):
+        self.directory = directory or state_dir("ingest_cache", namespace)
+        self.memory_budget = memory_budget
+        self._frames = OrderedDict()  # digest -> (df, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, digest):
+        ext = "parquet" if _has_parquet() else "pkl"
+        return os.path.join(self.directory, f"{digest}.{ext}")
+
+    def _remember(self, digest, df):
+        nbytes = frame_nbytes(df)
+        if nbytes > self.memory_budget:
+            return
+        old = self._frames.pop(digest, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._frames[digest] = (df, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.memory_budget and self._frames:
+            _, (_, evicted) = self._frames.popitem(last=False)
+            self._bytes -= evicted
+
+    def get(self, digest):
+        """Return the cached frame for a digest, or None on a miss."""
+        with self._lock:
+            entry = self._frames.get(digest)
+            if entry is not None:
+                self._frames.move_to_end(digest)
+                self.hits += 1
+                return entry[0]
+        path = self._disk_path(digest)
+        if not os.path.exists(path):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_pickle(path)
+        except Exception:
+            # Truncated or stale entry: drop it and re-parse from the upload.
+            os.remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(digest, df)
+        return df
+
+    def put(self, digest, df):
+        """Store a parsed frame in memory and on disk (atomic rename)."""
+        with self._lock:
+            self._remember(digest, df)
+        path = self._disk_path(digest)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if path.endswith(".parquet"):
+                df.to_parquet(tmp)
+            else:
+                df.to_pickle(tmp)
+            os.replace(tmp, path)
+        except Exception:
+            # The disk tier is best-effort; the in-memory copy still serves reruns.
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def clear(self):
+        """Drop all in-memory entries (disk files are kept)."""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._frames), "bytes": self._bytes, "budget": self.memory_budget,
+                "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+            }
@@ -0,0 +1,250 @@
+# file: ai_tdm_suite/modules/instrumentation.py
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+from modules.storage import state_path
+
+# Opt-in: set TDM_PROFILE_STARTUP=1 to record startup phases and write a report.
+STARTUP_PROFILING = os.environ.get("TDM_PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+# Opt-in: set TDM_PROFILE_SECTIONS=1 to time the router, page mains and named sections on every rerun.
+SECTION_PROFILING = os.environ.get("TDM_PROFILE_SECTIONS", "").lower() in ("1", "true", "yes")
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended).
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+# Clock starts when app.py first imports this module.
+_T0 = time.perf_counter()
+_STARTED_AT = datetime.now().isoformat(timespec="seconds")
+_LOCK = threading.Lock()
+_PHASES = []
+_SEEN_PHASES = set()
+_FIRST_RENDER_S = None
+_REPORT_PATH = None
+
+def top_level_packages(names):
+    """Distinct top-level package names from a set of module names."""
+    return sorted({n.split(".", 1)[0] for n in names if not n.startswith("_")})
+
+@contextmanager
+def phase(name, once=False):
+    """
+    Time a startup phase and record the top-level packages it imported.
+    With once=True only the first occurrence per process is recorded (e.g. a
+    page's first render). No-op unless startup profiling is enabled.
+    """
+    if not STARTUP_PROFILING or (once and name in _SEEN_PHASES):
+        yield
+        return
+    _SEEN_PHASES.add(name)
+    before = set(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _LOCK:
+            _PHASES.append({
+                "phase": name,
+                "start_s": round(start - _T0, 6),
+                "seconds": round(elapsed, 6),
+                "new_packages": top_level_packages(set(sys.modules) - before),
+            })
+        if _FIRST_RENDER_S is not None:
+            # Pages opened after the first render still land in the on-disk report.
+            write_startup_report(_REPORT_PATH)
+
+def mark_first_render():
+    """Record time-to-first-render (once per process) and write the report."""
+    global _FIRST_RENDER_S
+    if not STARTUP_PROFILING or _FIRST_RENDER_S is not None:
+        return
+    _FIRST_RENDER_S = time.perf_counter() - _T0
+    write_startup_report()
+
+def startup_report():
+    """Machine-readable startup profile for this process."""
+    from modules.registry import import_details
+    with _LOCK:
+        phases = list(_PHASES)
+    return {
+        "pid": os.getpid(),
+        "started_at": _STARTED_AT,
+        "python": sys.version.split()[0],
+        "first_render_s": None if _FIRST_RENDER_S is None else round(_FIRST_RENDER_S, 6),
+        "phases": phases,
+        "module_imports": import_details(),
+        "loaded_packages": top_level_packages(sys.modules),
+    }
+
+def write_startup_report(path=None):
+    """Write the startup report as JSON (default: state dir, one file per process)."""
+    global _REPORT_PATH
+    path = path or state_path("profiles", f"startup-{os.getpid()}.json")
+    with open(path, "w") as f:
+        json.dump(startup_report(), f, indent=2)
+    _REPORT_PATH = path
+    return path
+
+def show_startup_panel():
+    """Sidebar panel with the startup profile (only when profiling is enabled)."""
+    if not STARTUP_PROFILING:
+        return
+    import streamlit as st
+    report = startup_report()
+    with st.sidebar.expander("⏱️ Startup Profile", expanded=False):
+        if report["first_render_s"] is not None:
+            st.metric("Time to first render", f"{report['first_render_s'] * 1000:,.0f} ms")
+        rows = [{"phase": p["phase"], "ms": round(p["seconds"] * 1000, 1), "new packages": ", ".join(p["new_packages"])}
+                for p in report["phases"]]
+        rows += [{"phase": f"import {m}", "ms": round(d["seconds"] * 1000, 1), "new packages": ", ".join(d["new_packages"])}
+                 for m, d in report["module_imports"].items()]
+        st.dataframe(rows, use_container_width=True)
+        if _REPORT_PATH:
+            st.caption(f"Report: {_REPORT_PATH}")
+        st.download_button("Download report (JSON)", json.dumps(report, indent=2), file_name="startup_profile.json")
+
+# === Per-rerun section timing ===
+_SECTION_STATS = {}             # process-wide: section path -> histogram
+_LOCAL = threading.local()      # per script thread: section stack, session stats, current rerun
+
+def _empty_histogram():
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * len(LATENCY_BUCKETS_MS)}
+
+def _observe(stats, name, ms):
+    h = stats.get(name)
+    if h is None:
+        h = stats[name] = _empty_histogram()
+    h["count"] += 1
+    h["total_ms"] += ms
+    h["max_ms"] = max(h["max_ms"], ms)
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if ms <= bound:
+            h["buckets"][i] += 1
+            break
+
+def _stack():
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+@contextmanager
+def section(name):
+    """
+    Time a named section of the current rerun. Nested sections are recorded
+    under their full path ("router/main: Catalog Analytics/charts"). Feeds the
+    process-wide and per-session histograms. No-op unless section profiling is enabled.
+    """
+    if not SECTION_PROFILING:
+        yield
+        return
+    stack = _stack()
+    stack.append(name)
+    path = "/".join(stack)
+    session = getattr(_LOCAL, "session", None)
+    entry = None
+    if session is not None:
+        # appended on entry so the rerun list reads in call order, parents first
+        entry = {"section": path, "depth": len(stack) - 1, "ms": None}
+        _LOCAL.rerun.append(entry)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        stack.pop()
+        with _LOCK:
+            _observe(_SECTION_STATS, path, ms)
+        if entry is not None:
+            _observe(session, path, ms)
+            entry["ms"] = round(ms, 3)
+
+def timed(name=None):
+    """Decorator form of section(); defaults to the function's qualified name."""
+    def decorate(func):
+        label = name or func.__qualname__
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not SECTION_PROFILING:
+                return func(*args, **kwargs)
+            with section(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def begin_rerun():
+    """Start timing a script rerun; per-session histograms live in session_state."""
+    if not SECTION_PROFILING:
+        return
+    import streamlit as st
+    _LOCAL.stack = []
+    _LOCAL.session = st.session_state.setdefault("_section_stats", {})
+    _LOCAL.rerun = []
+    _LOCAL.rerun_start = time.perf_counter()
+
+def end_rerun():
+    """Close the current rerun: record its total and keep its sections for the panel."""
+    if not SECTION_PROFILING or getattr(_LOCAL, "session", None) is None:
+        return
+    import streamlit as st
+    ms = (time.perf_counter() - _LOCAL.rerun_start) * 1000
+    with _LOCK:
+        _observe(_SECTION_STATS, "rerun", ms)
+    _observe(_LOCAL.session, "rerun", ms)
+    st.session_state["_last_rerun"] = {"total_ms": round(ms, 3), "sections": _LOCAL.rerun}
+    _LOCAL.session = None
+
+def _summarize(stats):
+    return {
+        name: {
+            "count": h["count"],
+            "mean_ms": round(h["total_ms"] / h["count"], 3),
+            "max_ms": round(h["max_ms"], 3),
+            "buckets_ms": {("inf" if b == float("inf") else b): n for b, n in zip(LATENCY_BUCKETS_MS, h["buckets"]) if n},
+        }
+        for name, h in sorted(stats.items())
+    }
+
+def section_report(session_state=None):
+    """Machine-readable section timings: process-wide, and per-session when session_state is given."""
+    with _LOCK:
+        process = _summarize(_SECTION_STATS)
+    report = {"pid": os.getpid(), "started_at": _STARTED_AT, "process": process}
+    if session_state is not None:
+        report["session"] = _summarize(session_state.get("_section_stats", {}))
+        report["last_rerun"] = session_state.get("_last_rerun")
+    return report
+
+def write_section_report(path=None, session_state=None):
+    """Write the section report as JSON (default: state dir, one file per process)."""
+    path = path or state_path("profiles", f"sections-{os.getpid()}.json")
+    with open(path, "w") as f:
+        json.dump(section_report(session_state), f, indent=2)
+    return path
+
+def show_section_panel():
+    """Debug sidebar panel with section timings (only when section profiling is enabled)."""
+    if not SECTION_PROFILING:
+        return
+    import streamlit as st
+    report = section_report(st.session_state)
+    with st.sidebar.expander("🐢 Section Timings (debug)", expanded=False):
+        last = report["last_rerun"]
+        if last:
+            st.metric("Last rerun", f"{last['total_ms']:,.0f} ms")
+            st.dataframe([{"section": "  " * r["depth"] + r["section"].rsplit("/", 1)[-1], "ms": r["ms"]}
+                          for r in last["sections"]], use_container_width=True)
+        scope = st.radio("Histograms", ["This session", "All sessions"], horizontal=True, key="_section_scope")
+        stats = report["session"] if scope == "This session" else report["process"]
+        st.dataframe([{"section": name, "count": h["count"], "mean ms": h["mean_ms"], "max ms": h["max_ms"],
+                       "histogram": " ".join(f"≤{b}:{n}" for b, n in h["buckets_ms"].items())}
+                      for name, h in stats.items()], use_container_width=True)
+        st.download_button("Download timings (JSON)", json.dumps(report, indent=2), file_name="section_timings.json")
+        if st.button("Write timings to disk", key="_section_dump"):
+            st.caption(f"Written to {write_section_report(session_state=st.session_state)}")
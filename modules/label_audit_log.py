@@ -0,0 +1,57 @@
+# file: ai_tdm_suite/modules/label_audit_log.py
+import streamlit as st
+from datetime import datetime, time, timedelta
+from modules.audit import audit_stats
+from modules.audit_index import DEFAULT_PAGE_SIZE, index_stats, known_actions, query_events, sync_index
+
+def _epoch(day, end=False):
+    return datetime.combine(day + timedelta(days=1) if end else day, time.min).timestamp()
+
+def main():
+    st.header("🧾 Audit Log (Compliance)")
+    st.markdown("Search every recorded action by user, action type and date range. Newest first.")
+    with st.spinner("Indexing new audit events..."):
+        added = sync_index()
+    stats = index_stats()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Events indexed", f"{stats['events']:,}", delta=f"+{added:,}" if added else None)
+    c2.metric("Users", f"{stats['users']:,}")
+    c3.metric("Action types", stats["actions"])
+
+    f1, f2, f3 = st.columns([1, 1, 1.2])
+    user = f1.text_input("User ID", key="audit_user").strip()
+    action = f2.selectbox("Action", ["All actions"] + known_actions(), key="audit_action")
+    today = datetime.now().date()
+    dates = f3.date_input("Date range", (today - timedelta(days=30), today), key="audit_dates")
+    page_size = st.select_slider("Rows per page", [25, 50, 100, 250], value=DEFAULT_PAGE_SIZE, key="audit_page_size")
+
+    # Keyset pagination: remember the cursor that starts each visited page.
+    filters = (user, action, tuple(dates), page_size)
+    if st.session_state.get("audit_filters") != filters:
+        st.session_state["audit_filters"] = filters
+        st.session_state["audit_cursors"] = [None]
+    cursors = st.session_state["audit_cursors"]
+    start = _epoch(dates[0]) if len(dates) > 0 else None
+    end = _epoch(dates[-1], end=True) if len(dates) > 0 else None
+    rows, next_cursor = query_events(user=user or None, action=None if action == "All actions" else action,
+                                     start=start, end=end, limit=page_size, cursor=cursors[-1])
+    for row in rows:
+        row["ts"] = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No audit events match these filters.")
+
+    p1, p2, p3 = st.columns([1, 1, 4])
+    if p1.button("← Newer", disabled=len(cursors) == 1, key="audit_prev"):
+        cursors.pop()
+        st.rerun()
+    if p2.button("Older →", disabled=next_cursor is None, key="audit_next"):
+        cursors.append(next_cursor)
+        st.rerun()
+    p3.caption(f"Page {len(cursors)}")
+
+    writer = audit_stats()
+    if writer:
+        st.caption(f"Writer (this process): {writer['written']:,} written · {writer['queue_depth']:,} queued · "
+                   f"{writer['dropped']:,} dropped · {writer['backpressure']:,} backpressure waits")
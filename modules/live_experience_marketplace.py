@@ -2,37 +2,8 @@
 
 import streamlit as st
 import random
-from datetime import datetime
-
-# === Revenue Model Badges: for this module only ===
-ALL_REVENUE_MODELS = [
-    {"grade": "A",   "category": "Marketplaces/Aggregator", "name": "Marketplace/Aggregator", "desc": "Connect buyers/sellers", "rationale": "Network effects, high profitability."},
-    {"grade": "B+",  "category": "Experience Selling",      "name": "Experiences",            "desc": "Premium events/experiences", "rationale": "Loyalty, high delivery cost."},
-    {"grade": "A-",  "category": "Affiliate Marketing",     "name": "Affiliate Marketing",    "desc": "Promote for commission", "rationale": "Zero inventory, 20-50% commission, passive."},
-]
-MODULE_REVENUE_MODELS = {
-    "Live Experience Marketplace": [
-        "Marketplace/Aggregator", "Experiences", "Affiliate Marketing"
-    ]
-}
-
-def show_revenue_badges(module):
-    """Show badges for all enabled revenue models in this module."""
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-            f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-            f"{m['name']} ({m['grade']})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
-
-# --- Helpers ---
-def audit_log(action, user="anon"):
-    """Print an audit log line (for MVP demonstration; replace with database in prod)."""
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 # --- Main MVP App ---
 def main():
@@ -0,0 +1,42 @@
+# file: ai_tdm_suite/modules/lru.py
+
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Small thread-safe LRU mapping for per-dataset results shared across sessions."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {"entries": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
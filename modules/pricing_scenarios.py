@@ -0,0 +1,105 @@
+# file: ai_tdm_suite/modules/pricing_scenarios.py
+
+import json
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+
+from modules.chart_cache import render_png
+
+BILLING = ("monthly", "annual")
+# Pay-per-Use revenue assumes this many billable actions per customer per month.
+PPU_ACTIONS_PER_MONTH = 10
+
+def plans_key(plans):
+    """Hashable fingerprint of a pricing plan configuration."""
+    return json.dumps(plans, sort_keys=True, default=str)
+
+def plan_terms(plans):
+    """
+    Per-plan pricing terms as arrays: monthly price by billing (P x 2),
+    marketplace fee (P,) and pay-per-use revenue per customer (P,).
+    """
+    names = list(plans)
+    price = np.zeros((len(names), len(BILLING)))
+    fee = np.zeros(len(names))
+    ppu = np.zeros(len(names))
+    for i, name in enumerate(names):
+        plan = plans[name]
+        fee[i] = plan.get("transaction_fee", 0)
+        if "price_per_action" in plan:
+            ppu[i] = plan["price_per_action"] * PPU_ACTIONS_PER_MONTH
+            continue
+        monthly = plan.get("price_month", 0)
+        price[i] = (monthly, plan.get("price_annual", monthly * 12) / 12 if "price_annual" in plan else monthly)
+    return names, price, fee, ppu
+
+@lru_cache(maxsize=32)
+def _grid(key, customers, gmv):
+    names, price, fee, ppu = plan_terms(json.loads(key))
+    n = np.asarray(customers, dtype="float64")
+    g = np.asarray(gmv, dtype="float64")
+    # revenue per customer: (P, B, 1, G); broadcast against customers (1, 1, C, 1)
+    per_customer = price[:, :, None, None] + fee[:, None, None, None] * g[None, None, None, :] + ppu[:, None, None, None]
+    revenue = n[None, None, :, None] * per_customer
+    revenue.setflags(write=False)
+    return names, revenue
+
+def scenario_grid(plans, customers, gmv):
+    """
+    Monthly revenue for every plan x billing x customer count x GMV level,
+    as (plan names, array of shape (P, 2, len(customers), len(gmv))).
+    Cached per plan configuration and grid.
+    """
+    return _grid(plans_key(plans), tuple(np.asarray(customers).tolist()), tuple(np.asarray(gmv).tolist()))
+
+def break_even_customers(plans, gmv, monthly_cost):
+    """Customers needed to cover `monthly_cost` per plan x billing at each GMV level (inf if never)."""
+    names, price, fee, ppu = plan_terms(plans)
+    g = np.atleast_1d(np.asarray(gmv, dtype="float64"))
+    per_customer = price[:, :, None] + fee[:, None, None] * g[None, None, :] + ppu[:, None, None]
+    with np.errstate(divide="ignore"):
+        needed = np.where(per_customer > 0, np.ceil(monthly_cost / per_customer), np.inf)
+    return names, needed
+
+def _draw_surface(ax, customers, gmv, surface, monthly_cost):
+    cs = ax.contourf(gmv, customers, surface, levels=20, cmap="YlGnBu")
+    ax.figure.colorbar(cs, ax=ax, label="Monthly revenue ($)")
+    if monthly_cost > 0 and surface.min() < monthly_cost < surface.max():
+        line = ax.contour(gmv, customers, surface, levels=[monthly_cost], colors="#A51C30", linewidths=2)
+        ax.clabel(line, fmt={monthly_cost: "break-even"}, fontsize=9)
+    ax.set_xlabel("Avg. GMV per user / month ($)")
+    ax.set_ylabel("Customers")
+
+def show_scenario_explorer(plans, selected_plan, annual, n_customers, avg_gmv):
+    """Sensitivity surface, break-even contour and per-plan table for the whole grid."""
+    st.markdown("#### 📊 Scenario Grid: All Plans × Customers × GMV × Billing")
+    c1, c2, c3 = st.columns(3)
+    max_customers = c1.number_input("Max customers", min_value=100, value=5000, step=100, key="grid_max_customers")
+    max_gmv = c2.number_input("Max GMV per user ($)", min_value=10, value=2000, step=10, key="grid_max_gmv")
+    monthly_cost = c3.number_input("Monthly operating cost ($)", min_value=0, value=20000, step=1000, key="grid_cost")
+    customers = np.linspace(0, max_customers, 120)
+    gmv = np.linspace(0, max_gmv, 120)
+    names, revenue = scenario_grid(plans, customers, gmv)
+    st.caption(f"{revenue.size:,} scenarios evaluated in one vectorized pass.")
+
+    b = BILLING.index("annual" if annual else "monthly")
+    p = names.index(selected_plan)
+    key = ("pricing_surface", plans_key(plans), max_customers, max_gmv, monthly_cost, p, b)
+    st.image(render_png(key, lambda fig, ax: _draw_surface(ax, customers, gmv, revenue[p, b], monthly_cost), figsize=(7, 4)),
+             use_container_width=True)
+
+    _, needed = break_even_customers(plans, avg_gmv, monthly_cost)
+    _, current = scenario_grid(plans, (n_customers,), (avg_gmv,))
+    rows = []
+    for i, name in enumerate(names):
+        for j, billing in enumerate(BILLING):
+            rows.append({
+                "plan": name,
+                "billing": billing,
+                "monthly revenue @ current inputs": round(float(current[i, j, 0, 0]), 2),
+                "max monthly revenue on grid": round(float(revenue[i, j].max()), 2),
+                "break-even customers @ current GMV": None if np.isinf(needed[i, j, 0]) else int(needed[i, j, 0]),
+            })
+    st.dataframe(rows, use_container_width=True)
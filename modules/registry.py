@@ -0,0 +1,74 @@
+# file: ai_tdm_suite/modules/registry.py
+
+import importlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from modules.instrumentation import section
+
+# Page name -> module exposing main(). Modules are imported on first selection,
+# so heavy dependencies (pandas, matplotlib, sklearn) load only when needed.
+PAGE_MODULES = OrderedDict([
+    ("Audience Insights Dashboard", "modules.audience_insights_dashboard"),
+    ("Accessible Streaming Platform", "modules.accessible_streaming_platform"),
+    ("TDM AI Marketing Platform", "modules.tdm_ai_marketing_platform"),
+    ("Creator-to-Fan AI CRM", "modules.creator_to_fan_crm"),
+    ("Digital Merch & NFT Platform", "modules.digital_merch_nft_platform"),
+    ("Live Experience Marketplace", "modules.live_experience_marketplace"),
+    ("TDM Digital Publishing Studio", "modules.tdm_digital_publishing_studio"),
+    ("Smart Merch & Print-on-Demand Hub", "modules.smart_merch_print_hub"),
+])
+
+LABEL_TOOL_MODULES = OrderedDict([
+    ("Catalog Analytics", "modules.label_catalog_analytics"),
+    ("A&R Heatmap", "modules.label_anr_heatmap"),
+    ("Royalty & Finance", "modules.label_royalty_finance"),
+    ("White-label Settings", "modules.label_whitelabel_settings"),
+    ("Audit Log", "modules.label_audit_log"),
+])
+
+# module path -> seconds spent on its first import in this process
+IMPORT_TIMES = {}
+# module path -> top-level packages that first import pulled in
+IMPORT_PACKAGES = {}
+_IMPORT_LOCK = threading.Lock()
+
+def module_path(name):
+    """Module path registered for a page or label tool name."""
+    if name in PAGE_MODULES:
+        return PAGE_MODULES[name]
+    if name in LABEL_TOOL_MODULES:
+        return LABEL_TOOL_MODULES[name]
+    raise KeyError(f"Unknown page: {name}")
+
+def load_page(name):
+    """Import a page's module on first use (timing the import) and return its main()."""
+    path = module_path(name)
+    module = sys.modules.get(path)
+    if module is None:
+        with _IMPORT_LOCK:
+            module = sys.modules.get(path)
+            if module is None:
+                before = set(sys.modules)
+                start = time.perf_counter()
+                module = importlib.import_module(path)
+                IMPORT_TIMES[path] = time.perf_counter() - start
+                IMPORT_PACKAGES[path] = sorted({m.split(".", 1)[0] for m in set(sys.modules) - before} - {"modules"})
+    return module.main
+
+def run_page(name):
+    """Render a page by name (timed as section "main: <name>")."""
+    main = load_page(name)
+    with section(f"main: {name}"):
+        main()
+
+def import_times():
+    """Per-module first-import durations recorded so far (seconds)."""
+    return dict(IMPORT_TIMES)
+
+def import_details():
+    """Per-module first-import duration and newly loaded packages."""
+    return {path: {"seconds": round(sec, 6), "new_packages": IMPORT_PACKAGES.get(path, [])}
+            for path, sec in IMPORT_TIMES.items()}
@@ -1,10 +1,14 @@
 # file: ai_tdm_suite/modules/revenue_models.py
 
+import html
+import threading
+from collections.abc import Sequence
+from types import MappingProxyType
+
 import streamlit as st
-import pandas as pd
 
 # === FULL CATALOG OF REVENUE MODELS (Reference/Source-of-Truth) ===
-ALL_REVENUE_MODELS = [
+_CATALOG = [
     {"grade": "A",   "category": "Recurring Revenue",        "name": "Subscription",           "desc": "Ongoing access fee (e.g., Netflix, Salesforce)", "rationale": "High predictability, 70-90% margins, infinite scalability."},
     {"grade": "A",   "category": "Recurring Revenue",        "name": "Membership Site",        "desc": "Community, perks (e.g., Patreon, h Club)", "rationale": "Predictable, scalable, high LTV."},
     {"grade": "A",   "category": "Licensing/Franchising",    "name": "Licensing IP",           "desc": "License IP or patents (e.g., IBM)", "rationale": "Passive, scalable, recurring, low risk."},
@@ -25,6 +29,7 @@ ALL_REVENUE_MODELS = [
     {"grade": "B",   "category": "Service-Based",            "name": "Consulting/Agency",      "desc": "Sell expertise/time (e.g., Upwork, McKinsey)", "rationale": "High margin, time-limited."},
     {"grade": "B",   "category": "Buy Now Pay Later",        "name": "BNPL/Interest",          "desc": "Financing/installments (e.g., Klarna, Affirm)", "rationale": "20-40% returns, default risk."},
     {"grade": "B",   "category": "Content Creation",         "name": "Blogging/YouTube",       "desc": "Monetize via ads/affiliates (e.g., MrBeast)", "rationale": "Viral, slow start, 30-60% margin."},
+    {"grade": "B",   "category": "Content Creation",         "name": "Content Creation",       "desc": "Content for marketing", "rationale": "Builds authority."},
     {"grade": "B",   "category": "App Development",          "name": "App Sales",              "desc": "Build/sell apps", "rationale": "Demand, dev cost."},
     {"grade": "B",   "category": "Local Services",           "name": "Per-Job Services",       "desc": "Task-based (e.g., TaskRabbit)", "rationale": "Steady, location-limited."},
     {"grade": "B",   "category": "Flat Rate",                "name": "Membership/Flat Rate",   "desc": "Fixed fee (e.g., gym, SaaS)", "rationale": "Predictable, overuse risk."},
@@ -37,12 +42,12 @@ ALL_REVENUE_MODELS = [
 ]
 
 # === MODULE TO REVENUE MODELS MAP ===
-MODULE_REVENUE_MODELS = {
+_MODULE_MODELS = {
     "Audience Insights Dashboard": [
-        "Subscription", "DaaS/Data Monetization", "BNPL/Interest", "Freemium", "Loyalty/Rewards", "Commission/Fees", "Ads/Sponsorship"
+        "Subscription", "DaaS/Data Monetization", "Freemium", "Commission/Fees", "Ads/Sponsorship"
     ],
     "Accessible Streaming Platform": [
-        "Freemium", "Subscription", "BNPL/Interest", "Ads/Sponsorship", "Pay-Per-Use", "Experiences", "Online Courses/eBooks", "Affiliate Marketing"
+        "Freemium", "Subscription", "Ads/Sponsorship", "Online Courses/eBooks", "Affiliate Marketing"
     ],
     "TDM AI Marketing Platform": [
         "Licensing IP", "App Sales", "Consulting/Agency", "Marketplace/Aggregator", "Content Creation", "Layer Player", "Customer-Driven"
@@ -64,33 +69,110 @@ MODULE_REVENUE_MODELS = {
     ]
 }
 
+_CATALOG = [MappingProxyType(m) for m in _CATALOG]
+_MODULE_MODELS = {module: tuple(names) for module, names in _MODULE_MODELS.items()}
+
+class _CatalogView(Sequence):
+    """Live read-only view of the catalog (changes go through register_model())."""
+
+    def __getitem__(self, i):
+        return _CATALOG[i]
+
+    def __len__(self):
+        return len(_CATALOG)
+
+    def __repr__(self):
+        return f"ALL_REVENUE_MODELS({_CATALOG!r})"
+
+# Exported views are read-only, so in-place edits fail instead of leaving the
+# badge cache stale.
+ALL_REVENUE_MODELS = _CatalogView()
+MODULE_REVENUE_MODELS = MappingProxyType(_MODULE_MODELS)
+
+# === INDEXES & COMPILED BADGES ===
+# Derived from the two tables above; rebuilt whenever they change through
+# register_model()/set_module_models().
+_LOCK = threading.Lock()
+_MODELS_BY_NAME = {}
+_CATALOG_POSITION = {}
+_BADGE_HTML = {}  # module name -> compiled badge HTML
+_VERSION = 0
+
+def _reindex():
+    global _MODELS_BY_NAME, _CATALOG_POSITION, _VERSION
+    _MODELS_BY_NAME = {m["name"]: m for m in _CATALOG}
+    _CATALOG_POSITION = {m["name"]: i for i, m in enumerate(_CATALOG)}
+    _BADGE_HTML.clear()
+    _VERSION += 1
+
+_reindex()
+
+def registry_version():
+    """Counter bumped on every registry change (for callers caching derived data)."""
+    return _VERSION
+
+def register_model(model):
+    """Add a revenue model to the catalog, or replace the one with the same name."""
+    with _LOCK:
+        pos = _CATALOG_POSITION.get(model["name"])
+        model = MappingProxyType(dict(model))
+        if pos is None:
+            _CATALOG.append(model)
+        else:
+            _CATALOG[pos] = model
+        _reindex()
+
+def set_module_models(module_name, names):
+    """Set the revenue models enabled for a module."""
+    with _LOCK:
+        _MODULE_MODELS[module_name] = tuple(names)
+        _reindex()
+
+def get_model(name):
+    """Look up a revenue model by name (None if unknown)."""
+    return _MODELS_BY_NAME.get(name)
+
 def get_enabled_models(module_name):
     """
-    Return the list of revenue model dicts for a given module.
+    Return the list of revenue model dicts for a given module, in catalog order.
     """
-    names = MODULE_REVENUE_MODELS.get(module_name, [])
-    return [m for m in ALL_REVENUE_MODELS if m["name"] in names]
+    names = _MODULE_MODELS.get(module_name, ())
+    enabled = [n for n in dict.fromkeys(names) if n in _MODELS_BY_NAME]
+    enabled.sort(key=_CATALOG_POSITION.__getitem__)
+    return [_MODELS_BY_NAME[n] for n in enabled]
+
+def badge_html(module_name):
+    """Compiled badge HTML for a module, built once per registry version."""
+    cached = _BADGE_HTML.get(module_name)
+    if cached is None:
+        # Build under the lock too: a _reindex() between building and storing
+        # would otherwise leave HTML from the old registry in the new cache.
+        with _LOCK:
+            cached = _BADGE_HTML.get(module_name)
+            if cached is None:
+                cached = "".join(
+                    f"<span class='h-badge' title='{html.escape(m['desc'], quote=True)} | {html.escape(m['rationale'], quote=True)}'>"
+                    f"{html.escape(m['name'])} ({m['grade']})</span> "
+                    for m in get_enabled_models(module_name)
+                )
+                _BADGE_HTML[module_name] = cached
+    return cached
 
 def show_revenue_model_reference():
     """
     Display a full reference table of all available revenue models.
     """
-    df = pd.DataFrame(ALL_REVENUE_MODELS)
+    import pandas as pd  # deferred: keeps pandas off the cold-start path
+    df = pd.DataFrame([dict(m) for m in _CATALOG])
     st.dataframe(df[["grade", "category", "name", "desc", "rationale"]], use_container_width=True)
 
 def show_revenue_badges(module_name):
     """
     Show visually distinctive badges for all enabled revenue models in the current module.
     """
-    enabled = get_enabled_models(module_name)
-    if not enabled:
+    badges = badge_html(module_name)
+    if not badges:
         st.info("No revenue models configured for this module.")
         return
     st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span class='h-badge' title='{m['desc']} | {m['rationale']}'>"
-            f"{m['name']} ({m['grade']})</span> "
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
+    st.markdown(badges, unsafe_allow_html=True)
@@ -0,0 +1,126 @@
+# file: ai_tdm_suite/modules/revenue_monte_carlo.py
+
+import json
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+
+from modules.pricing_scenarios import plan_terms, plans_key
+
+HORIZON_MONTHS = 12
+# Customer-months are generated in blocks of at most this many customers x trials.
+CHUNK_CELLS = 250_000
+# Default monthly churn by plan name (unknown plans use DEFAULT_CHURN_OTHER).
+DEFAULT_CHURN = {"Freemium": 0.08, "Pro": 0.03, "Enterprise": 0.015, "Pay-per-Use": 0.05}
+DEFAULT_CHURN_OTHER = 0.04
+PERCENTILES = (10, 50, 90)
+
+def _tables(plans, annual, churn):
+    """Lookup tables indexed by state (0 = churned, i + 1 = plan i); the churned row is all zeros."""
+    names, price, fee, _ = plan_terms(plans)
+    b = 1 if annual else 0
+    pad = lambda a: np.concatenate(([0.0], np.asarray(a, dtype="float32"))).astype("float32")
+    return names, {
+        "price": pad(price[:, b]),
+        "fee": pad(fee),
+        "per_action": pad([plans[n].get("price_per_action", 0) for n in names]),
+        "churn": pad([churn.get(n, DEFAULT_CHURN_OTHER) for n in names]),
+    }
+
+def _simulate_block(rng, trials, customers, start, tables, assumptions, convert_from, convert_to):
+    """Monthly revenue (trials x months) and final active counts for one block of trials."""
+    months = assumptions["months"]
+    state = np.full((trials, customers), start, dtype=np.int8)
+    revenue = np.zeros((trials, months))
+    sigma = assumptions["gmv_sigma"]
+    mu = np.log(max(assumptions["avg_gmv"], 1e-9)) - sigma ** 2 / 2
+    action_states = np.flatnonzero(tables["per_action"])
+    for m in range(months):
+        month_rev = tables["price"][state]
+        if assumptions["avg_gmv"] > 0:
+            gmv = np.exp(mu + sigma * rng.standard_normal(state.shape, dtype=np.float32))
+            month_rev = month_rev + tables["fee"][state] * gmv
+        revenue[:, m] = month_rev.sum(axis=1)
+        # a sum of independent Poisson counts is Poisson, so draw each trial's total actions per plan at once
+        for k in action_states:
+            users = (state == k).sum(axis=1)
+            revenue[:, m] += tables["per_action"][k] * rng.poisson(assumptions["actions_per_month"] * users)
+        # transitions for next month: churn first, then Freemium -> Pro upgrades
+        u = rng.random(state.shape, dtype=np.float32)
+        churned = u < tables["churn"][state]
+        if convert_from is not None:
+            upgraded = (state == convert_from) & ~churned & (rng.random(state.shape, dtype=np.float32) < assumptions["conversion"])
+            state[upgraded] = convert_to
+        state[churned] = 0
+    return revenue, (state > 0).sum(axis=1)
+
+@lru_cache(maxsize=16)
+def _simulate(key):
+    params = json.loads(key)
+    plans, a = params["plans"], params["assumptions"]
+    names, tables = _tables(plans, a["annual"], a["churn"])
+    start = names.index(a["start_plan"]) + 1
+    convert_from = names.index(a["convert_from"]) + 1 if a["convert_from"] in names else None
+    convert_to = names.index(a["convert_to"]) + 1 if a["convert_to"] in names else None
+    if convert_to is None:
+        convert_from = None
+    customers = max(1, a["customers"])
+    trials = max(1, -(-a["trajectories"] // customers))
+    block = max(1, CHUNK_CELLS // customers)
+    rng = np.random.default_rng(a["seed"])
+    monthly, active = [], []
+    for done in range(0, trials, block):
+        rev, act = _simulate_block(rng, min(block, trials - done), customers, start, tables, a, convert_from, convert_to)
+        monthly.append(rev)
+        active.append(act)
+    monthly = np.concatenate(monthly)
+    active = np.concatenate(active)
+    annual_total = monthly.sum(axis=1)
+    return {
+        "trials": trials,
+        "trajectories": trials * customers,
+        "monthly_percentiles": np.percentile(monthly, PERCENTILES, axis=0),  # (3, months)
+        "annual_percentiles": np.percentile(annual_total, PERCENTILES),
+        "active_percentiles": np.percentile(active, PERCENTILES),
+    }
+
+def simulate_revenue(plans, start_plan, customers, avg_gmv, annual=True, trajectories=1_000_000,
+                     months=HORIZON_MONTHS, conversion=0.04, gmv_sigma=0.8, actions_per_month=10,
+                     churn=None, convert_from="Freemium", convert_to="Pro", seed=7):
+    """
+    Monte Carlo revenue forecast: `trajectories` customer paths (split into
+    trials of `customers` each) over `months`, with per-plan churn, monthly
+    Freemium->Pro conversion, lognormal GMV and Poisson pay-per-use actions.
+    Returns P10/P50/P90 monthly and annual revenue. Cached per inputs.
+    """
+    assumptions = {
+        "start_plan": start_plan, "customers": int(customers), "avg_gmv": float(avg_gmv), "annual": bool(annual),
+        "trajectories": int(trajectories), "months": int(months), "conversion": float(conversion),
+        "gmv_sigma": float(gmv_sigma), "actions_per_month": float(actions_per_month),
+        "churn": dict(DEFAULT_CHURN, **(churn or {})), "convert_from": convert_from, "convert_to": convert_to,
+        "seed": int(seed),
+    }
+    return _simulate(json.dumps({"plans": json.loads(plans_key(plans)), "assumptions": assumptions}, sort_keys=True))
+
+def show_monte_carlo(plans, selected_plan, annual, n_customers, avg_gmv):
+    """Interactive Monte Carlo forecast for the selected plan."""
+    st.markdown("#### 🎲 Monte Carlo Revenue Forecast")
+    c1, c2, c3, c4 = st.columns(4)
+    churn = c1.slider(f"Monthly churn ({selected_plan})", 0.0, 0.30, DEFAULT_CHURN.get(selected_plan, DEFAULT_CHURN_OTHER),
+                      step=0.005, format="%.3f", key="mc_churn")
+    conversion = c2.slider("Freemium → Pro conversion / month", 0.0, 0.20, 0.04, step=0.005, format="%.3f", key="mc_conv")
+    gmv_sigma = c3.slider("GMV volatility (σ)", 0.0, 2.0, 0.8, step=0.1, key="mc_sigma")
+    trajectories = c4.select_slider("Customer trajectories", [100_000, 250_000, 500_000, 1_000_000], value=1_000_000, key="mc_paths")
+    result = simulate_revenue(plans, selected_plan, n_customers, avg_gmv, annual=annual, trajectories=trajectories,
+                              conversion=conversion, gmv_sigma=gmv_sigma, churn={selected_plan: churn})
+    p10, p50, p90 = result["annual_percentiles"]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Annual revenue P10", f"${p10:,.0f}")
+    m2.metric("Annual revenue P50", f"${p50:,.0f}")
+    m3.metric("Annual revenue P90", f"${p90:,.0f}")
+    monthly = result["monthly_percentiles"]
+    st.line_chart({f"P{p}": monthly[i] for i, p in enumerate(PERCENTILES)})
+    lo, mid, hi = result["active_percentiles"]
+    st.caption(f"{result['trajectories']:,} simulated customer paths ({result['trials']:,} trials × {n_customers:,} customers). "
+               f"Active customers after {monthly.shape[1]} months: P10 {lo:,.0f} · P50 {mid:,.0f} · P90 {hi:,.0f}.")
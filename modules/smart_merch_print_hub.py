@@ -2,37 +2,8 @@
 
 import streamlit as st
 import random
-from datetime import datetime
-
-# --- Inline Revenue Badges for this module ---
-ALL_REVENUE_MODELS = [
-    {"grade": "B",   "category": "Product Sales",        "name": "Physical/Digital Sales", "desc": "E-commerce",                     "rationale": "Direct revenue, inventory risk."},
-    {"grade": "A-",  "category": "Freemium",             "name": "Freemium",               "desc": "Free tier + paid upgrades",      "rationale": "Low acquisition cost, high conversion potential."},
-    {"grade": "B+",  "category": "Transaction-Based",    "name": "Commission/Fees",        "desc": "Fee per sale",                   "rationale": "Scalable, 10-30% fees."},
-    {"grade": "B",   "category": "Customer Loyalty",     "name": "Loyalty/Rewards",        "desc": "Incentivize repeats",            "rationale": "Retention, scalable digital."},
-]
-MODULE_REVENUE_MODELS = {
-    "Smart Merch & Print-on-Demand Hub": [
-        "Physical/Digital Sales", "Freemium", "Commission/Fees", "Loyalty/Rewards"
-    ]
-}
-
-def show_revenue_badges(module):
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    if enabled:
-        st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-        badge_html = ""
-        for m in enabled:
-            badge_html += (
-                f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-                f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-                f"{m['name']} ({m['grade']})</span>"
-            )
-        st.markdown(badge_html, unsafe_allow_html=True)
-
-# --- Inline audit log for demo (robust for prod) ---
-def audit_log(action, user="anon"):
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 def main():
     st.header("👕 Smart Merch & Print-on-Demand Hub (MVP Demo)")
@@ -0,0 +1,65 @@
+# file: ai_tdm_suite/modules/storage.py
+
+import os
+import pickle
+import sqlite3
+import threading
+
+# Root for on-disk caches and local state (override with TDM_STATE_DIR in deployments).
+STATE_ROOT = os.environ.get("TDM_STATE_DIR", ".tdm_state")
+
+def state_path(*parts):
+    """Return a path under the local state root, creating its parent directory."""
+    path = os.path.join(STATE_ROOT, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def state_dir(*parts):
+    """Return a directory under the local state root, creating it if needed."""
+    path = os.path.join(STATE_ROOT, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_pickle(path):
+    """Object pickled at `path`, or None if missing (unreadable files are removed)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        os.remove(path)
+        return None
+
+def save_pickle(path, obj):
+    """Pickle `obj` to `path` via an atomic rename."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+_SQLITE = threading.local()
+
+def connect_sqlite(path, schema=""):
+    """
+    Per-thread SQLite connection in WAL mode (readers never block the writer),
+    autocommit unless a transaction is opened explicitly. Each distinct
+    `schema` runs once per connection, so several stores can share one
+    database file; schemas should be idempotent (CREATE ... IF NOT EXISTS).
+    """
+    conns = getattr(_SQLITE, "conns", None)
+    if conns is None:
+        conns = _SQLITE.conns = {}
+    entry = conns.get(path)
+    if entry is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB: keeps index pages hot
+        entry = conns[path] = (conn, set())
+    conn, applied = entry
+    if schema and schema not in applied:
+        conn.executescript(schema)
+        applied.add(schema)
+    return conn
@@ -2,43 +2,12 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import random
-from datetime import datetime
-
-# --- Inline Revenue Model Badges (copy-paste ready for modular import later) ---
-ALL_REVENUE_MODELS = [
-    {"grade": "A", "category": "Licensing/Franchising", "name": "Licensing IP", "desc": "License IP or patents", "rationale": "Passive, scalable, recurring."},
-    {"grade": "B", "category": "App Development", "name": "App Sales", "desc": "Build/sell apps", "rationale": "Demand, dev cost."},
-    {"grade": "B", "category": "Service-Based", "name": "Consulting/Agency", "desc": "Sell expertise/time", "rationale": "High margin, time-limited."},
-    {"grade": "A", "category": "Marketplaces/Aggregator", "name": "Marketplace/Aggregator", "desc": "Connect buyers/sellers", "rationale": "Network effects."},
-    {"grade": "B", "category": "Content Creation", "name": "Content Creation", "desc": "Content for marketing", "rationale": "Builds authority."},
-    {"grade": "B+", "category": "Integrator/Layer Player", "name": "Layer Player", "desc": "Control value chain", "rationale": "Cost savings."},
-    {"grade": "B", "category": "From Push to Pull", "name": "Customer-Driven", "desc": "Custom orders", "rationale": "Reduces waste, scalable with data."}
-]
-MODULE_REVENUE_MODELS = {
-    "TDM AI Marketing Platform": [
-        "Licensing IP", "App Sales", "Consulting/Agency", "Marketplace/Aggregator",
-        "Content Creation", "Layer Player", "Customer-Driven"
-    ]
-}
-def show_revenue_badges(module):
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    if enabled:
-        st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-        badge_html = ""
-        for m in enabled:
-            badge_html += (
-                f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-                f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-                f"{m['name']} ({m['grade']})</span>"
-            )
-        st.markdown(badge_html, unsafe_allow_html=True)
+from modules.chart_cache import render_png, data_key
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 # --- Helpers ---
-def audit_log(action, user="anon"):
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
-
 def explainability_box(explanation):
     with st.expander("Why did I see this?", expanded=False):
         st.info(explanation)
@@ -57,15 +26,15 @@ def simulate_live_analytics():
     st.success("Analytics updated (simulated data for MVP).")
 
 def generate_heatmap(promo_text):
-    words = promo_text.lower().split()
-    word_freq = pd.Series(words).value_counts().head(10)
-    fig, ax = plt.subplots(figsize=(5, 2.8))
-    ax.barh(word_freq.index[::-1], word_freq.values[::-1], color='#23244d')
-    ax.set_title("Top Words by Frequency", fontsize=14, color="#111")
-    ax.set_xlabel("Count", fontsize=12, color="#111")
-    ax.tick_params(colors="#111", labelsize=11)
-    fig.tight_layout()
-    return fig
+    """Top-word frequency chart for promo copy, as cached PNG bytes."""
+    def draw(fig, ax):
+        words = promo_text.lower().split()
+        word_freq = pd.Series(words).value_counts().head(10)
+        ax.barh(word_freq.index[::-1], word_freq.values[::-1], color='#23244d')
+        ax.set_title("Top Words by Frequency", fontsize=14, color="#111")
+        ax.set_xlabel("Count", fontsize=12, color="#111")
+        ax.tick_params(colors="#111", labelsize=11)
+    return render_png(("copy_heatmap", data_key(promo_text)), draw, figsize=(5, 2.8))
 
 def main():
     st.header("📢 TDM AI Marketing Platform (MVP Demo)")
@@ -105,8 +74,7 @@ def main():
         st.markdown("**Copy Heatmap** (Top words by frequency in your copy)")
         promo_copy_heatmap = st.text_area("Paste your promo copy here for heatmap analysis:", height=80)
         if promo_copy_heatmap:
-            fig = generate_heatmap(promo_copy_heatmap)
-            st.pyplot(fig)
+            st.image(generate_heatmap(promo_copy_heatmap), use_container_width=True)
             st.caption("Shows most repeated/emphasized words; advanced: use eye tracking or click maps.")
             audit_log("Generated copy heatmap", st.session_state.get("user_id", "anon"))
 
@@ -2,50 +2,8 @@
 
 import streamlit as st
 import random
-from datetime import datetime
-
-# --- Inline Revenue Model Badges (can be replaced with global import if desired) ---
-ALL_REVENUE_MODELS = [
-    {
-        "grade": "A", "category": "Digital Products", "name": "Online Courses/eBooks",
-        "desc": "Sell digital content", "rationale": "90%+ margins, passive, top profitability."
-    },
-    {
-        "grade": "A", "category": "Licensing/Franchising", "name": "Licensing IP",
-        "desc": "License IP or patents", "rationale": "Passive, scalable, recurring, low risk."
-    },
-    {
-        "grade": "A-", "category": "Affiliate Marketing", "name": "Affiliate Marketing",
-        "desc": "Promote for commission", "rationale": "Zero inventory, 20-50% commission, passive."
-    },
-    {
-        "grade": "B+", "category": "Transaction-Based", "name": "Commission/Fees",
-        "desc": "Fee per sale", "rationale": "Scalable, 10-30% fees."
-    },
-]
-MODULE_REVENUE_MODELS = {
-    "TDM Digital Publishing Studio": [
-        "Online Courses/eBooks", "Licensing IP", "Affiliate Marketing", "Commission/Fees"
-    ]
-}
-
-def show_revenue_badges(module):
-    """Display revenue model badges for this module."""
-    enabled = [m for m in ALL_REVENUE_MODELS if m["name"] in MODULE_REVENUE_MODELS.get(module, [])]
-    if enabled:
-        st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-        badge_html = ""
-        for m in enabled:
-            badge_html += (
-                f"<span style='background:#A51C30;color:#fff;padding:6px 14px 7px 14px;"
-                f"border-radius:9px;font-weight:900;margin-right:7px;margin-bottom:7px;display:inline-block;'>"
-                f"{m['name']} ({m['grade']})</span>"
-            )
-        st.markdown(badge_html, unsafe_allow_html=True)
-
-def audit_log(action, user="anon"):
-    """Print audit action to backend/console for traceability (MVP demo)."""
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
+from modules.audit import audit_log
+from modules.revenue_models import show_revenue_badges
 
 def main():
     st.header("📚 TDM Digital Publishing Studio (MVP Demo)")
@@ -0,0 +1,118 @@
+# file: ai_tdm_suite/modules/ticket_aggregates.py
+
+import pandas as pd
+
+from modules.date_parsing import parse_dates
+
+DEFAULT_CHUNKSIZE = 250_000
+PREVIEW_ROWS = 5
+# Cube dimensions (in order) and measures; dimensions absent from an upload are skipped.
+DIMENSIONS = ("date", "show", "channel", "age_group")
+MEASURES = ("tickets_sold", "rows")
+# Pending per-chunk cubes are merged once they hold this many rows.
+COMPACT_ROWS = 1_000_000
+
+def empty_aggregates():
+    """Running state for the Audience Insights rollup cube."""
+    return {
+        "rows": 0,
+        "invalid_dates": 0,
+        "head": None,
+        "dims": None,
+        "cube": None,
+        "pending": [],
+        "pending_rows": 0,
+    }
+
+def _cube(df, dims):
+    grouped = df.groupby(list(dims), observed=True, dropna=False, sort=False)
+    cube = grouped["tickets_sold"].sum().to_frame()
+    cube["rows"] = grouped.size()
+    return cube.reset_index()
+
+def _cube_merge(parts, dims):
+    merged = pd.concat(parts, ignore_index=True)
+    return merged.groupby(list(dims), observed=True, dropna=False, sort=False)[list(MEASURES)].sum().reset_index()
+
+def _compact(aggs):
+    parts = aggs["pending"] if aggs["cube"] is None else [aggs["cube"], *aggs["pending"]]
+    if parts:
+        aggs["cube"] = _cube_merge(parts, aggs["dims"])
+    aggs["pending"] = []
+    aggs["pending_rows"] = 0
+
+def fold_frame(aggs, df):
+    """Fold one parsed frame (or chunk) into the running cube in place."""
+    if aggs["head"] is None:
+        aggs["head"] = df.head(PREVIEW_ROWS).copy()
+        aggs["dims"] = tuple(d for d in DIMENSIONS if d in df.columns)
+    aggs["rows"] += len(df)
+    part = _cube(df, aggs["dims"])
+    aggs["pending"].append(part)
+    aggs["pending_rows"] += len(part)
+    if aggs["pending_rows"] >= COMPACT_ROWS:
+        _compact(aggs)
+    return aggs
+
+def finish_aggregates(aggs):
+    """Merge pending chunks and encode dimensions for fast slicing; returns aggs."""
+    _compact(aggs)
+    cube = aggs["cube"]
+    for dim in aggs["dims"]:
+        if dim != "date":
+            cube[dim] = cube[dim].astype("category")
+    aggs["cube"] = cube.sort_values("date", kind="stable", ignore_index=True)
+    return aggs
+
+def aggregate_frame(df):
+    """Rollup cube for an already-loaded, date-parsed frame."""
+    return finish_aggregates(fold_frame(empty_aggregates(), df))
+
+def stream_aggregates(source, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Read a ticket CSV in bounded chunks and fold every chunk into the
+    date x show x channel x age_group cube in a single pass. Peak memory is
+    one chunk plus the (small) cube, regardless of file size.
+    Raises ValueError if required columns are missing or no valid dates remain.
+    """
+    aggs = empty_aggregates()
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        for col in ("date", "tickets_sold"):
+            if col not in chunk.columns:
+                raise ValueError(f"Your CSV is missing a required '{col}' column.")
+        chunk["date"] = parse_dates(chunk["date"])
+        valid = chunk["date"].notna()
+        aggs["invalid_dates"] += int((~valid).sum())
+        if not valid.all():
+            chunk = chunk[valid]
+        if not chunk.empty:
+            fold_frame(aggs, chunk)
+    if aggs["rows"] == 0:
+        raise ValueError("No valid date entries found in your data.")
+    return finish_aggregates(aggs)
+
+# ---- Cube queries ----
+
+def slice_cube(cube, filters):
+    """Restrict the cube to the selected values per dimension (empty selection = all)."""
+    mask = None
+    for dim, values in filters.items():
+        if values and dim in cube.columns:
+            hit = cube[dim].isin(values).to_numpy()
+            mask = hit if mask is None else mask & hit
+    return cube if mask is None else cube[mask]
+
+def rollup(cube, by, measure="tickets_sold"):
+    """Sum a measure over one dimension (Series) or several (MultiIndex Series)."""
+    return cube.groupby(by, observed=True, sort=True)[measure].sum()
+
+def has_dim(aggs, dim):
+    return dim in (aggs["dims"] or ())
+
+def dim_values(aggs, dim):
+    """Distinct values of a dimension, for filter widgets."""
+    return list(aggs["cube"][dim].cat.categories) if has_dim(aggs, dim) else []
+
+def filter_key(filters):
+    """Hashable, order-independent key for a filter selection."""
+    return tuple(sorted((dim, tuple(sorted(map(str, values)))) for dim, values in filters.items() if values))
@@ -1,28 +1,16 @@
 # file: ai_tdm_suite/modules/utils.py
 
 import streamlit as st
-import pandas as pd
 import random
 from collections import OrderedDict
-from modules.revenue_models import ALL_REVENUE_MODELS
+from modules.registry import PAGE_MODULES
+# Revenue models live in one registry; re-exported here for existing imports.
+from modules.revenue_models import (
+    ALL_REVENUE_MODELS, MODULE_REVENUE_MODELS, get_enabled_models,
+    show_revenue_badges, show_revenue_model_reference
+)
 
-MODULES = [
-    "Audience Insights Dashboard",
-    "Accessible Streaming Platform",
-    "TDM AI Marketing Platform",
-    "Creator-to-Fan AI CRM",
-    "Digital Merch & NFT Platform",
-    "Live Experience Marketplace",
-    "TDM Digital Publishing Studio",
-    "Smart Merch & Print-on-Demand Hub"
-]
-
-# ---- Revenue Models Reference ----
-
-def show_revenue_model_reference():
-    """Display all revenue models in a Streamlit DataFrame."""
-    df = pd.DataFrame(ALL_REVENUE_MODELS)
-    st.dataframe(df[["grade", "category", "name", "desc", "rationale"]], use_container_width=True)
+MODULES = list(PAGE_MODULES)
 
 # ---- User Session/State ----
 
@@ -45,53 +33,6 @@ def logout():
     """Downgrade to Free."""
     st.session_state["pro_user"] = False
 
-# ---- Revenue Model Enablement ----
-
-# Map modules to their active revenue models
-MODULE_REVENUE_MODELS = {
-    "Audience Insights Dashboard": [
-        "Subscription", "DaaS/Data Monetization", "BNPL/Interest", "Freemium", "Loyalty/Rewards", "Commission/Fees", "Ads/Sponsorship"
-    ],
-    "Accessible Streaming Platform": [
-        "Freemium", "Subscription", "BNPL/Interest", "Ads/Sponsorship", "Pay-Per-Use", "Experiences", "Online Courses/eBooks", "Affiliate Marketing"
-    ],
-    "TDM AI Marketing Platform": [
-        "Licensing IP", "App Sales", "Consulting/Agency", "Marketplace/Aggregator", "Content Creation", "Layer Player", "Customer-Driven"
-    ],
-    "Creator-to-Fan AI CRM": [
-        "Membership Site", "Marketplace/Aggregator", "Commission/Fees", "Affiliate Marketing", "Loyalty/Rewards"
-    ],
-    "Digital Merch & NFT Platform": [
-        "Marketplace/Aggregator", "Online Courses/eBooks", "Co-Branding", "Commission/Fees", "Freemium", "Ads/Sponsorship", "Pre-Payment"
-    ],
-    "Live Experience Marketplace": [
-        "Marketplace/Aggregator", "Experiences", "Affiliate Marketing"
-    ],
-    "TDM Digital Publishing Studio": [
-        "Online Courses/eBooks", "Licensing IP", "Affiliate Marketing", "Commission/Fees"
-    ],
-    "Smart Merch & Print-on-Demand Hub": [
-        "Physical/Digital Sales", "Freemium", "Commission/Fees", "Loyalty/Rewards"
-    ]
-}
-
-def get_enabled_models(module_name):
-    """Return enabled revenue models (full dicts) for a given module name."""
-    enabled_names = MODULE_REVENUE_MODELS.get(module_name, [])
-    return [m for m in ALL_REVENUE_MODELS if m["name"] in enabled_names]
-
-def show_revenue_badges(module_name):
-    """Render active revenue model badges for a module in Streamlit."""
-    enabled = get_enabled_models(module_name)
-    st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
-    badge_html = ""
-    for m in enabled:
-        badge_html += (
-            f"<span class='h-badge' title='{m.get('desc', '')} | {m.get('rationale', '')}'>"
-            f"{m.get('name', '')} ({m.get('grade', '')})</span>"
-        )
-    st.markdown(badge_html, unsafe_allow_html=True)
-
 # ---- Pricing Plans ----
 
 pricing_plans = OrderedDict([
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# Keep caches and stores out of the working tree; set before any module reads it.
+os.environ.setdefault("TDM_STATE_DIR", tempfile.mkdtemp(prefix="tdm_state_"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
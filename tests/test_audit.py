@@ -0,0 +1,53 @@
+import json
+import threading
+
+from modules.audit import AuditWriter, list_segments
+
+def read_events(directory):
+    events = []
+    for path in list_segments(directory):
+        with open(path, encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f)
+    return events
+
+def test_events_are_written_in_order_with_fields(tmp_path):
+    writer = AuditWriter(str(tmp_path), batch_size=4)
+    for i in range(10):
+        assert writer.log("login", user="u1", seq=i)
+    writer.close()
+    events = read_events(str(tmp_path))
+    assert [e["seq"] for e in events] == list(range(10))
+    assert {e["user_id"] for e in events} == {"u1"}
+    assert writer.stats()["written"] == 10
+
+def test_log_racing_close_loses_nothing_it_accepted(tmp_path):
+    writer = AuditWriter(str(tmp_path), max_queue=64, block_timeout=0.001)
+    per_thread, threads = 2_000, 8
+    start = threading.Barrier(threads + 1)
+
+    def spam(t):
+        start.wait()
+        for i in range(per_thread):
+            writer.log("tick", user=f"t{t}", seq=i)
+
+    workers = [threading.Thread(target=spam, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    writer.close()
+    for w in workers:
+        w.join()
+
+    stats = writer.stats()
+    assert stats["enqueued"] + stats["dropped"] == per_thread * threads
+    assert stats["written"] == stats["enqueued"]
+    assert len(read_events(str(tmp_path))) == stats["written"]
+    assert not writer.log("late")
+
+def test_segments_roll_over_by_size(tmp_path):
+    writer = AuditWriter(str(tmp_path), batch_size=1, segment_bytes=200)
+    for i in range(20):
+        writer.log("upload", user="u", name="x" * 50, seq=i)
+    writer.close()
+    assert len(list_segments(str(tmp_path))) > 1
+    assert [e["seq"] for e in read_events(str(tmp_path))] == list(range(20))
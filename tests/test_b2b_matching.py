@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from modules import b2b_matching
+from modules.b2b_matching import MatchIndex, load_snapshot, save_snapshot
+from modules.b2b_store import save_profile, save_profiles
+
+WORDS = ("investors funding marketing design engineering sales mentorship hiring legal "
+         "music film touring merch streaming analytics branding").split()
+
+def random_profiles(rng, ids):
+    return [{"id": int(i),
+             "needs": " ".join(rng.choice(WORDS, rng.integers(0, 5))),
+             "offers": " ".join(rng.choice(WORDS, rng.integers(0, 5)))} for i in ids]
+
+def brute_force(profiles):
+    """Reference (ids, score matrix) from a TF-IDF fitted on the live profiles only."""
+    ids = [p["id"] for p in profiles]
+    vec = b2b_matching._VECTORIZER
+    needs = vec.transform([p["needs"] for p in profiles]).astype(np.float64).tocsr()
+    offers = vec.transform([p["offers"] for p in profiles]).astype(np.float64).tocsr()
+    df = np.bincount(needs.indices, minlength=needs.shape[1]) + np.bincount(offers.indices, minlength=needs.shape[1])
+    idf = sp.diags(np.log((1 + 2 * len(profiles)) / (1 + df)) + 1)
+    needs = normalize(needs @ idf)
+    offers = normalize(offers @ idf)
+    score = (needs @ offers.T + offers @ needs.T).toarray() / 2
+    np.fill_diagonal(score, 0)
+    return ids, score
+
+def check_against_brute_force(index, live, probes):
+    ids, score = brute_force(live)
+    for pid in probes:
+        expected = dict(zip(ids, score[ids.index(pid)]))
+        got = {q: s for q, s, _, _ in index.top_matches(pid, k=len(live))}
+        assert set(got) == {q for q, s in expected.items() if s > 1e-12}
+        for q, s in got.items():
+            assert s == pytest.approx(expected[q], abs=1e-6)
+
+def test_incremental_updates_match_a_full_rebuild():
+    rng = np.random.default_rng(0)
+    index = MatchIndex()
+    live = {}
+    for step in range(12):
+        # new profiles plus re-saves of existing ones (tombstone + reweight)
+        ids = list(range(step * 20, step * 20 + 20))
+        if live:
+            ids += rng.choice(list(live), 10, replace=False).tolist()
+        batch = random_profiles(rng, ids)
+        index.add_profiles(batch)
+        live.update((p["id"], p) for p in batch)
+
+    profiles = sorted(live.values(), key=lambda p: p["id"])
+    rebuilt = MatchIndex()
+    rebuilt.add_profiles(profiles)
+    assert index.n_docs == rebuilt.n_docs == 2 * len(profiles)
+    np.testing.assert_array_equal(index.doc_freq, rebuilt.doc_freq)
+
+    probes = rng.choice([p["id"] for p in profiles], 15, replace=False).tolist()
+    check_against_brute_force(index, profiles, probes)
+    for pid in probes:
+        a = index.top_matches(pid, k=5)
+        b = rebuilt.top_matches(pid, k=5)
+        assert [s for _, s, _, _ in a] == pytest.approx([s for _, s, _, _ in b], abs=1e-6)
+
+def test_blocks_stay_size_tiered():
+    rng = np.random.default_rng(1)
+    index = MatchIndex()
+    for start in range(0, 1000, 10):
+        index.add_profiles(random_profiles(rng, range(start, start + 10)))
+    sizes = [b.size for b in index.needs.blocks]
+    assert sum(sizes) == 1000
+    assert len(sizes) <= np.log2(1000) + 1
+    assert all(older > b2b_matching.MERGE_RATIO * newer for older, newer in zip(sizes, sizes[1:]))
+
+def test_sync_follows_the_store_and_survives_a_snapshot(tmp_path):
+    db = str(tmp_path / "b2b.sqlite3")
+    rng = np.random.default_rng(2)
+    seeded = random_profiles(rng, range(30))
+    save_profiles([{"name": f"p{p['id']}", **p} for p in seeded], key="seed", db=db)
+    index = MatchIndex()
+    assert index.sync(db) == 30
+
+    path = save_snapshot(index, str(tmp_path / "index.pkl"))
+    restored = load_snapshot(path)
+    pid, key = save_profile({"name": "Ada", "needs": "investors funding", "offers": "music marketing"}, db=db)
+    save_profile({"name": "Ada", "needs": "legal", "offers": "touring"}, key=key, db=db)
+    assert restored.sync(db) == 2
+    assert index.sync(db) == 2
+
+    live = {r[0]: {"id": r[0], "needs": r[1], "offers": r[2]}
+            for r in b2b_matching.connect_store(db).execute("SELECT id, needs, offers FROM profiles")}
+    check_against_brute_force(restored, sorted(live.values(), key=lambda p: p["id"]), [pid, 1, 2])
+    assert restored.top_matches(pid) == index.top_matches(pid)
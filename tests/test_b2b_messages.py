@@ -0,0 +1,56 @@
+import pytest
+
+from modules.b2b_messages import inbox, mark_read, poll, send_message, unread_count
+from modules.b2b_store import claim_profile, save_profile
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "b2b.sqlite3")
+
+@pytest.fixture
+def ada(db):
+    profile_id, key = save_profile({"name": "Ada", "company": "Acme"}, db=db)
+    return profile_id, key
+
+def test_inbox_is_readable_from_a_second_session_with_the_key(db, ada):
+    _, key = ada
+    send_message("Bob", "ada", "hello", db=db)
+    # the first session is gone; a new one knows only the profile name and key
+    profile_id = claim_profile("Ada", key, db=db)["id"]
+    messages, cursor = inbox(profile_id, key, db=db)
+    assert [(m["recipient"], m["sender"], m["body"]) for m in messages] == [("Ada", "Bob", "hello")]
+    assert cursor is None
+    assert unread_count(profile_id, key, db=db) == 1
+
+@pytest.mark.parametrize("read", [
+    lambda pid, key, db: inbox(pid, key, db=db),
+    lambda pid, key, db: poll(pid, key, 0, db=db),
+    lambda pid, key, db: unread_count(pid, key, db=db),
+    lambda pid, key, db: mark_read(pid, key, db=db),
+])
+def test_inbox_calls_refuse_other_keys(db, ada, read):
+    profile_id, _ = ada
+    _, bob_key = save_profile({"name": "Bob", "company": "B"}, db=db)
+    send_message("Bob", "Ada", "hello", db=db)
+    for key in (None, "", bob_key):
+        with pytest.raises(PermissionError):
+            read(profile_id, key, db)
+    assert unread_count(profile_id, ada[1], db=db) == 1
+
+def test_pagination_poll_and_mark_read(db, ada):
+    profile_id, key = ada
+    ids = [send_message("Bob", "Ada", f"m{i}", db=db) for i in range(5)]
+    page, cursor = inbox(profile_id, key, limit=2, db=db)
+    assert [m["body"] for m in page] == ["m4", "m3"]
+    page, cursor = inbox(profile_id, key, limit=2, before=cursor, db=db)
+    assert [m["body"] for m in page] == ["m2", "m1"]
+    assert [m["body"] for m in poll(profile_id, key, ids[2], db=db)] == ["m3", "m4"]
+
+    assert mark_read(profile_id, key, up_to=ids[1], db=db) == 2
+    assert unread_count(profile_id, key, db=db) == 3
+    assert mark_read(profile_id, key, db=db) == 3
+    assert unread_count(profile_id, key, db=db) == 0
+
+def test_messages_need_an_existing_recipient(db):
+    with pytest.raises(ValueError):
+        send_message("Bob", "Nobody", "hi", db=db)
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from modules.b2b_store import (claim_profile, get_profile, profile_name_for_key, save_profile,
+                               save_profiles, search_profiles)
+
+def profile(name, **fields):
+    return {"name": name, "company": "Acme", "needs": "investors", "offers": "marketing", **fields}
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "b2b.sqlite3")
+
+def test_new_profile_is_issued_a_key(db):
+    profile_id, key = save_profile(profile("Ada"), db=db)
+    assert key
+    assert claim_profile("ada", key, db=db)["id"] == profile_id
+    assert "key_hash" not in get_profile("Ada", db=db)
+
+def test_keyless_save_cannot_overwrite_an_existing_profile(db):
+    save_profile(profile("Ada", company="Acme"), db=db)
+    with pytest.raises(PermissionError):
+        save_profile(profile("ADA", company="Evil Corp"), db=db)
+    assert get_profile("Ada", db=db)["company"] == "Acme"
+
+def test_wrong_key_cannot_overwrite(db):
+    _, key = save_profile(profile("Ada"), db=db)
+    _, other = save_profile(profile("Bob"), db=db)
+    with pytest.raises(PermissionError):
+        save_profile(profile("Ada", company="Bob's"), key=other, db=db)
+    assert get_profile("Ada", db=db)["company"] == "Acme"
+    assert profile_name_for_key(claim_profile("Ada", key, db=db)["id"], key, db=db) == "Ada"
+
+def test_key_holder_can_edit_from_a_later_session(db):
+    profile_id, key = save_profile(profile("Ada"), db=db)
+    # a new session only has what the member typed in: the key
+    assert save_profile(profile("Ada", company="Acme 2"), key=key, db=db) == (profile_id, key)
+    assert get_profile("Ada", db=db)["company"] == "Acme 2"
+    assert search_profiles("acme", db=db)[0]["id"] == profile_id
+
+@pytest.mark.parametrize("key", [None, "", "not-the-key"])
+def test_claim_and_lookup_refuse_missing_or_wrong_keys(db, key):
+    profile_id, _ = save_profile(profile("Ada"), db=db)
+    with pytest.raises(PermissionError):
+        claim_profile("Ada", key, db=db)
+    with pytest.raises(PermissionError):
+        profile_name_for_key(profile_id, key, db=db)
+
+def test_unknown_profile_is_refused(db):
+    _, key = save_profile(profile("Ada"), db=db)
+    with pytest.raises(PermissionError):
+        claim_profile("Nobody", key, db=db)
+    with pytest.raises(PermissionError):
+        profile_name_for_key(10_000, key, db=db)
+
+def test_bulk_save_needs_a_key_and_skips_other_members_names(db):
+    save_profile(profile("Ada", company="Acme"), db=db)
+    with pytest.raises(PermissionError):
+        save_profiles([profile("Cy")], key=None, db=db)
+    written = save_profiles([profile("Ada", company="Import"), profile("Cy"), profile("Dee")], key="seed", db=db)
+    assert written == 2
+    assert get_profile("Ada", db=db)["company"] == "Acme"
+    assert save_profiles([profile("Cy", company="Again")], key="seed", db=db) == 1
+    assert get_profile("Cy", db=db)["company"] == "Again"
+
+def test_databases_without_key_column_are_migrated_and_stay_locked(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE profiles (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE COLLATE NOCASE, "
+                 "company TEXT NOT NULL DEFAULT '', role TEXT NOT NULL DEFAULT '', sector TEXT NOT NULL DEFAULT '', "
+                 "needs TEXT NOT NULL DEFAULT '', offers TEXT NOT NULL DEFAULT '', linkedin TEXT NOT NULL DEFAULT '', "
+                 "owner TEXT, updated_at TEXT NOT NULL)")
+    conn.execute("INSERT INTO profiles(name, company, updated_at) VALUES ('Ada', 'Acme', '2024-01-01')")
+    conn.commit()
+    conn.close()
+    with pytest.raises(PermissionError):
+        save_profile(profile("Ada", company="Evil Corp"), db=path)
+    assert get_profile("Ada", db=path)["company"] == "Acme"
+    _, key = save_profile(profile("Bob"), db=path)
+    assert claim_profile("Bob", key, db=path)["name"] == "Bob"
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from modules.date_parsing import parse_dates
+
+def baseline(values):
+    return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+
+def test_matches_single_format_parse_on_iso_files():
+    values = pd.Series(["2024-01-01", "2024-02-30", "03/05/2024", "", None, "not a date",
+                        "2024-01-01", "2024-12-31"] * 50)
+    parsed = parse_dates(values)
+    expected = baseline(values)
+    assert parsed.isna().sum() == expected.isna().sum()
+    assert parsed.tolist() == expected.tolist()
+
+def test_strings_outside_the_detected_format_stay_invalid():
+    values = pd.Series(["2024-01-01"] * 20 + ["03/05/2024", "2024-01-01T10:00:00"])
+    assert parse_dates(values).isna().sum() == 2
+
+def test_mixed_timezone_offsets_do_not_raise():
+    values = pd.Series(["2024-01-01T10:00:00Z", "2024-01-02T10:00:00+02:00", "x"])
+    parsed = parse_dates(values)
+    assert len(parsed) == 3
+    assert parsed.dt.tz is None
+
+def test_detects_non_iso_format():
+    values = pd.Series(["12/31/2024", "01/15/2025", "bad"])
+    parsed = parse_dates(values)
+    assert parsed.tolist()[:2] == [pd.Timestamp("2024-12-31"), pd.Timestamp("2025-01-15")]
+    assert pd.isna(parsed.iloc[2])
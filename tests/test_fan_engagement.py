@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import fan_engagement as fe
+
+def activity_csv(rng, fans, events, start="2024-01-01", days=365):
+    emails = [f"Fan{i}@Example.com" for i in rng.integers(0, fans, events)]
+    dates = (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, events), unit="D")).strftime("%Y-%m-%d")
+    amounts = rng.integers(1, 300, events)
+    return pd.DataFrame({"email": emails, "date": dates, "amount": amounts}).to_csv(index=False).encode()
+
+def scores(state):
+    return {k: state[k].copy() for k in ("keys", "last_day", "frequency", "recency_score",
+                                          "frequency_score", "monetary_score", "segment")}
+
+@pytest.fixture
+def workspace():
+    key = fe.new_workspace_key()
+    yield key
+    fe._LOADED.clear()
+
+def test_incremental_ingests_match_one_full_aggregation(workspace):
+    rng = np.random.default_rng(0)
+    files = [activity_csv(rng, fans=400, events=1_500, start=f"2024-0{m}-01", days=60) for m in range(1, 6)]
+    reports = [fe.ingest_events(io.BytesIO(f), workspace, name=f"f{i}") for i, f in enumerate(files)]
+    assert all(not r["skipped"] for r in reports)
+    incremental = fe.load_state(workspace)
+
+    full = fe.empty_state()
+    agg, events = fe.aggregate_events(io.BytesIO(b"".join([files[0]] + [f.split(b"\n", 1)[1] for f in files[1:]])))
+    fe.merge_events(full, agg)
+    full["events"] = events
+    fe.score_state(full)
+
+    assert incremental["events"] == full["events"] == 5 * 1_500
+    got, want = scores(incremental), scores(full)
+    for name in got:
+        np.testing.assert_array_equal(got[name], want[name], err_msg=name)
+    np.testing.assert_allclose(incremental["monetary"], full["monetary"])
+    assert incremental["summary"]["fans"] == full["summary"]["fans"]
+
+def test_partial_rescore_equals_a_full_rescore():
+    rng = np.random.default_rng(1)
+    state = fe.empty_state()
+    for i in range(6):
+        agg, events = fe.aggregate_events(io.BytesIO(activity_csv(rng, fans=300, events=200 + 50 * i)))
+        touched = fe.merge_events(state, agg)
+        state["events"] += events
+        rescored = fe.score_state(state, touched)
+        assert rescored in (len(touched), len(state["keys"]))
+        check = {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in state.items()}
+        fe.score_state(check)
+        for name, want in scores(check).items():
+            np.testing.assert_array_equal(state[name], want, err_msg=name)
+
+def test_same_file_is_counted_once(workspace):
+    data = activity_csv(np.random.default_rng(2), fans=50, events=100)
+    assert not fe.ingest_events(io.BytesIO(data), workspace)["skipped"]
+    assert fe.ingest_events(io.BytesIO(data), workspace)["skipped"]
+    assert fe.load_state(workspace)["events"] == 100
+
+def test_workspace_survives_sessions_and_is_isolated(workspace):
+    data = activity_csv(np.random.default_rng(3), fans=50, events=100)
+    assert not fe.workspace_exists(workspace)
+    fe.ingest_events(io.BytesIO(data), workspace)
+    fe._LOADED.clear()  # a later session (or another process) starts cold
+
+    assert fe.workspace_exists(workspace)
+    assert fe.load_state(workspace)["events"] == 100
+    other = fe.new_workspace_key()
+    assert not fe.workspace_exists(other)
+    assert fe.load_state(other)["summary"] == {}
+    assert workspace not in fe.state_file(workspace)
+    with pytest.raises(ValueError):
+        fe.state_file("")
+
+def test_upload_breakdown_against_workspace_scores(workspace):
+    fe.ingest_events(io.BytesIO(b"email,date,amount\nA@x.com,2024-05-01,50\nb@x.com,2024-01-01,5\n"), workspace)
+    fans = io.BytesIO(b"name,email\nAnn,a@X.com\nAnn again,a@x.com\nCy,c@x.com\n")
+    result = fe.upload_engagement(fans, workspace)
+    assert sum(result["counts"].values()) == 2
+    assert result["counts"][fe.NO_ACTIVITY] == 1
+    assert result["top"]["name"].tolist() == ["Ann"]
+    assert fe.upload_engagement(fans, fe.new_workspace_key())["counts"][fe.NO_ACTIVITY] == 2
@@ -0,0 +1,49 @@
+import pytest
+
+from modules import revenue_models as rm
+
+MODULE = "Creator-to-Fan AI CRM"
+
+@pytest.fixture
+def restore_registry():
+    catalog, modules = list(rm._CATALOG), dict(rm._MODULE_MODELS)
+    yield
+    with rm._LOCK:
+        rm._CATALOG[:] = catalog
+        rm._MODULE_MODELS.clear()
+        rm._MODULE_MODELS.update(modules)
+        rm._reindex()
+
+def test_exported_views_are_read_only():
+    with pytest.raises(TypeError):
+        rm.ALL_REVENUE_MODELS[0]["grade"] = "F"
+    with pytest.raises(TypeError):
+        rm.MODULE_REVENUE_MODELS[MODULE] = ("Subscription",)
+    assert not hasattr(rm.ALL_REVENUE_MODELS, "append")
+
+def test_enabled_models_follow_catalog_order():
+    names = [m["name"] for m in rm.get_enabled_models(MODULE)]
+    positions = [rm._CATALOG_POSITION[n] for n in names]
+    assert positions == sorted(positions)
+    assert set(names) == set(rm.MODULE_REVENUE_MODELS[MODULE])
+
+def test_badge_cache_is_invalidated_by_registry_changes(restore_registry):
+    before = rm.badge_html(MODULE)
+    assert "Membership Site" in before
+    version = rm.registry_version()
+
+    rm.set_module_models(MODULE, ["Subscription"])
+    assert rm.registry_version() > version
+    assert "Subscription" in rm.badge_html(MODULE)
+    assert "Membership Site" not in rm.badge_html(MODULE)
+
+    rm.register_model({**rm.get_model("Subscription"), "grade": "A+"})
+    assert "Subscription (A+)" in rm.badge_html(MODULE)
+
+def test_badge_html_escapes_model_text(restore_registry):
+    rm.register_model({"grade": "C", "category": "x", "name": "<b>Tips</b>",
+                       "desc": "it's \"quoted\"", "rationale": "<script>"})
+    rm.set_module_models(MODULE, ["<b>Tips</b>"])
+    out = rm.badge_html(MODULE)
+    assert "<b>" not in out and "<script>" not in out
+    assert "&#x27;" in out
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import ticket_aggregates
+from modules.date_parsing import parse_dates
+from modules.ticket_aggregates import aggregate_frame, rollup, stream_aggregates
+
+def ticket_csv(rows=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=60).strftime("%Y-%m-%d").to_numpy()
+    df = pd.DataFrame({
+        "date": rng.choice(dates, rows),
+        "show": rng.choice(["Hamilton", "Cats", "Wicked"], rows),
+        "tickets_sold": rng.integers(1, 200, rows),
+        "price": rng.integers(20, 150, rows),
+        "channel": rng.choice(["web", "box_office", "app"], rows),
+        "age_group": rng.choice(["18-34", "35-50", "50+"], rows),
+    })
+    df.loc[rng.choice(rows, 25, replace=False), "date"] = "not a date"
+    return df.to_csv(index=False)
+
+def canonical(cube):
+    out = cube.copy()
+    for col in out.columns:
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(str)
+    return out.sort_values(list(ticket_aggregates.DIMENSIONS), ignore_index=True)
+
+@pytest.mark.parametrize("chunksize, compact_rows", [(700, 1_000_000), (700, 50), (100_000, 1_000_000)])
+def test_stream_aggregates_equals_aggregate_frame(monkeypatch, chunksize, compact_rows):
+    monkeypatch.setattr(ticket_aggregates, "COMPACT_ROWS", compact_rows)
+    text = ticket_csv()
+    df = pd.read_csv(io.StringIO(text))
+    df["date"] = parse_dates(df["date"])
+    df = df.dropna(subset=["date"])
+
+    full = aggregate_frame(df)
+    streamed = stream_aggregates(io.StringIO(text), chunksize=chunksize)
+
+    assert streamed["rows"] == full["rows"] == len(df)
+    assert streamed["invalid_dates"] == 25
+    pd.testing.assert_frame_equal(canonical(streamed["cube"]), canonical(full["cube"]))
+    pd.testing.assert_series_equal(rollup(streamed["cube"], "show"), rollup(full["cube"], "show"),
+                                   check_categorical=False)
+
+def test_stream_aggregates_rejects_files_without_valid_dates():
+    with pytest.raises(ValueError):
+        stream_aggregates(io.StringIO("date,tickets_sold\nnope,1\n"))
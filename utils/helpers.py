@@ -5,6 +5,8 @@ import pandas as pd
 from datetime import datetime
 import random
 import hashlib
+from modules.audit import audit_log as _audit_log
+from modules.date_parsing import parse_dates
 
 def check_session():
     """Initialize session state for pro_user and user_id."""
@@ -33,10 +35,9 @@ def watermark_csv(df: pd.DataFrame, user_id="anon") -> pd.DataFrame:
     df["_watermark"] = hashlib.sha256(f"{user_id}_{datetime.now()}".encode()).hexdigest()[:16]
     return df
 
-def audit_log(action, user=None):
-    """Simple stdout log for privacy/analytics events."""
-    user = user or st.session_state.get("user_id", "anon")
-    print(f"[AUDIT] {datetime.now()} | {user}: {action}")
+def audit_log(action, user=None, **fields):
+    """Record a privacy/analytics event for the current session user (non-blocking)."""
+    return _audit_log(action, user or st.session_state.get("user_id", "anon"), **fields)
 
 def explainability_box(explanation):
     """Show an expandable explanation/info box."""
@@ -57,10 +58,7 @@ def safe_parse_date(df: pd.DataFrame):
     if 'date' not in df.columns:
         st.error("Your CSV is missing a required 'date' column.")
         return None
-    try:
-        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
-    except Exception:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = parse_dates(df['date'])
     df = df.dropna(subset=['date'])
     if df.empty:
         st.error("No valid date entries found in your data.")
@@ -81,13 +79,15 @@ def show_revenue_badges(module, get_enabled_models=None):
     Render active revenue model badges for a module.
     get_enabled_models: function(module) -> list of models (should be set by importing module)
     """
-    # Fallback: try to import get_enabled_models if not passed
+    # Default: the shared registry, which serves precompiled badge HTML
     if get_enabled_models is None:
         try:
-            from modules.utils import get_enabled_models  # circular ok for Streamlit runtime
+            from modules.revenue_models import show_revenue_badges as registry_badges
         except Exception:
             st.warning("Revenue model lookup unavailable.")
             return
+        registry_badges(module)
+        return
     enabled = get_enabled_models(module)
     st.markdown("**Active Revenue Models:**", unsafe_allow_html=True)
     badge_html = ""